@@ -0,0 +1,334 @@
+import datetime
+
+from perf import PERF
+from query_cache import QUERY_CACHE
+
+
+# =======================================
+# 분석 쿼리 모음 (Streamlit 의존성 없음)
+#  - 대시보드(jakarta.py), CLI(cli.py), 배치 작업이 모두 이 함수들을 사용
+#  - 모든 결과는 프로세스 공용 캐시(QUERY_CACHE) 경유, 데이터셋 버전별로 무효화
+#  - 반환된 DataFrame 은 캐시에서 공유되므로 수정하지 말 것
+#  - start_date/end_date 가 None 이면 전체 기간
+# =======================================
+PARTY_TYPES = ('수출자', '수입자')
+
+
+def partner_type_of(analysis_type):
+    return '수입자' if analysis_type == '수출자' else '수출자'
+
+
+# 프로세스 공용 결과 캐시 경유 (키: 정규화된 쿼리, 데이터셋 버전이 바뀌면 무효화)
+#  - 실행 시간은 쿼리 종류별로 기록, 형태는 캐시 hit/miss × 전체/기간 조회
+def cached_query(dataset, key, compute):
+    computed = []
+
+    def run():
+        computed.append(True)
+        return compute()
+
+    with PERF.span(f'query.{key[0]}') as span:
+        value = QUERY_CACHE.get_or_compute(dataset.version, key, run)
+        period = 'range' if any(isinstance(v, datetime.date) for v in key) else 'full'
+        span.shape = f"{'miss' if computed else 'hit'}/{period}"
+    return value
+
+
+def format_date_range(dataset, start_date=None, end_date=None):
+    start_date = start_date or dataset.timeline.first_date
+    end_date = end_date or dataset.timeline.last_date
+    return f"{start_date} ~ {end_date}"
+
+
+# =======================================
+# 전체 개요
+# =======================================
+def overview(dataset, start_date=None, end_date=None):
+    # 선적 건 / 수출자 / 수입자 / 컨테이너 / 컨테이너선사 수
+    return cached_query(dataset, ('overview', start_date, end_date), lambda: dataset.overview(start_date, end_date))
+
+
+def carrier_ranking(dataset, start_date=None, end_date=None):
+    return cached_query(
+        dataset, ('carriers', None, None, start_date, end_date),
+        lambda: dataset.ranking(['컨테이너선사'], start_date, end_date),
+    )
+
+
+def lane_ranking(dataset, start_date=None, end_date=None):
+    return cached_query(
+        dataset, ('lanes', start_date, end_date),
+        lambda: dataset.ranking(['선적항', '도착항'], start_date, end_date),
+    )
+
+
+def monthly_trend(dataset, start_date=None, end_date=None, analysis_type=None, company=None):
+    return cached_query(
+        dataset, ('monthly', analysis_type, company, start_date, end_date),
+        lambda: dataset.monthly_trend(start_date, end_date, analysis_type, company),
+    )
+
+
+# =======================================
+# 전체 분석 (조건 검색)
+# =======================================
+def filter_data(dataset, analysis_type, min_containers, selected_category='ALL', start_date=None, end_date=None):
+    # 미리 계산된 회사별 집계 큐브에서 대분류/최소 컨테이너 수 조건만 잘라서 반환
+    #  - 기간 조건이 있으면 선적일 누적합 롤업으로 회사별 기간 합계 계산
+    # 반환 컬럼: ['순위', 회사, 대분류, 사업내용, '컨테이너수']
+    return cached_query(
+        dataset,
+        ('filter', analysis_type, selected_category, min_containers, start_date, end_date),
+        lambda: dataset.ranked_companies(analysis_type, min_containers, selected_category, start_date, end_date),
+    )
+
+
+def business_options(dataset, analysis_type, min_containers, selected_category='ALL', start_date=None, end_date=None):
+    def compute():
+        result_df = filter_data(dataset, analysis_type, min_containers, selected_category, start_date, end_date)
+        return ('ALL',) + tuple(sorted(result_df[f'{analysis_type} 사업내용'].dropna().astype(str).unique().tolist()))
+
+    return cached_query(
+        dataset, ('business_options', analysis_type, selected_category, min_containers, start_date, end_date), compute,
+    )
+
+
+def filter_business(dataset, analysis_type, min_containers, selected_category, selected_business, start_date=None, end_date=None):
+    def compute():
+        result_df = filter_data(dataset, analysis_type, min_containers, selected_category, start_date, end_date)
+        return result_df[result_df[f'{analysis_type} 사업내용'] == selected_business]
+
+    return cached_query(
+        dataset, ('business', analysis_type, selected_category, min_containers, selected_business, start_date, end_date), compute,
+    )
+
+
+# =======================================
+# 개별 상세 분석
+# =======================================
+def company_rows(dataset, analysis_type, company, start_date=None, end_date=None):
+    return dataset.company_rows(analysis_type, company, start_date, end_date)
+
+
+def company_info(dataset, analysis_type, company):
+    # 회사명 / 대분류 / 사업내용 (기간과 무관)
+    def compute():
+        rows = dataset.company_rows(analysis_type, company)
+        if rows.empty:
+            return None
+        info = rows[[analysis_type, f'{analysis_type} 대분류', f'{analysis_type} 사업내용']].drop_duplicates().iloc[0]
+        return {
+            '회사명': info[analysis_type],
+            '대분류': info[f'{analysis_type} 대분류'],
+            '사업내용': info[f'{analysis_type} 사업내용'],
+        }
+
+    return cached_query(dataset, ('info', analysis_type, company), compute)
+
+
+def company_summary(dataset, analysis_type, company, start_date=None, end_date=None):
+    # 선적 건 / 컨테이너 / 거래 상대방 수 / 부킹 선사 수
+    def compute():
+        filtered = dataset.company_rows(analysis_type, company, start_date, end_date)
+        return {
+            'records': len(filtered),
+            'containers': int(filtered['컨테이너수'].sum()),
+            'partners': int(filtered[partner_type_of(analysis_type)].nunique()),
+            'carriers': int(filtered['컨테이너선사'].nunique()),
+        }
+
+    return cached_query(dataset, ('summary', analysis_type, company, start_date, end_date), compute)
+
+
+def partner_table(filtered, partner_type):
+    keys = [partner_type, f'{partner_type} 대분류', f'{partner_type} 사업내용']
+    summary = filtered.groupby(keys, observed=True).agg({'컨테이너수': 'sum'}).reset_index()
+    summary = summary.sort_values(by='컨테이너수', ascending=False).reset_index(drop=True)
+    summary['순위'] = range(1, len(summary) + 1)
+    summary = summary[['순위'] + keys + ['컨테이너수']]
+
+    # 비중(%) 계산
+    total_containers_partner = summary['컨테이너수'].sum()
+    summary['비중(%)'] = (summary['컨테이너수'] / total_containers_partner * 100).round(1)
+    return summary
+
+
+def route_table(filtered, partner_type):
+    summary = filtered.groupby([partner_type, '선적항', '도착항'], observed=True).agg({'컨테이너수': 'sum'}).reset_index()
+    summary = summary.sort_values(by='컨테이너수', ascending=False).reset_index(drop=True)
+    summary['순위'] = range(1, len(summary) + 1)
+    return summary[['순위', partner_type, '선적항', '도착항', '컨테이너수']]
+
+
+def carrier_share_table(filtered):
+    summary = filtered.groupby('컨테이너선사', observed=True).agg({'컨테이너수': 'sum'}).reset_index()
+    summary = summary.sort_values(by='컨테이너수', ascending=False).reset_index(drop=True)
+
+    # 비중(%) 계산
+    total_containers_for_pct = summary['컨테이너수'].sum()
+    summary['비중(%)'] = (summary['컨테이너수'] / total_containers_for_pct * 100).round(1)
+    return summary
+
+
+def partner_summary(dataset, analysis_type, company, start_date=None, end_date=None):
+    # 거래 상대방 분석 (수출자 → 수입자, 수입자 → 수출자) + 비중(%)
+    return cached_query(
+        dataset, ('partners', analysis_type, company, start_date, end_date),
+        lambda: partner_table(dataset.company_rows(analysis_type, company, start_date, end_date), partner_type_of(analysis_type)),
+    )
+
+
+def route_summary(dataset, analysis_type, company, start_date=None, end_date=None):
+    # 거래 상대방 분석2 (상대방 × 선적항 × 도착항)
+    return cached_query(
+        dataset, ('routes', analysis_type, company, start_date, end_date),
+        lambda: route_table(dataset.company_rows(analysis_type, company, start_date, end_date), partner_type_of(analysis_type)),
+    )
+
+
+def carrier_share_summary(dataset, analysis_type, company, start_date=None, end_date=None):
+    # 컨테이너선사별 분석 + 비중(%)
+    return cached_query(
+        dataset, ('carriers', analysis_type, company, start_date, end_date),
+        lambda: carrier_share_table(dataset.company_rows(analysis_type, company, start_date, end_date)),
+    )
+
+
+def similar_customers(dataset, analysis_type, company, k=10):
+    return cached_query(
+        dataset, ('similar', analysis_type, company, k),
+        lambda: dataset.similar_customers(analysis_type, company, k),
+    )
+
+
+# 선사 점유율 큐브 (월 단위), filters: {차원: [값, ...]}
+def _filter_key(filters):
+    return tuple(sorted((dimension, tuple(labels)) for dimension, labels in (filters or {}).items()))
+
+
+def market_share(dataset, group_by, share_within=None, filters=None):
+    within = None if share_within is None else tuple(share_within)
+    return cached_query(
+        dataset, ('market_share', tuple(group_by), within, _filter_key(filters)),
+        lambda: dataset.market_cube().query(group_by, filters, share_within),
+    )
+
+
+def market_leaders(dataset, dimensions, filters=None):
+    return cached_query(
+        dataset, ('market_leaders', tuple(dimensions), _filter_key(filters)),
+        lambda: dataset.market_cube().leaders(dimensions, filters),
+    )
+
+
+# 거래 네트워크 (전체 기간 기준, 기간 선택과 무관)
+def trade_peers(dataset, analysis_type, company, k=10):
+    return cached_query(
+        dataset, ('trade_peers', analysis_type, company, k),
+        lambda: dataset.trade_network().peers(analysis_type, company, k),
+    )
+
+
+def trade_prospects(dataset, analysis_type, company, k=10):
+    return cached_query(
+        dataset, ('trade_prospects', analysis_type, company, k),
+        lambda: dataset.trade_network().prospects(analysis_type, company, k),
+    )
+
+
+def shared_partners(dataset, analysis_type, company, other):
+    return cached_query(
+        dataset, ('shared_partners', analysis_type, company, other),
+        lambda: dataset.trade_network().shared_partners(analysis_type, company, other),
+    )
+
+
+def trade_concentration(dataset, analysis_type, company):
+    return cached_query(
+        dataset, ('trade_concentration', analysis_type, company),
+        lambda: dataset.trade_network().company_concentration(analysis_type, company),
+    )
+
+
+def dependency_leaderboard(dataset, analysis_type, min_containers=0, selected_category='ALL'):
+    # 거래처/선사/구간 의존도가 높은 회사 순위 (평균 HHI 내림차순), 대분류/최소 컨테이너 수 조건
+    def compute():
+        table = dataset.trade_network().dependency(analysis_type)
+        keep = table['컨테이너수'] >= min_containers
+        if selected_category != 'ALL':
+            keep &= table[f'{analysis_type} 대분류'] == selected_category
+        result = table[keep].reset_index(drop=True)
+        result['순위'] = range(1, len(result) + 1)
+        return result
+
+    return cached_query(dataset, ('dependency', analysis_type, selected_category, min_containers), compute)
+
+
+def trade_cluster(dataset, analysis_type, company):
+    return cached_query(
+        dataset, ('trade_cluster', analysis_type, company),
+        lambda: dataset.trade_network().cluster(analysis_type, company),
+    )
+
+
+# 품목 검색 (화물품목한글명/화물분류명), 검색어는 정규화해서 캐시 키로 사용
+def _commodity_match(dataset, query, min_score):
+    from commodity import normalize_text
+
+    query = normalize_text(query)
+    return cached_query(
+        dataset, ('commodity_match', query, min_score),
+        lambda: dataset.commodity_index().match(query, min_score),
+    )
+
+
+def commodity_summary(dataset, query, min_score=1.0, start_date=None, end_date=None):
+    # 일치 품목 수 / 선적 건 / 컨테이너 / 수출자 수 / 수입자 수
+    def compute():
+        ids, _ = _commodity_match(dataset, query, min_score)
+        return dataset.commodity_index().summary(ids, start_date, end_date)
+
+    return cached_query(dataset, ('commodity_summary', query, min_score, start_date, end_date), compute)
+
+
+def commodity_items(dataset, query, min_score=1.0, start_date=None, end_date=None):
+    def compute():
+        ids, scores = _commodity_match(dataset, query, min_score)
+        return dataset.commodity_index().items_table(ids, scores, start_date, end_date)
+
+    return cached_query(dataset, ('commodity_items', query, min_score, start_date, end_date), compute)
+
+
+def commodity_companies(dataset, query, analysis_type, min_score=1.0, start_date=None, end_date=None):
+    # 일치 품목을 선적한 수출자/수입자 순위 (컨테이너수 기준)
+    def compute():
+        ids, _ = _commodity_match(dataset, query, min_score)
+        return dataset.commodity_index().companies_table(ids, analysis_type, start_date, end_date)
+
+    return cached_query(dataset, ('commodity_companies', query, analysis_type, min_score, start_date, end_date), compute)
+
+
+# 월별 물량 예측 (전체 기간 실적 기준, 기간 선택과 무관), series: 수출자 / 수입자 / 구간
+def volume_forecast(dataset, series='수출자', min_containers=0):
+    return cached_query(
+        dataset, ('forecast', series, min_containers), lambda: dataset.volume_forecast(series).table(min_containers),
+    )
+
+
+def company_forecast(dataset, analysis_type, company):
+    # 회사 하나의 월별 실적 + 다음 달부터의 예측 (하한/상한 포함)
+    return cached_query(
+        dataset, ('company_forecast', analysis_type, company),
+        lambda: dataset.volume_forecast(analysis_type).series_frame([company]),
+    )
+
+
+def forecast_model(dataset, analysis_type, company):
+    return cached_query(
+        dataset, ('forecast_model', analysis_type, company),
+        lambda: dataset.volume_forecast(analysis_type).describe([company]),
+    )
+
+
+def search_companies(dataset, analysis_type, query, selected_category='ALL', k=50):
+    return dataset.search_companies(analysis_type, query, selected_category, k)
@@ -0,0 +1,290 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from pyarrow import feather
+
+import analytics
+from dataset import Dataset
+from entity import AliasMap, name_counts
+from query_cache import QUERY_CACHE
+from report_export import CompanyReports
+from snapshot import build_snapshot, load_snapshot
+from synthetic import generate_shipments, history_days, write_xlsx
+from xlsx_stream import read_xlsx
+
+
+# =======================================
+# 벤치마크
+#  예) python benchmark.py run                              # 2만 / 20만 / 200만 행
+#      python benchmark.py run --sizes 20000 --repeat 3 -o bench.json
+#      python benchmark.py run --sizes 200000 --days 1096       # 기간 고정 (기본은 행 수에 따라 6개월 ~ 5년)
+#      python benchmark.py run --save-baseline              # 현재 결과를 기준선으로 저장
+#      python benchmark.py compare bench.json               # 기준선 대비 회귀 검사 (회귀 시 종료 코드 1)
+#  - 크기별로 별도 프로세스에서 실행해서 최대 메모리(ru_maxrss)를 크기별로 측정
+#  - 합성 데이터는 .cache/bench 에 (행 수, 시드, 일수)별로 보관해서 다음 실행에서 재사용 (생성 시간은 측정 제외)
+#  - 쿼리는 첫 호출(cold: 인덱스/롤업 생성 포함)과 반복 호출 중앙값(warm: 결과 캐시 비운 상태) 측정
+# =======================================
+DEFAULT_SIZES = (20_000, 200_000, 2_000_000)
+DEFAULT_REPEAT = 5
+DEFAULT_OUTPUT = 'benchmark_results.json'
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'bench')
+# 엑셀 시트 최대 행 수 (헤더 제외) → 이보다 크면 xlsx 단계는 건너뛰고 feather 로만 측정
+XLSX_MAX_ROWS = 1_048_575
+
+# 회귀 판정: 기준선 대비 비율과 최소 차이(ms)를 모두 넘을 때만 (작은 값의 흔들림 무시)
+REGRESSION_RATIO = 1.25
+MIN_DELTA_MS = 5.0
+MIN_DELTA_MB = 16.0
+
+
+def _elapsed_ms(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def _peak_rss_mb():
+    # 리눅스는 KB, macOS 는 byte 단위
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _synthetic_paths(n_rows, seed, days):
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    base = os.path.join(BENCH_DIR, f'synthetic-{n_rows}-{seed}-{days}d')
+    return base + '.xlsx', base + '.feather'
+
+
+# =======================================
+# 적재 단계
+# =======================================
+def bench_load(n_rows, seed, days, timings):
+    xlsx_path, feather_path = _synthetic_paths(n_rows, seed, days)
+    if not os.path.exists(feather_path):
+        df = generate_shipments(n_rows, seed, days=days)
+        feather.write_feather(df, feather_path, compression='uncompressed')
+
+    if n_rows <= XLSX_MAX_ROWS:
+        if not os.path.exists(xlsx_path):
+            write_xlsx(feather.read_feather(feather_path), xlsx_path)
+        snapshot_dir = os.path.join(BENCH_DIR, 'snapshots')
+        timings['load.xlsx_parse'], _ = _elapsed_ms(lambda: read_xlsx(xlsx_path))
+        timings['load.snapshot_build'], _ = _elapsed_ms(lambda: build_snapshot(xlsx_path, snapshot_dir))
+        timings['load.snapshot_read'], df = _elapsed_ms(lambda: load_snapshot(xlsx_path, snapshot_dir))
+    else:
+        timings['load.snapshot_read'], df = _elapsed_ms(
+            lambda: feather.read_table(feather_path, memory_map=True).to_pandas())
+    # 별칭 맵 없이 처음부터 판별 (스냅샷 생성에 포함된 회사명 통일 단계만 따로 측정)
+    timings['load.entity_resolve'], _ = _elapsed_ms(lambda: AliasMap().resolve(name_counts(df)))
+
+    timings['load.dataset'], dataset = _elapsed_ms(lambda: Dataset.from_frame(df, version=f'bench-{n_rows}-{seed}-{days}d'))
+    return dataset
+
+
+# =======================================
+# 쿼리 경로 (대시보드/CLI 가 호출하는 analytics 함수 그대로)
+# =======================================
+def query_paths(dataset):
+    first, last = dataset.timeline.first_date, dataset.timeline.last_date
+    start = first + (last - first) / 3
+    end = first + (last - first) * 2 / 3
+    # 대상 회사는 원본에서 직접 고름 (롤업/인덱스를 미리 만들지 않도록 analytics 를 거치지 않음)
+    df = dataset.df
+    company = df.groupby('수출자', observed=True)['컨테이너수'].sum().idxmax()
+    row = df[df['수출자'] == company].iloc[0]
+    category, business = row['수출자 대분류'], row['수출자 사업내용']
+    query = str(company)[:6]
+    commodity = str(row['화물품목한글명'])[:4]
+
+    return [
+        ('overview', lambda: analytics.overview(dataset)),
+        ('overview.range', lambda: analytics.overview(dataset, start, end)),
+        ('carrier_ranking', lambda: analytics.carrier_ranking(dataset)),
+        ('lane_ranking', lambda: analytics.lane_ranking(dataset, start, end)),
+        ('monthly_trend', lambda: analytics.monthly_trend(dataset)),
+        ('filter_data', lambda: analytics.filter_data(dataset, '수출자', 100)),
+        ('filter_data.category', lambda: analytics.filter_data(dataset, '수입자', 10, category)),
+        ('filter_data.range', lambda: analytics.filter_data(dataset, '수출자', 100, 'ALL', start, end)),
+        ('business_options', lambda: analytics.business_options(dataset, '수출자', 100)),
+        ('filter_business', lambda: analytics.filter_business(dataset, '수출자', 0, category, business)),
+        ('search_companies', lambda: analytics.search_companies(dataset, '수출자', query)),
+        ('company_info', lambda: analytics.company_info(dataset, '수출자', company)),
+        ('company_summary', lambda: analytics.company_summary(dataset, '수출자', company)),
+        ('company_monthly', lambda: analytics.monthly_trend(dataset, None, None, '수출자', company)),
+        ('partner_summary', lambda: analytics.partner_summary(dataset, '수출자', company)),
+        ('route_summary', lambda: analytics.route_summary(dataset, '수출자', company, start, end)),
+        ('carrier_share_summary', lambda: analytics.carrier_share_summary(dataset, '수출자', company)),
+        ('commodity_companies', lambda: analytics.commodity_companies(dataset, commodity, '수입자')),
+        ('volume_forecast', lambda: analytics.volume_forecast(dataset, '수출자', 100)),
+        ('company_forecast', lambda: analytics.company_forecast(dataset, '수출자', company)),
+        ('similar_customers', lambda: analytics.similar_customers(dataset, '수출자', company)),
+        ('report_export.build', lambda: len(CompanyReports(dataset, '수출자', 100))),
+    ]
+
+
+def bench_queries(dataset, repeat, timings):
+    for name, func in query_paths(dataset):
+        QUERY_CACHE.invalidate()
+        timings[f'query.{name}.cold'], _ = _elapsed_ms(func)
+        runs = []
+        for _ in range(repeat):
+            QUERY_CACHE.invalidate()
+            runs.append(_elapsed_ms(func)[0])
+        timings[f'query.{name}.warm'] = statistics.median(runs)
+
+
+def run_size(n_rows, seed=0, repeat=DEFAULT_REPEAT, days=None):
+    days = days or history_days(n_rows)
+    timings = {}
+    dataset = bench_load(n_rows, seed, days, timings)
+    rss_after_load = _peak_rss_mb()
+    bench_queries(dataset, repeat, timings)
+    return {
+        'rows': n_rows,
+        'days': days,
+        'months': len(dataset.timeline.months),
+        'exporters': int(dataset.df['수출자'].nunique()),
+        'importers': int(dataset.df['수입자'].nunique()),
+        'timings_ms': {name: round(value, 3) for name, value in timings.items()},
+        'memory_mb': {
+            'dataset': round(dataset.memory_usage() / (1024 * 1024), 1),
+            'peak_rss_after_load': rss_after_load,
+            'peak_rss': _peak_rss_mb(),
+        },
+    }
+
+
+def run(sizes=DEFAULT_SIZES, seed=0, repeat=DEFAULT_REPEAT, days=None):
+    results = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'repeat': repeat,
+        },
+        'sizes': {},
+    }
+    for n_rows in sizes:
+        size_days = days or history_days(n_rows)
+        print(f"{n_rows:,} rows / {size_days:,} days ...", file=sys.stderr)
+        # 크기마다 새 프로세스 → 최대 메모리가 이전 크기의 영향을 받지 않음
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), 'size', str(n_rows), '--seed', str(seed), '--repeat', str(repeat),
+             '--days', str(size_days)],
+            check=True, stdout=subprocess.PIPE, text=True,
+        ).stdout
+        results['sizes'][str(n_rows)] = json.loads(output)
+    return results
+
+
+# =======================================
+# 기준선 비교
+# =======================================
+def compare(results, baseline, ratio=REGRESSION_RATIO, min_delta_ms=MIN_DELTA_MS, min_delta_mb=MIN_DELTA_MB):
+    rows = []
+    for size, current in results['sizes'].items():
+        base = baseline.get('sizes', {}).get(size)
+        # 기간이 다른 결과끼리는 비교하지 않음 (기간 기록 전 기준선은 6개월)
+        if base is None or base.get('days', 181) != current.get('days', 181):
+            continue
+        metrics = [('timings_ms', name, min_delta_ms) for name in current['timings_ms']]
+        metrics += [('memory_mb', name, min_delta_mb) for name in current['memory_mb']]
+        for group, name, min_delta in metrics:
+            before, after = base.get(group, {}).get(name), current[group][name]
+            if before is None:
+                continue
+            change = after / before if before else float('inf')
+            regressed = after > before * ratio and after - before > min_delta
+            rows.append({
+                'rows': int(size), 'metric': name, 'unit': group.split('_')[-1],
+                'baseline': before, 'current': after, 'ratio': round(change, 3), 'regression': regressed,
+            })
+    return pd.DataFrame(rows, columns=['rows', 'metric', 'unit', 'baseline', 'current', 'ratio', 'regression'])
+
+
+def _report(table):
+    if table.empty:
+        print("기준선에 같은 크기/기간의 결과가 없어서 비교하지 않음", file=sys.stderr)
+        return 0
+    regressions = table[table['regression']]
+    print(table.to_string(index=False))
+    print(f"\n회귀 {len(regressions)}건 / {len(table)}개 지표", file=sys.stderr)
+    return 1 if len(regressions) else 0
+
+
+def _load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="KUMO 적재/쿼리 벤치마크")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="벤치마크 실행 후 기준선과 비교")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    run_parser.add_argument('--days', type=int, help="합성 데이터 기간(일), 기본은 행 수에 따라 증가")
+    run_parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT)
+    run_parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    run_parser.add_argument('--save-baseline', action='store_true', help="결과를 기준선 파일로 저장")
+
+    compare_parser = subparsers.add_parser('compare', help="결과 파일을 기준선과 비교")
+    compare_parser.add_argument('results')
+    compare_parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    compare_parser.add_argument('--ratio', type=float, default=REGRESSION_RATIO)
+
+    # 내부용: 크기 하나를 현재 프로세스에서 실행하고 JSON 출력
+    size_parser = subparsers.add_parser('size')
+    size_parser.add_argument('rows', type=int)
+    size_parser.add_argument('--seed', type=int, default=0)
+    size_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    size_parser.add_argument('--days', type=int)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'size':
+        print(json.dumps(run_size(args.rows, args.seed, args.repeat, args.days)))
+        return 0
+
+    if args.command == 'compare':
+        return _report(compare(_load_json(args.results), _load_json(args.baseline), args.ratio))
+
+    results = run(args.sizes, args.seed, args.repeat, args.days)
+    _write_json(results, args.output)
+    print(f"결과: {args.output}", file=sys.stderr)
+    if args.save_baseline:
+        _write_json(results, args.baseline)
+        print(f"기준선 저장: {args.baseline}", file=sys.stderr)
+        return 0
+    if os.path.exists(args.baseline):
+        return _report(compare(results, _load_json(args.baseline)))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,192 @@
+import argparse
+import datetime
+import json
+import os
+import sys
+
+import pandas as pd
+
+import analytics
+import report_export
+from dataset import load_dataset
+from forecast import SERIES
+
+
+# =======================================
+# 분석 쿼리 CLI (브라우저 없이 배치 실행)
+#  예) python cli.py rank --type 수출자 --category 화학/소재 --min 100 -o exporters.csv
+#      python cli.py partners --type 수출자 --company "Lg Chemical" -o partners.parquet
+#      python cli.py batch jobs.json --out-dir reports/
+#      python cli.py export-reports --min 100 --out-dir reports/companies --workers 4
+#      python cli.py --source data/ --route "Jakarta, java (Indonesia)" overview
+#      python cli.py commodity --query 합성고무 --type 수입자 -o rubber_importers.csv
+#      python cli.py forecast --series 구간 -o lane_forecast.csv
+#  - 결과 형식은 출력 파일 확장자로 결정 (.json / .csv / .parquet), 없으면 화면 출력
+#  - --source 가 폴더면 새 추출 파일을 적재한 뒤 --route 로 고른 항로만 분석 (생략 시 전체)
+# =======================================
+DEFAULT_SOURCE = 'jakarta.xlsx'
+
+
+def _date(value):
+    return datetime.date.fromisoformat(value) if value else None
+
+
+def _normalize_dates(dataset, kwargs):
+    # 전체 기간이면 대시보드와 같은 캐시 키를 쓰도록 None 으로 정규화
+    start_date, end_date = kwargs.get('start_date'), kwargs.get('end_date')
+    if dataset.timeline.is_full_range(start_date, end_date):
+        kwargs.pop('start_date', None)
+        kwargs.pop('end_date', None)
+    return kwargs
+
+
+# 명령 → (분석 함수, 사용하는 인자)
+COMMANDS = {
+    'overview': (analytics.overview, ['start_date', 'end_date']),
+    'rank': (analytics.filter_data, ['analysis_type', 'min_containers', 'selected_category', 'start_date', 'end_date']),
+    'business': (analytics.filter_business, ['analysis_type', 'min_containers', 'selected_category', 'selected_business', 'start_date', 'end_date']),
+    'carriers': (analytics.carrier_ranking, ['start_date', 'end_date']),
+    'lanes': (analytics.lane_ranking, ['start_date', 'end_date']),
+    'monthly': (analytics.monthly_trend, ['start_date', 'end_date', 'analysis_type', 'company']),
+    'info': (analytics.company_info, ['analysis_type', 'company']),
+    'summary': (analytics.company_summary, ['analysis_type', 'company', 'start_date', 'end_date']),
+    'partners': (analytics.partner_summary, ['analysis_type', 'company', 'start_date', 'end_date']),
+    'routes': (analytics.route_summary, ['analysis_type', 'company', 'start_date', 'end_date']),
+    'company-carriers': (analytics.carrier_share_summary, ['analysis_type', 'company', 'start_date', 'end_date']),
+    'similar': (analytics.similar_customers, ['analysis_type', 'company', 'k']),
+    'dependency': (analytics.dependency_leaderboard, ['analysis_type', 'min_containers', 'selected_category']),
+    'commodity': (analytics.commodity_companies, ['query', 'analysis_type', 'min_score', 'start_date', 'end_date']),
+    'commodity-items': (analytics.commodity_items, ['query', 'min_score', 'start_date', 'end_date']),
+    'forecast': (analytics.volume_forecast, ['series', 'min_containers']),
+    'company-forecast': (analytics.company_forecast, ['analysis_type', 'company']),
+}
+
+
+def run_query(dataset, command, **kwargs):
+    func, params = COMMANDS[command]
+    kwargs = _normalize_dates(dataset, {key: kwargs.get(key) for key in params if kwargs.get(key) is not None})
+    return func(dataset, **kwargs)
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.date, pd.Timestamp)):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def write_result(result, path=None):
+    if result is None:
+        result = {}
+    if path is None:
+        if isinstance(result, pd.DataFrame):
+            print(result.to_string(index=False))
+        else:
+            print(json.dumps(result, ensure_ascii=False, indent=2, default=_json_default))
+        return
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    ext = os.path.splitext(path)[1].lower()
+    if not isinstance(result, pd.DataFrame):
+        if ext != '.json':
+            result = pd.DataFrame([result])
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2, default=_json_default)
+            return
+
+    if ext == '.csv':
+        # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+        result.to_csv(path, index=False, encoding='utf-8-sig')
+    elif ext == '.parquet':
+        result.to_parquet(path, index=False)
+    elif ext == '.json':
+        result.to_json(path, orient='records', force_ascii=False, indent=2, date_format='iso')
+    else:
+        raise ValueError(f"지원하지 않는 출력 형식: {path} (.json / .csv / .parquet)")
+
+
+def run_batch(dataset, spec_path, out_dir):
+    # jobs.json: [{"name": "exporters", "command": "rank", "args": {...}, "format": "csv"}, ...]
+    with open(spec_path, encoding='utf-8') as f:
+        jobs = json.load(f)
+    for job in jobs:
+        args = dict(job.get('args', {}))
+        for key in ('start_date', 'end_date'):
+            args[key] = _date(args.get(key))
+        result = run_query(dataset, job['command'], **args)
+        path = os.path.join(out_dir, f"{job['name']}.{job.get('format', 'csv')}")
+        write_result(result, path)
+        print(f"{job['name']}: {path}", file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="KUMO 컨테이너 분석 쿼리 CLI")
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help="원본 엑셀 파일 또는 추출 파일 폴더")
+    parser.add_argument('--route', dest='routes', action='append', help="항로 (폴더 원본일 때, 여러 번 지정 가능)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for command, (_, params) in COMMANDS.items():
+        sub = subparsers.add_parser(command)
+        if 'analysis_type' in params:
+            sub.add_argument('--type', dest='analysis_type', choices=analytics.PARTY_TYPES, default='수출자')
+        if 'company' in params:
+            sub.add_argument('--company', required=command != 'monthly')
+        if 'series' in params:
+            sub.add_argument('--series', choices=list(SERIES), default='수출자', help="수출자 / 수입자 / 구간(선적항→도착항)")
+        if 'selected_category' in params:
+            sub.add_argument('--category', dest='selected_category', default='ALL')
+        if 'selected_business' in params:
+            sub.add_argument('--business', dest='selected_business', required=True)
+        if 'min_containers' in params:
+            sub.add_argument('--min', dest='min_containers', type=int, default=0)
+        if 'query' in params:
+            sub.add_argument('--query', required=True, help="품목 검색어 (예: 합성고무)")
+        if 'min_score' in params:
+            sub.add_argument('--min-score', dest='min_score', type=float, default=1.0, help="검색어 2-gram 포함 비율 (0~1)")
+        if 'k' in params:
+            sub.add_argument('--k', type=int, default=10)
+        if 'start_date' in params:
+            sub.add_argument('--start', dest='start_date', type=_date, help="YYYY-MM-DD")
+            sub.add_argument('--end', dest='end_date', type=_date, help="YYYY-MM-DD")
+        sub.add_argument('-o', '--output', help="결과 파일 (.json / .csv / .parquet)")
+
+    batch = subparsers.add_parser('batch', help="JSON 작업 목록을 한 번에 실행")
+    batch.add_argument('spec', help="작업 목록 JSON 파일")
+    batch.add_argument('--out-dir', default='reports')
+
+    export = subparsers.add_parser('export-reports', help="회사별 리포트 엑셀 일괄 생성")
+    export.add_argument('--type', dest='analysis_types', choices=analytics.PARTY_TYPES, action='append',
+                        help="생략하면 수출자/수입자 모두")
+    export.add_argument('--min', dest='min_containers', type=int, default=report_export.DEFAULT_MIN_CONTAINERS)
+    export.add_argument('--start', dest='start_date', type=_date, help="YYYY-MM-DD")
+    export.add_argument('--end', dest='end_date', type=_date, help="YYYY-MM-DD")
+    export.add_argument('--out-dir', default=os.path.join('reports', 'companies'))
+    export.add_argument('--workers', type=int, default=None, help="기본값: CPU 수")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    dataset = load_dataset(args.source, args.routes)
+
+    if args.command == 'batch':
+        run_batch(dataset, args.spec, args.out_dir)
+        return 0
+    if args.command == 'export-reports':
+        report_export.export_reports(
+            dataset, args.out_dir, tuple(args.analysis_types or analytics.PARTY_TYPES), args.min_containers,
+            args.start_date, args.end_date, args.workers,
+        )
+        return 0
+
+    kwargs = {key: value for key, value in vars(args).items() if key not in ('source', 'routes', 'command', 'output')}
+    write_result(run_query(dataset, args.command, **kwargs), args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
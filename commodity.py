@@ -0,0 +1,156 @@
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+# =======================================
+# 품목 검색 (화물품목한글명 / 화물분류명 역색인)
+#  - 문서 단위: 데이터에 등장한 품목 설명 1개 (+ 그 품목의 화물분류명)
+#  - 단어별 문자 2-gram (+ 1-gram) 역색인 → 검색어 n-gram 의 posting 만 모아 bincount (설명 문자열 스캔 X)
+#  - 점수 = 검색어 n-gram 중 품목에 포함된 비율 (1.0 = 검색어의 모든 2-gram 포함)
+#  - 품목 → 행 위치는 품목 코드 정렬 인덱스로 바로 조회, 일치 품목 행만 모아 수출자/수입자/품목별 합계
+#  - 데이터셋 버전별로 인덱스 1회 생성
+# =======================================
+ITEM_COLUMN = '화물품목한글명'
+CLASS_COLUMN = '화물분류명'
+PARTY_TYPES = ('수출자', '수입자')
+MIN_SCORE = 1.0
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize_text(text):
+    text = unicodedata.normalize('NFKC', str(text)).casefold()
+    return ' '.join(_NON_WORD.sub(' ', text).replace('_', ' ').split())
+
+
+def query_grams(text):
+    # 단어 경계를 넘는 2-gram 은 만들지 않음, 1글자 단어는 1-gram ("쌀", "콩")
+    grams = set()
+    for token in text.split():
+        if len(token) == 1:
+            grams.add(token)
+        else:
+            grams.update(token[i:i + 2] for i in range(len(token) - 1))
+    return grams
+
+
+def document_grams(text):
+    # 1글자 검색어도 찾을 수 있도록 문서 쪽은 1-gram 도 색인
+    grams = query_grams(text)
+    grams.update(text.replace(' ', ''))
+    return grams
+
+
+class CommodityIndex:
+    def __init__(self, dataset):
+        from dataset import CompanyIndex
+
+        self._dataset = dataset
+        item_codes = dataset.codes(ITEM_COLUMN)
+        self.rows = CompanyIndex(dataset.df, ITEM_COLUMN)
+        # 품목 코드 → 첫 행의 화물분류명 (품목과 분류는 함수 관계)
+        codes, first = np.unique(item_codes, return_index=True)
+        keep = codes >= 0
+        self.item_codes, first = codes[keep], first[keep]
+        self.class_codes = dataset.codes(CLASS_COLUMN)[first]
+        self.items = dataset.decode(self.item_codes)
+        self.classes = dataset.decode(self.class_codes)
+
+        postings = {}
+        for i, (item, cargo_class) in enumerate(zip(self.items, self.classes)):
+            text = normalize_text(item) + ' ' + (normalize_text(cargo_class) if isinstance(cargo_class, str) else '')
+            for gram in document_grams(text):
+                postings.setdefault(gram, []).append(i)
+        self.postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def __len__(self):
+        return len(self.item_codes)
+
+    def scores(self, query):
+        grams = query_grams(normalize_text(query))
+        if not grams:
+            return np.zeros(len(self))
+        hits = [self.postings[g] for g in grams if g in self.postings]
+        if not hits:
+            return np.zeros(len(self))
+        return np.bincount(np.concatenate(hits), minlength=len(self)) / len(grams)
+
+    def match(self, query, min_score=MIN_SCORE):
+        # 점수 ≥ min_score 인 품목 번호, 점수 (점수 내림차순)
+        scores = self.scores(query)
+        ids = np.flatnonzero(scores >= min_score - 1e-9)
+        ids = ids[np.argsort(-scores[ids], kind='stable')]
+        return ids, scores[ids]
+
+    def positions(self, ids, start_date=None, end_date=None):
+        # 일치 품목들의 행 위치 (품목 코드 정렬 인덱스에서 구간만 잘라서 연결)
+        order, offsets = self.rows.order, self.rows.offsets
+        codes = self.item_codes[ids]
+        if not len(codes):
+            return order[:0]
+        positions = np.concatenate([order[offsets[code]:offsets[code + 1]] for code in codes])
+        timeline = self._dataset.timeline
+        if not timeline.is_full_range(start_date, end_date):
+            lo, hi = timeline.bounds(start_date, end_date)
+            positions = positions[timeline.row_mask(positions, lo, hi)]
+        return positions
+
+    def _group(self, positions, column):
+        # 행 위치 → 컬럼 값별 선적 건/컨테이너수 (코드 bincount), 값은 첫 행 위치와 함께 반환
+        codes = self._dataset.codes(column)[positions]
+        values, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        containers = np.bincount(
+            inverse, weights=self._dataset.df['컨테이너수'].to_numpy()[positions], minlength=len(values)
+        ).astype(np.int64)
+        records = np.bincount(inverse, minlength=len(values))
+        return values, first, inverse, records, containers
+
+    def items_table(self, ids, scores, start_date=None, end_date=None):
+        positions = self.positions(ids, start_date, end_date)
+        values, first, inverse, records, containers = self._group(positions, ITEM_COLUMN)
+        score_of = dict(zip(self.item_codes[ids], scores))
+        result = pd.DataFrame({
+            ITEM_COLUMN: self._dataset.decode(values),
+            CLASS_COLUMN: self._dataset.decode(self._dataset.codes(CLASS_COLUMN)[positions[first]]),
+            '일치도': np.round([score_of[code] for code in values], 2),
+            '선적 건': records,
+            '컨테이너수': containers,
+        })
+        for party in PARTY_TYPES:
+            pairs = np.unique(np.stack([inverse, self._dataset.codes(party)[positions]]), axis=1)
+            result[f'{party} 수'] = np.bincount(pairs[0], minlength=len(values))
+        result = result.sort_values(['컨테이너수', '일치도'], ascending=False, kind='stable').reset_index(drop=True)
+        result.insert(0, '순위', np.arange(1, len(result) + 1))
+        return result
+
+    def companies_table(self, ids, analysis_type, start_date=None, end_date=None):
+        # 일치 품목을 선적한 회사별 합계 (컨테이너수 내림차순) + 품목 수
+        positions = self.positions(ids, start_date, end_date)
+        values, first, inverse, records, containers = self._group(positions, analysis_type)
+        items = np.unique(np.stack([inverse, self._dataset.codes(ITEM_COLUMN)[positions]]), axis=1)
+        category = self._dataset.codes(f'{analysis_type} 대분류')[positions[first]]
+        business = self._dataset.codes(f'{analysis_type} 사업내용')[positions[first]]
+        order = np.argsort(-containers, kind='stable')
+        return pd.DataFrame({
+            '순위': np.arange(1, len(values) + 1),
+            analysis_type: self._dataset.decode(values[order]),
+            f'{analysis_type} 대분류': self._dataset.decode(category[order]),
+            f'{analysis_type} 사업내용': self._dataset.decode(business[order]),
+            '품목 수': np.bincount(items[0], minlength=len(values))[order],
+            '선적 건': records[order],
+            '컨테이너수': containers[order],
+        })
+
+    def summary(self, ids, start_date=None, end_date=None):
+        positions = self.positions(ids, start_date, end_date)
+        df = self._dataset.df
+        return {
+            'items': int(len(ids)),
+            'records': int(len(positions)),
+            'containers': int(df['컨테이너수'].to_numpy()[positions].sum()),
+            'exporters': int(len(np.unique(self._dataset.codes('수출자')[positions]))),
+            'importers': int(len(np.unique(self._dataset.codes('수입자')[positions]))),
+        }
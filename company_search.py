@@ -0,0 +1,140 @@
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+
+
+# =======================================
+# 회사명 검색 인덱스 (접두어 / n-gram / 오타 허용)
+#  - 법인 표기("(주)", "주식회사", "Co., Ltd", "PT" 등)를 제거해서 정규화
+#  - 앞뒤 경계 문자를 붙인 2-gram 역색인 → Dice 계수로 유사도 계산
+#  - 정확 일치 / 접두어 / 단어 접두어 일치는 가산점
+#  - 상위 k 개만 argpartition 으로 추출 (동점은 컨테이너 물량 순)
+# =======================================
+LEGAL_FORMS = [
+    '주식회사', '유한회사', '유한책임회사', '합자회사', '(주)', '㈜', '(유)',
+    'co., ltd.', 'co., ltd', 'co.,ltd.', 'co.,ltd', 'co. ltd', 'co ltd', 'company limited',
+    'corporation', 'corp.', 'corp', 'incorporated', 'inc.', 'inc', 'limited', 'ltd.', 'ltd',
+    'l.l.c.', 'llc', 'pt.', 'pt', 'tbk', 'cv', 'co.',
+]
+_LEGAL_PATTERN = re.compile(
+    # 첫 글자 선행 검사 → 법인 표기로 시작할 수 없는 위치는 대안 30여 개를 시도하지 않고 바로 건너뜀
+    '(?=[' + re.escape(''.join(sorted({form[0] for form in LEGAL_FORMS}))) + '])(?:' + '|'.join(
+        # 영문 표기는 단어 경계에서만 제거 (예: "pt" 가 "options" 안에서 지워지지 않도록)
+        rf'(?<![a-z0-9]){re.escape(form)}(?![a-z0-9])' if form.isascii() else re.escape(form)
+        for form in sorted(LEGAL_FORMS, key=len, reverse=True)
+    ) + ')'
+)
+_NON_WORD = re.compile(r'[^\w]+')
+
+BUSINESS_WEIGHT = 0.5
+
+
+def normalize_name(name):
+    text = unicodedata.normalize('NFKC', str(name)).casefold()
+    text = _LEGAL_PATTERN.sub(' ', text)
+    text = _NON_WORD.sub(' ', text).replace('_', ' ')
+    return ' '.join(text.split())
+
+
+def _bigrams(text):
+    # 공백 제거 후 앞뒤 경계(^, $)를 붙여서 한 글자 검색어도 접두어로 매칭
+    compact = '^' + text.replace(' ', '') + '$'
+    return {compact[i:i + 2] for i in range(len(compact) - 1)}
+
+
+class _GramIndex:
+    def __init__(self, texts):
+        postings = {}
+        self.sizes = np.zeros(len(texts), dtype=np.int32)
+        for i, text in enumerate(texts):
+            grams = _bigrams(text)
+            self.sizes[i] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self.postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def dice(self, query):
+        # 검색어 2-gram 의 posting 을 이어 붙여 bincount → 공통 2-gram 수
+        grams = _bigrams(query)
+        hits = [self.postings[g] for g in grams if g in self.postings]
+        if not hits:
+            return np.zeros(len(self.sizes))
+        common = np.bincount(np.concatenate(hits), minlength=len(self.sizes))
+        return 2.0 * common / (len(grams) + self.sizes)
+
+    def containment(self, query):
+        # 긴 설명문(사업내용) 용: 검색어 내부 2-gram 이 얼마나 포함되는지 (경계 2-gram 제외)
+        grams = {g for g in _bigrams(query) if '^' not in g and '$' not in g}
+        hits = [self.postings[g] for g in grams if g in self.postings]
+        if not hits:
+            return np.zeros(len(self.sizes))
+        common = np.bincount(np.concatenate(hits), minlength=len(self.sizes))
+        return common / len(grams)
+
+
+class CompanySearchIndex:
+    def __init__(self, names, businesses=None, weights=None):
+        self.names = np.asarray(names, dtype=object)
+        # 동점일 때 물량이 큰 회사가 먼저 오도록 아주 작은 보정값을 더함
+        self._tiebreak = np.zeros(len(self.names))
+        if weights is not None and len(self.names):
+            weights = np.asarray(weights, dtype=float)
+            self._tiebreak = 1e-3 * weights / max(weights.max(), 1.0)
+        self.normalized = [normalize_name(name) for name in self.names]
+        self._names = _GramIndex(self.normalized)
+        self._businesses = None
+        if businesses is not None:
+            self._businesses = _GramIndex([normalize_name(b) if isinstance(b, str) else '' for b in businesses])
+
+        # 접두어 검색용: 정규화된 이름/단어를 정렬해 두고 이진 탐색
+        self._sorted_names = sorted((norm, i) for i, norm in enumerate(self.normalized))
+        self._sorted_tokens = sorted(
+            (token, i) for i, norm in enumerate(self.normalized) for token in set(norm.split())
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def _prefix_ids(sorted_pairs, prefix):
+        lo = bisect.bisect_left(sorted_pairs, (prefix,))
+        ids = []
+        for text, i in sorted_pairs[lo:]:
+            if not text.startswith(prefix):
+                break
+            ids.append(i)
+        return ids
+
+    def scores(self, query):
+        norm = normalize_name(query)
+        scores = np.zeros(len(self.names))
+        if not norm:
+            return scores
+
+        scores += self._names.dice(norm)
+        if self._businesses is not None:
+            scores = np.maximum(scores, BUSINESS_WEIGHT * self._businesses.containment(norm))
+
+        # 정확 일치 > 이름 접두어 > 단어 접두어 순으로 가산점
+        name_prefix = self._prefix_ids(self._sorted_names, norm)
+        scores[self._prefix_ids(self._sorted_tokens, norm)] += 0.5
+        scores[name_prefix] += 0.5
+        for i in name_prefix:
+            if self.normalized[i] == norm:
+                scores[i] += 1.0
+        return scores
+
+    def search(self, query, k=20, mask=None, min_score=0.2):
+        scores = self.scores(query)
+        if mask is not None:
+            scores = np.where(mask, scores, 0.0)
+        candidates = np.flatnonzero(scores >= min_score)
+        ranked = scores[candidates] + self._tiebreak[candidates]
+        if len(candidates) > k:
+            top = np.argpartition(-ranked, k - 1)[:k]
+            candidates, ranked = candidates[top], ranked[top]
+        order = candidates[np.argsort(-ranked, kind='stable')]
+        return [(self.names[i], float(scores[i])) for i in order]
+
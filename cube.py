@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+
+# =======================================
+# 선사 / 구간 점유율 OLAP 큐브
+#  - (컨테이너선사, 선적항, 도착항, 수출자 대분류, 수입자 대분류, 월) 조합별 컨테이너수/선적 건을 한 번만 집계
+#  - 값이 있는 셀만 보관 (희소 큐브) → 원본 행 수와 무관하게 셀 수만큼만 스캔
+#  - 슬라이스(필터) / 롤업(group_by) / 점유율(share_within 안에서의 비중)을 셀 배열에 벡터 연산으로 계산
+#  - 월 단위 (일 단위 기간은 누적합 롤업 사용)
+#  - 데이터셋 버전별로 한 번만 생성
+# =======================================
+CUBE_DIMENSIONS = ['컨테이너선사', '선적항', '도착항', '수출자 대분류', '수입자 대분류', '월']
+MONTH = '월'
+SHARE_COLUMN = '점유율(%)'
+
+
+def month_label(month):
+    return str(np.datetime64(month, 'M'))
+
+
+class MarketCube:
+    def __init__(self, dataset):
+        timeline = dataset.timeline
+        # 일자 인덱스 → 월 번호
+        month_of_day = np.repeat(np.arange(len(timeline.months)), np.diff(timeline.month_bounds))
+        day_index = timeline.day_index
+        # 선적일이 없는 행은 -1 (선적일이 하나도 없으면 month_of_day 가 비어 있으므로 유효한 행만 인덱싱)
+        month = np.full(len(day_index), -1, dtype=np.int64)
+        valid = day_index >= 0
+        month[valid] = month_of_day[day_index[valid]]
+        columns = [dataset.codes(col) for col in CUBE_DIMENSIONS[:-1]] + [month]
+
+        # 차원별로 등장한 값만 0..n-1 로 압축 (결측 -1 도 하나의 값으로 유지)
+        self.values = {}
+        keys = []
+        for dimension, codes in zip(CUBE_DIMENSIONS, columns):
+            self.values[dimension], inverse = np.unique(codes, return_inverse=True)
+            keys.append(inverse.reshape(-1))
+        self.sizes = [len(self.values[dimension]) for dimension in CUBE_DIMENSIONS]
+
+        flat = np.ravel_multi_index(keys, self.sizes) if len(month) else np.empty(0, dtype=np.int64)
+        cells, inverse = np.unique(flat, return_inverse=True)
+        containers = dataset.df['컨테이너수'].to_numpy()
+        self.containers = np.bincount(inverse, weights=containers, minlength=len(cells)).astype(np.int64)
+        self.records = np.bincount(inverse, minlength=len(cells)).astype(np.int64)
+        self.coords = dict(zip(CUBE_DIMENSIONS, np.unravel_index(cells, self.sizes)))
+
+        self._pool = dataset.pool
+        self._dtype = dataset.df[CUBE_DIMENSIONS[0]].dtype
+        self.months = [month_label(m) for m in timeline.months]
+
+    def __len__(self):
+        return len(self.containers)
+
+    def _size(self, dimension):
+        return self.sizes[CUBE_DIMENSIONS.index(dimension)]
+
+    def _coords_of(self, dimension, labels):
+        # 라벨 목록 → 차원 내 압축 번호 (없는 값은 무시)
+        values = self.values[dimension]
+        if dimension == MONTH:
+            wanted = np.array([self.months.index(label) for label in labels if label in self.months], dtype=np.int64)
+        else:
+            wanted = np.array([self._pool.get_loc(label) for label in labels if label in self._pool], dtype=np.int64)
+        positions = np.searchsorted(values, wanted)
+        positions = positions[positions < len(values)]
+        return positions[np.isin(values[positions], wanted)]
+
+    def _mask(self, filters):
+        mask = np.ones(len(self), dtype=bool)
+        for dimension, labels in (filters or {}).items():
+            if isinstance(labels, str):
+                labels = [labels]
+            mask &= np.isin(self.coords[dimension], self._coords_of(dimension, labels))
+        return mask
+
+    def _labels(self, dimension, coords):
+        values = self.values[dimension][coords]
+        if dimension == MONTH:
+            return [self.months[v] if v >= 0 else None for v in values]
+        return pd.Categorical.from_codes(values, dtype=self._dtype)
+
+    def _group(self, dimensions, mask):
+        # 선택 셀을 dimensions 조합으로 롤업 → (그룹 좌표 목록, 컨테이너수, 선적 건)
+        if not dimensions:
+            return [], np.array([self.containers[mask].sum()]), np.array([self.records[mask].sum()])
+        keys = [self.coords[dimension][mask] for dimension in dimensions]
+        flat = np.ravel_multi_index(keys, [self._size(dimension) for dimension in dimensions])
+        groups, inverse = np.unique(flat, return_inverse=True)
+        containers = np.bincount(inverse, weights=self.containers[mask], minlength=len(groups)).astype(np.int64)
+        records = np.bincount(inverse, weights=self.records[mask], minlength=len(groups)).astype(np.int64)
+        coords = np.unravel_index(groups, [self._size(dimension) for dimension in dimensions])
+        return list(coords), containers, records
+
+    def query(self, group_by, filters=None, share_within=None):
+        """group_by 조합별 합계. share_within 을 주면 그 차원(들) 합계 대비 점유율 추가 ([] 이면 전체 대비)."""
+        group_by = list(group_by)
+        mask = self._mask(filters)
+        coords, containers, records = self._group(group_by, mask)
+
+        result = pd.DataFrame({dimension: self._labels(dimension, c) for dimension, c in zip(group_by, coords)})
+        result['컨테이너수'] = containers
+        result['선적 건'] = records
+        # 월이 있으면 월 순서 우선, 나머지는 물량 내림차순
+        month = coords[group_by.index(MONTH)] if MONTH in group_by else np.zeros(len(containers), dtype=np.int64)
+        if share_within is None:
+            order = np.lexsort((-containers, month))
+            return result.iloc[order].reset_index(drop=True)
+
+        # 부모(share_within) 그룹 합계 → 점유율, 정렬은 (월) → 부모 합계 내림차순 → 점유율 내림차순
+        parent = [coords[group_by.index(dimension)] for dimension in share_within]
+        if parent:
+            parent_keys = np.unique(
+                np.ravel_multi_index(parent, [self._size(dimension) for dimension in share_within]),
+                return_inverse=True,
+            )[1].reshape(-1)
+        else:
+            parent_keys = np.zeros(len(containers), dtype=np.int64)
+        totals = np.bincount(parent_keys, weights=containers).astype(np.int64)
+        shares = np.divide(containers, totals[parent_keys], out=np.zeros(len(containers)), where=totals[parent_keys] > 0)
+        result[SHARE_COLUMN] = (shares * 100).round(1)
+        order = np.lexsort((-containers, parent_keys, -totals[parent_keys], month))
+        return result.iloc[order].reset_index(drop=True)
+
+    def leaders(self, dimensions, filters=None, by='컨테이너선사'):
+        """dimensions 값별 합계 + 1위 by(선사) 와 점유율, by 수, HHI."""
+        dimensions = list(dimensions)
+        mask = self._mask(filters)
+        coords, containers, _ = self._group(dimensions + [by], mask)
+        parent = np.unique(
+            np.ravel_multi_index(coords[:-1], [self._size(dimension) for dimension in dimensions]),
+            return_inverse=True,
+        )[1].reshape(-1) if dimensions else np.zeros(len(containers), dtype=np.int64)
+        n_parents = int(parent.max()) + 1 if len(parent) else 0
+        totals = np.bincount(parent, weights=containers, minlength=n_parents)
+        shares = containers / np.maximum(totals[parent], 1)
+        hhi = np.bincount(parent, weights=shares ** 2, minlength=n_parents)
+        counts = np.bincount(parent, minlength=n_parents)
+        # 부모별 최대 물량 행: 부모 오름차순, 물량 내림차순 정렬 후 부모별 첫 행
+        order = np.lexsort((-containers, parent))
+        first = order[np.r_[True, parent[order][1:] != parent[order][:-1]]] if len(order) else order
+
+        result = pd.DataFrame({dimension: self._labels(dimension, c[first]) for dimension, c in zip(dimensions, coords[:-1])})
+        result['컨테이너수'] = totals[parent[first]].astype(np.int64)
+        result[f'{by} 수'] = counts[parent[first]]
+        result[f'1위 {by}'] = self._labels(by, coords[-1][first])
+        result[f'1위 {SHARE_COLUMN}'] = (shares[first] * 100).round(1)
+        result['HHI'] = (hhi[parent[first]] * 10000).round().astype(np.int64)
+        if MONTH in dimensions:
+            return result
+        return result.sort_values('컨테이너수', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,487 @@
+import datetime
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from company_search import CompanySearchIndex
+from cube import MarketCube
+from snapshot import load_snapshot, refresh_snapshot, snapshot_version
+from store import ingest, read_store, store_version
+from timeline import DimensionRollup, PrefixRollup, Timeline
+
+
+# =======================================
+# 공유 문자열 풀 기반 데이터셋
+#  - 문자열 컬럼을 하나의 공유 사전(CategoricalDtype)으로 인코딩
+#  - 모든 컬럼이 같은 categories 객체를 공유 → 문자열은 프로세스당 1벌
+#  - groupby/필터는 정수 코드로 수행하고 화면 표시 때만 문자열로 복원
+# =======================================
+DIMENSION_COLUMNS = [
+    '선적항', '도착지국가', '도착항',
+    '수출자', '수출자 사업내용', '수출자 대분류',
+    '수입자', '수입자 사업내용', '수입자 대분류',
+    '컨테이너선사', '화물분류명', '화물품목한글명',
+]
+
+
+def build_string_pool(df, columns=DIMENSION_COLUMNS):
+    values = []
+    for col in columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values.append(series.cat.categories.to_numpy(dtype=object))
+        else:
+            values.append(series.dropna().astype(str).unique())
+    pool = np.unique(np.concatenate(values)) if values else np.array([], dtype=object)
+    return pd.CategoricalDtype(pd.Index(pool, dtype=object))
+
+
+def encode_frame(df, columns=DIMENSION_COLUMNS):
+    dtype = build_string_pool(df, columns)
+    encoded = df.copy(deep=False)
+    for col in columns:
+        # 카테고리 컬럼은 categories 만 재매핑하므로 행 수 만큼 문자열을 다시 해시하지 않음
+        encoded[col] = df[col].astype(dtype)
+    return encoded
+
+
+def party_columns(analysis_type):
+    return [analysis_type, f'{analysis_type} 대분류', f'{analysis_type} 사업내용']
+
+
+# =======================================
+# 회사별 집계 큐브 (filter_data 용)
+#  - (회사, 대분류, 사업내용) 별 컨테이너 합계를 한 번만 계산
+#  - 전체/대분류별 위치 목록을 컨테이너수 내림차순으로 보관
+#  - 최소 컨테이너 수 조건은 이진 탐색 후 앞부분 슬라이스
+# =======================================
+class CompanyRollup:
+    def __init__(self, df, analysis_type, timeline):
+        keys = party_columns(analysis_type)
+        grouper = df.groupby(keys, observed=True)
+        totals = grouper['컨테이너수'].sum()
+        order = np.argsort(-totals.to_numpy(), kind='stable')
+        grouped = totals.reset_index().take(order).reset_index(drop=True)
+        self.analysis_type = analysis_type
+        self.table = grouped
+        self._index_categories()
+
+        # 기간 조회용: 각 행이 속한 테이블 위치 → (테이블 행, 일자) 셀 누적합
+        table_position = np.empty(len(order), dtype=np.int64)
+        table_position[order] = np.arange(len(order))
+        group_ids = np.nan_to_num(grouper.ngroup().to_numpy(dtype=float), nan=-1).astype(np.int64)
+        row_keys = np.where(group_ids >= 0, table_position[np.maximum(group_ids, 0)], -1)
+        self._daily_containers = PrefixRollup(timeline.day_index, timeline.n_days, row_keys, len(grouped), df['컨테이너수'].to_numpy())
+        self._daily_records = PrefixRollup(timeline.day_index, timeline.n_days, row_keys, len(grouped))
+
+    @classmethod
+    def from_arrays(cls, analysis_type, table, daily_containers, daily_records, n_days):
+        # 공유 메모리에서 복원: (셀, 누적합) 은 배열 그대로, 대분류별 위치는 회사 수 만큼만 다시 계산
+        rollup = cls.__new__(cls)
+        rollup.analysis_type = analysis_type
+        rollup.table = table
+        rollup._index_categories()
+        rollup._daily_containers = PrefixRollup.from_arrays(*daily_containers, n_days, len(table))
+        rollup._daily_records = PrefixRollup.from_arrays(*daily_records, n_days, len(table))
+        return rollup
+
+    def _index_categories(self):
+        containers = self.table['컨테이너수'].to_numpy()
+        categories = self.table[f'{self.analysis_type} 대분류'].astype(object).to_numpy()
+        self._positions = {'ALL': np.arange(len(self.table))}
+        for category in pd.unique(categories[pd.notna(categories)]):
+            # flatnonzero 는 순서를 유지하므로 대분류별로도 내림차순 그대로
+            self._positions[category] = np.flatnonzero(categories == category)
+        # searchsorted 는 오름차순 배열이 필요하므로 부호를 뒤집어 보관
+        self._neg_containers = {key: -containers[pos] for key, pos in self._positions.items()}
+
+    def query(self, min_containers, selected_category='ALL'):
+        positions = self._positions.get(selected_category)
+        if positions is None:
+            positions = self._positions['ALL'][:0]
+            count = 0
+        else:
+            count = int(np.searchsorted(self._neg_containers[selected_category], -min_containers, side='right'))
+        result = self.table.take(positions[:count]).reset_index(drop=True)
+        result.insert(0, '순위', np.arange(1, count + 1))
+        return result
+
+    def query_range(self, lo, hi, min_containers, selected_category='ALL'):
+        # 기간 합계는 누적합 차이로 계산 → 회사 수 만큼만 정렬 (원본 행 스캔 X)
+        positions = self._positions.get(selected_category, self._positions['ALL'][:0])
+        containers = self._daily_containers.total(lo, hi)[positions]
+        records = self._daily_records.total(lo, hi)[positions]
+        keep = (records > 0) & (containers >= min_containers)
+        positions, containers = positions[keep], containers[keep]
+        order = np.argsort(-containers, kind='stable')
+        result = self.table.take(positions[order]).reset_index(drop=True)
+        result['컨테이너수'] = containers[order]
+        result.insert(0, '순위', np.arange(1, len(result) + 1))
+        return result
+
+
+# =======================================
+# 회사 → 행 위치 인덱스 (상세 분석 용)
+#  - 회사 코드 기준으로 안정 정렬한 행 위치 배열 + 코드별 시작 오프셋
+#  - 회사 하나의 행 목록은 전체 스캔 없이 연속 구간 슬라이스
+# =======================================
+class CompanyIndex:
+    def __init__(self, df, column):
+        codes = df[column].cat.codes.to_numpy()
+        self.categories = df[column].cat.categories
+        self.order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.categories))
+        # 결측(-1) 행은 정렬 결과 맨 앞에 오므로 그만큼 건너뜀
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]) + int((codes < 0).sum())
+
+    @classmethod
+    def from_arrays(cls, categories, order, offsets):
+        index = cls.__new__(cls)
+        index.categories, index.order, index.offsets = categories, order, offsets
+        return index
+
+    def positions(self, company):
+        try:
+            code = self.categories.get_loc(company)
+        except KeyError:
+            return self.order[:0]
+        return self.order[self.offsets[code]:self.offsets[code + 1]]
+
+
+class Dataset:
+    def __init__(self, df, version, cutoff=None):
+        self.df = df
+        self.version = version
+        # 추출 기준일 (datetime.date, 모르면 None) → 마지막 월이 다 찼는지 판단 (forecast.py)
+        self.cutoff = cutoff
+        self._rollups = {}
+        self._company_indexes = {}
+        self._options = {}
+        self._search_indexes = {}
+        self._dimension_rollups = {}
+        self._timeline = None
+        self._daily_totals = None
+        self._similarity_indexes = {}
+        self._trade_network = None
+        self._market_cube = None
+        self._commodity_index = None
+        self._forecasts = {}
+
+    @classmethod
+    def from_frame(cls, df, version, cutoff=None):
+        return cls(encode_frame(df), version, cutoff)
+
+    # 프로세스 간 공유 대상 (shared_dataset.py 가 배열로 내보내고 다시 연결)
+    #  - 검색/유사도 인덱스는 프로세스별로 필요할 때 생성
+    SHARED_DIMENSIONS = [('수출자',), ('수입자',), ('컨테이너선사',), ('선적항', '도착항')]
+
+    def precompute(self):
+        # 공유할 파생 구조를 모두 미리 생성
+        for analysis_type in ('수출자', '수입자'):
+            self.rollup(analysis_type)
+            self.company_index(analysis_type)
+        for columns in self.SHARED_DIMENSIONS:
+            self.dimension_rollup(columns)
+        self.daily_totals
+        return self
+
+    @classmethod
+    def from_parts(cls, df, version, timeline, rollups, company_indexes, dimension_rollups, daily_totals, cutoff=None):
+        dataset = cls(df, version, cutoff)
+        dataset._timeline = timeline
+        dataset._rollups = dict(rollups)
+        dataset._company_indexes = dict(company_indexes)
+        dataset._dimension_rollups = dict(dimension_rollups)
+        dataset._daily_totals = daily_totals
+        return dataset
+
+    @property
+    def pool(self):
+        return self.df[DIMENSION_COLUMNS[0]].cat.categories
+
+    def codes(self, column):
+        return self.df[column].cat.codes.to_numpy()
+
+    def decode(self, codes):
+        codes = np.asarray(codes)
+        values = self.pool.to_numpy(dtype=object).take(codes, mode='clip')
+        values[codes < 0] = np.nan
+        return values
+
+    def rollup(self, analysis_type):
+        # 데이터셋 객체가 바뀔 때(버전 변경)만 다시 계산
+        if analysis_type not in self._rollups:
+            self._rollups[analysis_type] = CompanyRollup(self.df, analysis_type, self.timeline)
+        return self._rollups[analysis_type]
+
+    def ranked_companies(self, analysis_type, min_containers, selected_category='ALL', start_date=None, end_date=None):
+        if self.timeline.is_full_range(start_date, end_date):
+            return self.rollup(analysis_type).query(min_containers, selected_category)
+        lo, hi = self.timeline.bounds(start_date, end_date)
+        return self.rollup(analysis_type).query_range(lo, hi, min_containers, selected_category)
+
+    # =======================================
+    # 선적일 기간 분석 (누적합 롤업)
+    # =======================================
+    @property
+    def timeline(self):
+        if self._timeline is None:
+            self._timeline = Timeline(self.df['선적일'])
+        return self._timeline
+
+    def dimension_rollup(self, columns):
+        key = tuple(columns)
+        if key not in self._dimension_rollups:
+            codes = [self.codes(col) for col in columns]
+            self._dimension_rollups[key] = DimensionRollup(self.timeline, codes, self.df['컨테이너수'].to_numpy())
+        return self._dimension_rollups[key]
+
+    @property
+    def daily_totals(self):
+        # 전체 합계용: 키가 하나뿐인 롤업 (선적 건수 / 컨테이너수)
+        if self._daily_totals is None:
+            timeline = self.timeline
+            keys = np.zeros(len(self.df), dtype=np.int64)
+            self._daily_totals = (
+                PrefixRollup(timeline.day_index, timeline.n_days, keys, 1),
+                PrefixRollup(timeline.day_index, timeline.n_days, keys, 1, self.df['컨테이너수'].to_numpy()),
+            )
+        return self._daily_totals
+
+    def overview(self, start_date=None, end_date=None):
+        lo, hi = self.timeline.bounds(start_date, end_date)
+        records, containers = self.daily_totals
+
+        def active(column):
+            return int((self.dimension_rollup([column]).records.total(lo, hi) > 0).sum())
+
+        return {
+            'records': int(records.total(lo, hi)[0]),
+            'exporters': active('수출자'),
+            'importers': active('수입자'),
+            'containers': int(containers.total(lo, hi)[0]),
+            'carriers': active('컨테이너선사'),
+        }
+
+    def ranking(self, columns, start_date=None, end_date=None):
+        # 컬럼 조합(선사, 선적항→도착항 등)별 기간 컨테이너 합계 순위
+        lo, hi = self.timeline.bounds(start_date, end_date)
+        rollup = self.dimension_rollup(columns)
+        containers = rollup.containers.total(lo, hi)
+        keep = np.flatnonzero(rollup.records.total(lo, hi) > 0)
+        keep = keep[np.argsort(-containers[keep], kind='stable')]
+        result = pd.DataFrame({'순위': np.arange(1, len(keep) + 1)})
+        for col, codes in zip(columns, rollup.key_codes):
+            result[col] = pd.Categorical.from_codes(codes[keep], dtype=self.df[col].dtype)
+        result['컨테이너수'] = containers[keep]
+        return result
+
+    def monthly_trend(self, start_date=None, end_date=None, analysis_type=None, company=None):
+        # 월별 선적 건/컨테이너수 + 전월 대비 증감률
+        lo, hi = self.timeline.bounds(start_date, end_date)
+        months, bounds = self.timeline.month_slice(lo, hi)
+        if company is None:
+            records, containers = self.daily_totals
+            records, containers = records.by_period(bounds)[0], containers.by_period(bounds)[0]
+        else:
+            rollup = self.dimension_rollup([analysis_type])
+            code = self.pool.get_indexer([company])[0]
+            key = int(np.searchsorted(rollup.key_codes[0], code))
+            if code < 0 or key >= rollup.n_keys or rollup.key_codes[0][key] != code:
+                records = containers = np.zeros(len(months), dtype=np.int64)
+            else:
+                records = rollup.records.by_period(bounds)[key]
+                containers = rollup.containers.by_period(bounds)[key]
+
+        trend = pd.DataFrame({
+            '월': pd.PeriodIndex(months, freq='M').astype(str),
+            '선적 건': records,
+            '컨테이너수': containers,
+        })
+        previous = trend['컨테이너수'].shift(1)
+        trend['전월 대비(%)'] = ((trend['컨테이너수'] - previous) / previous.where(previous > 0) * 100).round(1)
+        return trend
+
+    def company_index(self, analysis_type):
+        if analysis_type not in self._company_indexes:
+            self._company_indexes[analysis_type] = CompanyIndex(self.df, analysis_type)
+        return self._company_indexes[analysis_type]
+
+    def company_rows(self, analysis_type, company, start_date=None, end_date=None):
+        positions = self.company_index(analysis_type).positions(company)
+        if not self.timeline.is_full_range(start_date, end_date):
+            lo, hi = self.timeline.bounds(start_date, end_date)
+            positions = positions[self.timeline.row_mask(positions, lo, hi)]
+        return self.df.take(positions)
+
+    # 사이드바 선택지: 데이터셋 버전별로 한 번만 계산해서 tuple(불변)로 보관
+    def category_options(self, analysis_type):
+        key = ('category', analysis_type)
+        if key not in self._options:
+            series = self.df[f'{analysis_type} 대분류']
+            used = np.unique(series.cat.codes.to_numpy())
+            names = self.decode(used[used >= 0])
+            self._options[key] = ('ALL',) + tuple(sorted(names))
+        return self._options[key]
+
+    def company_options(self, analysis_type, selected_category='ALL'):
+        key = ('company', analysis_type, selected_category)
+        if key not in self._options:
+            codes = self.codes(analysis_type)
+            if selected_category != 'ALL':
+                codes = codes[self.df[f'{analysis_type} 대분류'].to_numpy() == selected_category]
+            used = np.unique(codes)
+            names = self.decode(used[used >= 0]).astype(str).tolist()
+            self._options[key] = tuple(sorted(names))
+        return self._options[key]
+
+    # 회사명 검색: 전체 회사에 대해 한 번만 인덱스를 만들고 대분류는 마스크로 제한
+    def company_search(self, analysis_type):
+        if analysis_type not in self._search_indexes:
+            names = self.company_options(analysis_type)
+            table = self.rollup(analysis_type).table
+            businesses, volumes = {}, {}
+            for company, business, containers in zip(
+                table[analysis_type].astype(object), table[f'{analysis_type} 사업내용'].astype(object), table['컨테이너수']
+            ):
+                businesses.setdefault(company, business)
+                volumes[company] = volumes.get(company, 0) + containers
+            self._search_indexes[analysis_type] = CompanySearchIndex(
+                names, [businesses.get(name) for name in names], [volumes.get(name, 0) for name in names]
+            )
+        return self._search_indexes[analysis_type]
+
+    def category_mask(self, analysis_type, selected_category='ALL'):
+        if selected_category == 'ALL':
+            return None
+        key = ('mask', analysis_type, selected_category)
+        if key not in self._options:
+            names = np.asarray(self.company_options(analysis_type), dtype=object)
+            self._options[key] = np.isin(names, np.asarray(self.company_options(analysis_type, selected_category), dtype=object))
+        return self._options[key]
+
+    def top_companies(self, analysis_type, selected_category='ALL', k=50):
+        key = ('top', analysis_type, selected_category, k)
+        if key not in self._options:
+            top = self.rollup(analysis_type).query(0, selected_category)[analysis_type].astype(object)
+            self._options[key] = tuple(pd.unique(top.to_numpy())[:k].tolist())
+        return self._options[key]
+
+    def search_companies(self, analysis_type, query, selected_category='ALL', k=50):
+        # 검색어가 없으면 컨테이너 물량 상위 회사, 있으면 검색 점수 상위 k 개
+        if not query or not query.strip():
+            return self.top_companies(analysis_type, selected_category, k)
+        index = self.company_search(analysis_type)
+        matches = index.search(query, k=k, mask=self.category_mask(analysis_type, selected_category))
+        return tuple(name for name, _ in matches)
+
+    # 유사 고객 추천: 회사별 특성 행렬 + 최근접 이웃 인덱스 (데이터셋 버전별 1회 생성)
+    def similarity_index(self, analysis_type):
+        if analysis_type not in self._similarity_indexes:
+            # sklearn/scipy 는 import 만 1초 이상 → 유사 고객을 처음 조회할 때 로드
+            from similarity import SimilarCustomerIndex
+            self._similarity_indexes[analysis_type] = SimilarCustomerIndex(self, analysis_type)
+        return self._similarity_indexes[analysis_type]
+
+    def similar_customers(self, analysis_type, company, k=10):
+        result = self.similarity_index(analysis_type).similar(company, k)
+        if result is None:
+            return None
+        table = self.rollup(analysis_type).table.drop_duplicates(analysis_type)
+        categories = dict(zip(table[analysis_type].astype(object), table[f'{analysis_type} 대분류'].astype(object)))
+        result.insert(2, '대분류', result[analysis_type].map(categories))
+        return result
+
+    # 선사/구간/대분류/월 점유율 큐브 (데이터셋 버전별 1회 생성)
+    def market_cube(self):
+        if self._market_cube is None:
+            self._market_cube = MarketCube(self)
+        return self._market_cube
+
+    # 품목 검색: 화물품목한글명/화물분류명 n-gram 역색인 + 품목별 행 위치 (데이터셋 버전별 1회 생성)
+    def commodity_index(self):
+        if self._commodity_index is None:
+            from commodity import CommodityIndex
+            self._commodity_index = CommodityIndex(self)
+        return self._commodity_index
+
+    # 월별 컨테이너 물량 예측 (수출자/수입자/구간별, 데이터셋 버전별 1회 계산, 전체 기간 기준)
+    def volume_forecast(self, series):
+        if series not in self._forecasts:
+            from forecast import VolumeForecast
+            self._forecasts[series] = VolumeForecast(self, series)
+        return self._forecasts[series]
+
+    # 수출자-수입자 거래 네트워크 (희소 행렬, 데이터셋 버전별 1회 생성, 전체 기간 기준)
+    def trade_network(self):
+        if self._trade_network is None:
+            from network import TradeNetwork
+            self._trade_network = TradeNetwork(self)
+        return self._trade_network
+
+    def memory_usage(self):
+        # 공유 풀은 한 번만 계산
+        total = self.pool.memory_usage(deep=True)
+        for col in self.df.columns:
+            series = self.df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                total += series.cat.codes.nbytes
+            else:
+                total += series.memory_usage(index=False, deep=True)
+        return int(total)
+
+
+# 원본/항로 선택별로 마지막에 만든 데이터셋 (버전이 같으면 파생 인덱스까지 그대로 재사용)
+#  - 최근 사용한 선택 MAX_LOADED 개만 유지 (항로 조합마다 데이터셋이 쌓이지 않도록)
+MAX_LOADED = 4
+# 추출 기준일 지정 환경 변수 (forecast.py 의 진행 중인 월 판단)
+EXTRACT_CUTOFF_ENV = 'KUMO_EXTRACT_CUTOFF'
+_LOADED = OrderedDict()
+# 워밍업 스레드와 첫 세션이 동시에 같은 데이터셋을 만들지 않도록
+_LOAD_LOCK = threading.Lock()
+
+
+def dataset_version(source, routes=None):
+    # 새 파일 적재 / 스냅샷 갱신 후 현재 버전 (폴더면 선택한 항로 파티션 기준)
+    if os.path.isdir(source):
+        ingest(source)
+        return store_version(source, routes)
+    refresh_snapshot(source)
+    return snapshot_version(source)
+
+
+def read_frame(source, routes=None):
+    return read_store(source, routes) if os.path.isdir(source) else load_snapshot(source)
+
+
+def extract_cutoff():
+    # 추출 기준일은 명시한 경우에만 사용 (KUMO_EXTRACT_CUTOFF=YYYY-MM-DD), 없으면 None → 데이터의 마지막 선적일로 추정
+    #  - 파일 mtime 은 복사/체크아웃/재다운로드 시각이라 기준일로 쓰지 않음
+    value = os.environ.get(EXTRACT_CUTOFF_ENV)
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"{EXTRACT_CUTOFF_ENV} 는 YYYY-MM-DD 형식이어야 합니다: {value!r}") from None
+
+
+def load_dataset(source, routes=None):
+    # source: 엑셀 파일 1개 또는 추출 파일 폴더 (폴더면 새 파일만 적재 후 선택한 항로 파티션만 읽음)
+    #  - routes: 항로 이름 목록 (None 이면 전체)
+    routes = tuple(sorted(routes)) if routes else None
+    key = (os.path.abspath(source), routes)
+    with _LOAD_LOCK:
+        version = dataset_version(source, routes)
+        dataset = _LOADED.pop(key, None)
+        # 이전 버전은 새 버전을 만들기 전에 놓아서 두 벌이 동시에 남지 않도록
+        if dataset is None or dataset.version != version:
+            dataset = None
+            dataset = Dataset.from_frame(read_frame(source, routes), version=version, cutoff=extract_cutoff())
+        _LOADED[key] = dataset
+        while len(_LOADED) > MAX_LOADED:
+            _LOADED.popitem(last=False)
+    return dataset
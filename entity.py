@@ -0,0 +1,402 @@
+import argparse
+import json
+import os
+import re
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from company_search import normalize_name
+
+
+# =======================================
+# 회사명 동일 실체 판별 (entity resolution)
+#  - 1단계: 정규화 키가 같으면 같은 회사
+#    (법인 표기 "(주)"/"주식회사"/"Co., Ltd"/"PT" 등, 대소문자, 공백, 기호 제거 → company_search.normalize_name)
+#  - 2단계: 키가 다른 이름 중 3-gram Dice ≥ MATCH_THRESHOLD 이고,
+#    흔한 단어(logistics, international ...)를 뺀 구별 부분의 2-gram Dice 도 DISTINCTIVE_THRESHOLD 이상이고
+#    이름 안의 숫자가 모두 같은 것만 병합 ("Hanil 1" ≠ "Hanil 2", 3-gram 집합은 "000010" 과 "001010" 을 구분하지 못함)
+#    · 모든 쌍을 비교하지 않고 prefix filtering 블로킹:
+#      각 키의 3-gram 을 전체 빈도 오름차순으로 정렬한 앞부분(prefix)에서 3-gram 두 개 조합을 블록 키로 사용
+#      → 임계값 이상인 쌍은 반드시 prefix 3-gram 을 두 개 이상 공유 (누락 없음), 흔한 3-gram 은 블록이 되지 않음
+#      (단, MAX_BLOCK_SIZE 보다 흔한 3-gram 은 prefix 에 있어도 블록 키에서 제외)
+#    · 후보 쌍 = 희소 행렬 곱 (새 키 블록 × 길이가 맞는 구간의 키 블록) → 길이 필터
+#      → 공통 3-gram 수 상한 필터 (prefix 공유 수 + prefix 가 먼저 끝나는 쪽의 나머지 3-gram 수)
+#      → 남은 쌍만 Dice 를 벡터로 검증
+#  - 수출자/수입자는 별도 이름 공간 (한국 수출자와 인도네시아 수입자는 이름이 비슷해도 다른 회사)
+#    → 컬럼별로 따로 판별하고 대표 이름도 그 컬럼의 행 수로만 정함 (이름이 다른 컬럼으로 옮겨가지 않음)
+#  - 대표 이름: 묶음 안에서 행 수가 가장 많은 표기, 한 번 정해진 대표 이름은 바뀌지 않음
+#    (새 표기가 기존 회사 둘과 비슷하면 가장 비슷한 쪽에 붙이고 기존 회사끼리는 합치지 않음)
+#  - 별칭 맵(표기 → 대표 이름)을 저장해 두고 새 데이터에서 처음 보는 표기만 판별 (증분)
+#  예) python entity.py data/          (저장소 별칭 맵 요약)
+#      python entity.py jakarta.xlsx   (스냅샷 별칭 맵 요약)
+# =======================================
+ALIAS_FORMAT = 2
+ENTITY_COLUMNS = ['수출자', '수입자']
+# 3-gram Dice (2-gram 은 라틴 문자 조합이 수백 개뿐이라 수십만 개 이름에서는 블록이 너무 커짐)
+GRAM_SIZE = 3
+MATCH_THRESHOLD = 0.845
+DISTINCTIVE_THRESHOLD = 0.75
+# 이름 수의 0.2% 이상(최소 5개)에 등장하는 단어는 흔한 단어로 보고 구별 부분에서 제외
+COMMON_TOKEN_SHARE = 0.002
+COMMON_TOKEN_MIN = 5
+# 이보다 많은 이름에 등장하는 3-gram 은 블록 키로 쓰지 않음 (아주 흔한 이름끼리의 후보 폭증 방지)
+MAX_BLOCK_SIZE = 2000
+# 후보 쌍 행렬 곱을 새 이름 CHUNK_SIZE 개씩 나눠서 계산 (메모리 상한)
+CHUNK_SIZE = 5000
+_DIGITS = re.compile(r'\d+')
+
+
+def name_form(name):
+    # 정규화 표기 (단어 구분 유지), 법인 표기만 있는 이름은 원문 기준
+    return normalize_name(name) or ' '.join(str(name).casefold().split())
+
+
+def compact(form):
+    # 공백까지 없앤 키 ("G & G Trading" = "GG Trading")
+    return form.replace(' ', '')
+
+
+def _bigrams(key):
+    padded = '^' + key + '$'
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _dice(a, b):
+    a, b = _bigrams(a), _bigrams(b)
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+
+def _gram_matrix(keys):
+    # 키별 3-gram 이진 희소 행렬 (문자를 UTF-32 코드로 바꿔 연속 문자 3개를 벡터 연산으로 묶음)
+    from scipy import sparse  # scipy 는 새 이름을 판별할 때만 로드
+
+    text = ''.join('\x02' + key + '\x03' for key in keys)
+    chars = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    lengths = np.fromiter((len(key) + 2 for key in keys), dtype=np.int64, count=len(keys))
+    span = GRAM_SIZE - 1
+    rows = np.repeat(np.arange(len(keys)), lengths)[:len(chars) - span]
+    codes = np.zeros(len(chars) - span, dtype=np.int64)
+    valid = np.ones(len(codes), dtype=bool)
+    for offset in range(GRAM_SIZE):
+        window = chars[offset:len(chars) - span + offset]
+        codes = (codes << 21) | window
+        if offset < span:
+            valid &= window != 3  # 키 끝('$') 을 넘어 다음 키로 이어지는 gram 제외
+    _, columns = np.unique(codes[valid], return_inverse=True)
+    columns = columns.reshape(-1)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(columns), dtype=np.int32), (rows[valid], columns)),
+        shape=(len(keys), int(columns.max()) + 1 if len(columns) else 0),
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix
+
+
+def _prefix_blocks(full, jaccard):
+    # 각 행에서 가장 드문 3-gram prefix (길이 = |A| - ceil(j·|A|) + 2) 를 뽑고
+    # prefix 안의 3-gram 두 개 조합을 블록 키로 사용 → 임계값 이상인 쌍은 prefix 3-gram 을 2개 이상 공유하므로
+    # 조합 키를 하나 이상 공유 (3-gram 하나만 같은 대부분의 쌍은 후보가 되지 않음)
+    # 반환: (행 × 블록 키 희소 행렬, 행별 prefix 길이, 행별 prefix 마지막 3-gram 의 전역 순위)
+    from scipy import sparse
+
+    frequency = np.asarray(full.sum(axis=0)).reshape(-1)
+    sizes = np.diff(full.indptr)
+    rows = np.repeat(np.arange(full.shape[0]), sizes)
+    order = np.lexsort((full.indices, frequency[full.indices], rows))
+    rank = np.arange(len(order)) - full.indptr[rows[order]]
+    lengths = sizes - np.ceil(jaccard * sizes).astype(np.int64) + 2
+    # 흔한 3-gram 은 전역 순서의 맨 뒤이므로 빼도 prefix 는 여전히 앞부분 (길이만 짧아짐)
+    keep = (rank < lengths[rows[order]]) & (frequency[full.indices[order]] <= MAX_BLOCK_SIZE)
+    order = order[keep]
+    grams, rows = full.indices[order].astype(np.int64), rows[order]
+    counts = np.bincount(rows, minlength=full.shape[0])
+    global_rank = frequency[grams].astype(np.int64) * full.shape[1] + grams
+    last = np.full(full.shape[0], -1, dtype=np.int64)
+    last[rows] = global_rank  # 행 안에서는 전역 순서대로 정렬돼 있으므로 마지막 값이 남음
+
+    # 행 안의 (앞 3-gram, 뒤 3-gram) 조합을 반복 없이 벡터로 나열
+    position = np.arange(len(grams)) - (np.cumsum(counts) - counts)[rows]
+    later = counts[rows] - 1 - position
+    first = np.repeat(np.arange(len(grams)), later)
+    second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(later) - later, later)
+    keys, columns = np.unique(grams[first] * full.shape[1] + grams[second], return_inverse=True)
+    blocks = sparse.csr_matrix(
+        (np.ones(len(first), dtype=np.int32), (rows[first], columns.reshape(-1))),
+        shape=(full.shape[0], len(keys)),
+    )
+    return blocks, counts, last
+
+
+def _common_tokens(forms):
+    # 여러 회사에 흔히 붙는 단어 (logistics, international, indonesia ...)
+    counts = pd.Series(list(forms), dtype=object).str.split().explode().value_counts()
+    limit = max(COMMON_TOKEN_MIN, COMMON_TOKEN_SHARE * len(forms))
+    return set(counts.index[counts.to_numpy() >= limit])
+
+
+def _distinctive(form, common):
+    # 흔한 단어만으로 된 이름은 빈 문자열 (흔한 단어만 같다고 같은 회사로 보지 않음)
+    return ''.join(token for token in form.split() if token not in common)
+
+
+def _match_keys(new_forms, old_forms, threshold=MATCH_THRESHOLD):
+    # new_forms 각각에 대해 Dice ≥ threshold 인 (new 위치, 전체 위치, Dice) 목록, 전체 = new_forms + old_forms
+    forms = list(new_forms) + list(old_forms)
+    n_new = len(new_forms)
+    full = _gram_matrix([compact(form) for form in forms])
+    sizes = np.diff(full.indptr)
+    jaccard = threshold / (2 - threshold)
+    blocks, prefix_sizes, last = _prefix_blocks(full, jaccard)
+    # prefix 가 먼저 끝나는 쪽의 prefix 밖 3-gram 수 (prefix 공유 수 + 이 값 = 공통 3-gram 수 상한)
+    rest = sizes - prefix_sizes
+
+    # 3-gram 수 순으로 정렬 → 새 키 묶음마다 길이 필터를 통과할 수 있는 연속 구간의 키만 곱함
+    # (새 키끼리는 정렬 순서상 뒤쪽 키하고만 비교해서 같은 쌍을 두 번 계산하지 않음)
+    by_size = np.argsort(sizes, kind='stable')
+    new_rows, old_rows = by_size[by_size < n_new], by_size[by_size >= n_new]
+    targets = [
+        (new_rows, sizes[new_rows], blocks[new_rows], True),
+        (old_rows, sizes[old_rows], blocks[old_rows], False),
+    ]
+
+    matched = []
+    for lo in range(0, n_new, CHUNK_SIZE):
+        rows = new_rows[lo:lo + CHUNK_SIZE]
+        probe = blocks[rows].T.tocsr()
+        for target_rows, target_sizes, target_blocks, is_new in targets:
+            start = np.searchsorted(target_sizes, jaccard * sizes[rows[0]], side='left')
+            stop = np.searchsorted(target_sizes, sizes[rows[-1]] / jaccard, side='right')
+            if is_new:
+                start = max(start, lo)
+            if start >= stop:
+                continue
+            # (구간 × 묶음) 순서로 곱해서 전치 변환은 작은 묶음 쪽에서만 일어나게 함
+            candidates = (target_blocks[start:stop] @ probe).tocoo()
+            found, probed, pairs = candidates.row + start, candidates.col, candidates.data
+            if is_new:
+                keep = found > probed + lo
+                found, probed, pairs = found[keep], probed[keep], pairs[keep]
+            left, right = rows[probed], target_rows[found]
+            left_sizes, right_sizes = sizes[left], sizes[right]
+            # 공유 조합 키 수 = c(c-1)/2 → 공유 prefix 3-gram 수 c
+            shared = np.rint((1 + np.sqrt(1 + 8.0 * pairs)) / 2)
+            # 길이 필터, 공통 3-gram 수 상한 필터 (대부분의 후보가 여기서 걸러짐)
+            bound = shared + np.where(last[left] <= last[right], rest[left], rest[right])
+            keep = (np.minimum(left_sizes, right_sizes) >= jaccard * np.maximum(left_sizes, right_sizes)) & (
+                2.0 * bound >= threshold * (left_sizes + right_sizes))
+            left, right = left[keep], right[keep]
+            common = np.asarray(full[left].multiply(full[right]).sum(axis=1)).reshape(-1)
+            dice = 2.0 * common / np.maximum(sizes[left] + sizes[right], 1)
+            keep = dice >= threshold
+            matched.append((left[keep], right[keep], dice[keep]))
+    if matched:
+        left, right, dice = (np.concatenate(parts) for parts in zip(*matched))
+    else:
+        left, right, dice = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+
+    # 흔한 단어를 뺀 나머지도 비슷하고 숫자가 같아야 같은 회사 ("Js International Logistics" ≠ "Jr International Logistics")
+    common_tokens = _common_tokens(forms)
+    keep = np.array([
+        _DIGITS.findall(forms[i]) == _DIGITS.findall(forms[j])
+        and _dice(_distinctive(forms[i], common_tokens), _distinctive(forms[j], common_tokens)) >= DISTINCTIVE_THRESHOLD
+        for i, j in zip(left, right)
+    ], dtype=bool)
+    return left[keep], right[keep], dice[keep]
+
+
+class ColumnAliases:
+    # 컬럼 하나의 별칭 맵
+    def __init__(self, aliases=None, forms=None):
+        self.aliases = dict(aliases or {})   # 표기 → 대표 이름
+        self.forms = dict(forms or {})       # 정규화 표기 → 대표 이름
+        self._compact = {compact(form): canonical for form, canonical in self.forms.items()}
+
+    def __len__(self):
+        return len(self.aliases)
+
+    def _add(self, form, names, canonical):
+        self.forms[form] = canonical
+        self._compact[compact(form)] = canonical
+        for name in names:
+            self.aliases[name] = canonical
+
+    def resolve(self, counts):
+        """처음 보는 표기만 판별해서 맵에 추가. counts: {표기: 행 수}. 추가된 표기 수 반환."""
+        new_names = [name for name in counts if name not in self.aliases]
+        if not new_names:
+            return 0
+
+        # 1단계: 정규화 키가 이미 알려진 회사면 그대로 연결, 나머지는 정규화 표기별로 모음
+        pending = {}
+        for name in new_names:
+            form = name_form(name)
+            canonical = self._compact.get(compact(form))
+            if canonical is not None:
+                self._add(form, [name], canonical)
+            else:
+                pending.setdefault(compact(form), (form, []))[1].append(name)
+        if not pending:
+            return len(new_names)
+
+        new_forms = [form for form, _ in pending.values()]
+        form_names = [names for _, names in pending.values()]
+        old_forms = list(self.forms)
+        left, right, dice = _match_keys(new_forms, old_forms)
+        n_new = len(new_forms)
+
+        # 2단계-1: 기존 회사와 비슷한 새 표기 → 가장 비슷한 기존 회사에 연결
+        attached = {}
+        to_old = right >= n_new
+        for i, j, score in zip(left[to_old], right[to_old], dice[to_old]):
+            if score > attached.get(i, (None, -1.0))[1]:
+                attached[i] = (self.forms[old_forms[j - n_new]], score)
+
+        # 2단계-2: 나머지 새 표기끼리 연결 요소 → 새 회사, 대표 이름 = 행 수가 가장 많은 표기
+        parent = list(range(n_new))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, j in zip(left[~to_old], right[~to_old]):
+            if i not in attached and j not in attached:
+                parent[find(i)] = find(j)
+
+        groups = {}
+        for i in range(n_new):
+            if i not in attached:
+                groups.setdefault(find(i), []).append(i)
+        for members in groups.values():
+            canonical = max((name for i in members for name in form_names[i]), key=lambda name: (counts[name], name))
+            for i in members:
+                attached[i] = (canonical, 1.0)
+
+        for i, form in enumerate(new_forms):
+            self._add(form, form_names[i], attached[i][0])
+        return len(new_names)
+
+    def groups(self):
+        # {대표 이름: [표기, ...]} (표기가 2개 이상인 회사만)
+        result = {}
+        for name, canonical in self.aliases.items():
+            result.setdefault(canonical, []).append(name)
+        return {canonical: sorted(names) for canonical, names in result.items() if len(names) > 1}
+
+
+class AliasMap:
+    # 컬럼별 별칭 맵 묶음 (파일 1개로 저장)
+    def __init__(self, columns=None):
+        self.columns = {col: ColumnAliases(**spec) for col, spec in (columns or {}).items()}
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get('format') != ALIAS_FORMAT:
+            return cls()
+        return cls(data['columns'])
+
+    def save(self, path):
+        # 고유 임시 파일에 쓰고 교체 (여러 프로세스가 동시에 저장해도 서로의 임시 파일을 덮어쓰지 않음)
+        columns = {col: {'aliases': m.aliases, 'forms': m.forms} for col, m in self.columns.items()}
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'format': ALIAS_FORMAT, 'columns': columns}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def __len__(self):
+        return sum(len(m) for m in self.columns.values())
+
+    def column(self, col):
+        return self.columns.setdefault(col, ColumnAliases())
+
+    def resolve(self, counts):
+        """컬럼별로 처음 보는 표기만 판별. counts: {컬럼: {표기: 행 수}}. 추가된 표기 수 반환."""
+        return sum(self.column(col).resolve(col_counts) for col, col_counts in counts.items())
+
+    def groups(self):
+        # {컬럼: {대표 이름: [표기, ...]}}
+        return {col: m.groups() for col, m in self.columns.items()}
+
+
+def name_counts(df, columns=ENTITY_COLUMNS):
+    # {컬럼: {표기: 행 수}} (카테고리 코드 bincount, 컬럼끼리 합치지 않음)
+    counts = {}
+    for col in columns:
+        series = df[col]
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype('category')
+        codes = series.cat.codes.to_numpy()
+        rows = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        counts[col] = {name: int(n) for name, n in zip(series.cat.categories, rows) if n}
+    return counts
+
+
+def apply_aliases(df, alias_map, columns=ENTITY_COLUMNS):
+    # 카테고리 이름만 대표 이름으로 바꾸고 코드를 다시 매핑 (행 단위 문자열 처리 없음)
+    df = df.copy()
+    for col in columns:
+        series = df[col]
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype('category')
+        categories = series.cat.categories
+        aliases = alias_map.column(col).aliases
+        renamed = np.array([aliases.get(name, name) for name in categories], dtype=object)
+        merged, remap = np.unique(renamed, return_inverse=True) if len(renamed) else (renamed, np.empty(0, dtype=np.int64))
+        codes = series.cat.codes.to_numpy()
+        codes = np.where(codes >= 0, remap.reshape(-1)[np.maximum(codes, 0)], -1)
+        df[col] = pd.Categorical.from_codes(codes, categories=merged)
+    return df
+
+
+def check_columns(df, alias_map, columns=ENTITY_COLUMNS):
+    # 회귀 검사: 통일 후 이름은 모두 같은 컬럼에서 본 적 있는 표기 (다른 컬럼의 이름으로 옮겨간 표기가 없어야 함)
+    for col in columns:
+        codes = df[col].cat.codes.to_numpy()
+        used = df[col].cat.categories[np.unique(codes[codes >= 0])]
+        moved = set(used) - set(alias_map.column(col).aliases)
+        if moved:
+            raise ValueError(f"{col}: 다른 컬럼의 이름으로 통일된 표기 {len(moved)}개 (예: {sorted(moved)[:3]})")
+
+
+def resolve_frame(df, alias_map, columns=ENTITY_COLUMNS):
+    alias_map.resolve(name_counts(df, columns))
+    df = apply_aliases(df, alias_map, columns)
+    check_columns(df, alias_map, columns)
+    return df
+
+
+def main(argv=None):
+    from snapshot import alias_path as snapshot_alias_path
+    from store import alias_path as store_alias_path
+
+    parser = argparse.ArgumentParser(description="회사명 별칭 맵 요약")
+    parser.add_argument('source', nargs='?', default='jakarta.xlsx', help="엑셀 파일 또는 추출 파일 폴더")
+    parser.add_argument('--limit', type=int, default=20, help="출력할 회사 수")
+    args = parser.parse_args(argv)
+
+    path = store_alias_path(args.source) if os.path.isdir(args.source) else snapshot_alias_path(args.source)
+    alias_map = AliasMap.load(path)
+    print(path)
+    for col, column in alias_map.columns.items():
+        groups = column.groups()
+        print(f"[{col}] 표기 {len(column):,}개 → 회사 {len(set(column.aliases.values())):,}개, 여러 표기 {len(groups):,}개")
+        for canonical, names in sorted(groups.items(), key=lambda item: -len(item[1]))[:args.limit]:
+            print(f"  {canonical}: {' | '.join(name for name in names if name != canonical)}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
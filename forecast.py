@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+
+
+# =======================================
+# 월별 컨테이너 물량 예측 (수출자 / 수입자 / 선적항→도착항 구간)
+#  - 시계열 = 선적일 누적합 롤업의 월 경계 차이 → (시계열 × 월) 행렬 1개 (원본 행 스캔 X)
+#  - 모델 적합은 시계열별 반복 없이 월 단위 반복 + 모든 시계열 벡터 연산
+#    · 단순 지수평활(SES): 평활 계수 후보 ALPHAS 를 (후보 × 시계열) 로 한 번에 돌려 1-step 오차 제곱합이 가장 작은 계수
+#    · 계절 naive: 2주기(24개월) 이상 쌓였을 때만, 같은 구간 1-step 평균 절대 오차가 SES 보다 작은 시계열에 사용
+#  - 예측 구간(80%): 1-step 잔차 RMSE × (SES: sqrt(1 + (h-1)α²), 계절 naive: sqrt(지난 주기 수 + 1)), 0 미만은 0
+#  - 월 축은 첫 월 ~ 마지막 월 연속 (선적이 없는 월은 0)
+#  - 추출 기준일이 마지막 월 말일보다 앞이면(진행 중인 월) 적합에서 제외
+#    (기준일을 지정하지 않았으면 마지막 선적일 + 데이터에서 가장 긴 선적 공백(주말/연휴, 최대 MAX_GAP_DAYS)까지로 추정)
+#  - 데이터셋 버전별로 시계열 종류마다 1회 계산 (전체 기간 기준)
+# =======================================
+SERIES = {'수출자': ['수출자'], '수입자': ['수입자'], '구간': ['선적항', '도착항']}
+HORIZON = 3
+SEASON = 12
+ALPHAS = np.round(np.linspace(0.1, 0.9, 9), 2)
+INTERVAL_Z = 1.2816
+MODELS = ('SES', '계절 naive')
+MAX_GAP_DAYS = 7
+
+
+def month_label(month):
+    return str(np.datetime64(month, 'M'))
+
+
+def fit_ses(history, alphas=ALPHAS):
+    # history: (시계열 × 월) → 시계열별 (최종 수준, 계수, 1-step 잔차 (시계열 × 월-1))
+    n_series, n_months = history.shape
+    level = np.repeat(history[None, :, 0], len(alphas), axis=0)
+    errors = np.zeros((len(alphas), n_series, max(n_months - 1, 0)))
+    weights = alphas[:, None]
+    for t in range(1, n_months):
+        errors[:, :, t - 1] = history[None, :, t] - level
+        level += weights * errors[:, :, t - 1]
+    best = np.argmin((errors ** 2).sum(axis=2), axis=0)
+    rows = np.arange(n_series)
+    return level[best, rows], alphas[best], errors[best, rows]
+
+
+def month_axis(timeline):
+    # 첫 월 ~ 마지막 월 연속 월 목록과 각 월의 [시작, 끝) 일자 경계 (선적이 없는 월은 시작 = 끝)
+    if not timeline.n_days:
+        return np.zeros(0, dtype='datetime64[M]'), np.zeros(1, dtype=np.int64)
+    months = np.arange(timeline.months[0], timeline.months[-1] + 1)
+    starts = np.searchsorted(timeline.days, months.astype('datetime64[D]'), side='left')
+    return months, np.append(starts, timeline.n_days)
+
+
+def _is_partial(timeline, cutoff=None):
+    # 추출 기준일이 마지막 월 말일보다 앞이면 진행 중인 월
+    if not timeline.n_days:
+        return False
+    last_day = timeline.days[-1]
+    month_end = (last_day.astype('datetime64[M]') + 1).astype('datetime64[D]') - 1
+    if cutoff is None:
+        gaps = np.diff(timeline.days).astype(np.int64)
+        cutoff = last_day + (min(int(gaps.max()), MAX_GAP_DAYS) - 1 if len(gaps) else 0)
+    return bool(max(np.datetime64(cutoff, 'D'), last_day) < month_end)
+
+
+class VolumeForecast:
+    def __init__(self, dataset, series):
+        self.series = series
+        self.columns = SERIES[series]
+        timeline = dataset.timeline
+        rollup = dataset.dimension_rollup(self.columns)
+        months, bounds = month_axis(timeline)
+        self.partial_month = _is_partial(timeline, dataset.cutoff) and len(months) > 1
+        if self.partial_month:
+            months, bounds = months[:-1], bounds[:-1]
+
+        self.key_codes = rollup.key_codes
+        self._pool = dataset.pool
+        self._dtypes = [dataset.df[col].dtype for col in self.columns]
+        self.history = rollup.containers.by_period(bounds).astype(np.float64)
+        self.months = [month_label(m) for m in months]
+        self.future_months = [month_label(m) for m in months[-1] + np.arange(1, HORIZON + 1)] if len(months) else []
+        self._fit()
+
+    def __len__(self):
+        return len(self.history)
+
+    def _fit(self):
+        n_series, n_months = self.history.shape
+        steps = np.arange(1, HORIZON + 1)
+        level, self.alpha, errors = fit_ses(self.history) if n_months else (
+            np.zeros(n_series), np.zeros(n_series), np.zeros((n_series, 0)))
+        self.model = np.zeros(n_series, dtype=np.int8)
+        self.forecast = np.repeat(level[:, None], HORIZON, axis=1)
+        spread = np.sqrt(1 + (steps[None, :] - 1) * self.alpha[:, None] ** 2)
+        residuals, counts = errors, np.full(n_series, n_months - 1)
+
+        if n_months >= 2 * SEASON:
+            # 계절 naive: h 개월 뒤 = 1주기 전 같은 달 (잔차는 SES 와 같은 구간 t ≥ SEASON 에서 비교)
+            seasonal_errors = self.history[:, SEASON:] - self.history[:, :-SEASON]
+            use = np.abs(seasonal_errors).mean(axis=1) < np.abs(errors[:, SEASON - 1:]).mean(axis=1)
+            self.model[use] = 1
+            lag = n_months - SEASON + (steps - 1) % SEASON
+            self.forecast[use] = self.history[use][:, lag]
+            spread[use] = np.sqrt((steps - 1) // SEASON + 1)
+            residuals = np.where(use[:, None], np.pad(seasonal_errors, ((0, 0), (SEASON - 1, 0))), errors)
+            counts[use] = n_months - SEASON
+
+        sigma = np.sqrt((residuals ** 2).sum(axis=1) / np.maximum(counts, 1))
+        self.forecast = np.maximum(self.forecast, 0)
+        margin = INTERVAL_Z * sigma[:, None] * spread
+        self.lower = np.maximum(self.forecast - margin, 0)
+        self.upper = self.forecast + margin
+
+    def _labels(self, keys):
+        return {
+            col: pd.Categorical.from_codes(codes[keys], dtype=dtype)
+            for col, codes, dtype in zip(self.columns, self.key_codes, self._dtypes)
+        }
+
+    def position(self, values):
+        # (컬럼 값, ...) → 시계열 번호 (없으면 -1)
+        codes = self._pool.get_indexer(list(values))
+        if (codes < 0).any():
+            return -1
+        match = np.flatnonzero(np.logical_and.reduce([kc == code for kc, code in zip(self.key_codes, codes)]))
+        return int(match[0]) if len(match) else -1
+
+    def table(self, min_containers=0):
+        # 시계열별 다음 HORIZON 개월 예측 (예측 합계 내림차순), 실적 합계 min_containers 이상만
+        keys = np.flatnonzero(self.history.sum(axis=1) >= max(min_containers, 1))
+        keys = keys[np.argsort(-self.forecast[keys].sum(axis=1), kind='stable')]
+        result = pd.DataFrame({'순위': np.arange(1, len(keys) + 1), **self._labels(keys)})
+        result['실적 합계'] = self.history[keys].sum(axis=1).astype(np.int64)
+        if self.months:
+            result[f'{self.months[-1]} 실적'] = self.history[keys, -1].astype(np.int64)
+        for i, month in enumerate(self.future_months):
+            result[f'{month} 예측'] = self.forecast[keys, i].round(1)
+        result['예측 합계'] = self.forecast[keys].sum(axis=1).round(1)
+        result['예측 상한 합계'] = self.upper[keys].sum(axis=1).round(1)
+        result['모델'] = np.asarray(MODELS, dtype=object)[self.model[keys]]
+        result['평활 계수'] = np.where(self.model[keys] == 0, self.alpha[keys], np.nan)
+        return result
+
+    def series_frame(self, values):
+        # 시계열 하나의 실적 + 예측 (차트가 이어지도록 마지막 실적 월에 예측 시작점 포함)
+        key = self.position(values)
+        n_months = len(self.months)
+        history = self.history[key] if key >= 0 else np.zeros(n_months)
+        forecast = self.forecast[key] if key >= 0 else np.zeros(HORIZON)
+        lower = self.lower[key] if key >= 0 else np.zeros(HORIZON)
+        upper = self.upper[key] if key >= 0 else np.zeros(HORIZON)
+        joint = history[-1:] if n_months else np.zeros(0)
+        nan = np.full(max(n_months - 1, 0), np.nan)
+        return pd.DataFrame({
+            '월': self.months + self.future_months,
+            '실적': np.concatenate([history, np.full(HORIZON, np.nan)]),
+            '예측': np.concatenate([nan, joint, forecast]).round(1),
+            '하한': np.concatenate([nan, joint, lower]).round(1),
+            '상한': np.concatenate([nan, joint, upper]).round(1),
+        })
+
+    def describe(self, values):
+        key = self.position(values)
+        if key < 0:
+            return None
+        return {
+            'model': MODELS[self.model[key]],
+            'alpha': float(self.alpha[key]) if self.model[key] == 0 else None,
+            'months': len(self.months),
+            'partial_month': self.partial_month,
+        }
@@ -1,18 +1,32 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
-import matplotlib.pyplot as plt
-import seaborn as sns
-import platform
 import json
 import os
 
+from dataset import MAX_LOADED, load_dataset
+from shared_dataset import load_shared_dataset
+from store import ingest, list_routes
+from paging import TableView
+from perf import PERF
+from query_cache import QUERY_CACHE
+from warmup import start_background_warmup
+from cube import SHARE_COLUMN
+from analytics import (
+    business_options, carrier_ranking, carrier_share_summary, commodity_companies, commodity_items, commodity_summary,
+    company_forecast, company_info, company_summary, dependency_leaderboard,
+    filter_business, filter_data, forecast_model, format_date_range, lane_ranking, market_leaders, market_share, monthly_trend, overview,
+    partner_summary, partner_type_of, route_summary, search_companies, shared_partners, similar_customers,
+    trade_cluster, trade_concentration, trade_peers, trade_prospects, volume_forecast,
+)
+
 
 # =======================================
 # 인증 ID 목록
 # =======================================
 ALLOWED_IDS = ['kimdonghyun', 'taewoong']
+# 성능 모니터 패널을 볼 수 있는 ID
+ADMIN_IDS = ['kimdonghyun']
 
 # =======================================
 # 세션 상태 기본값
@@ -56,6 +70,7 @@ def show_login():
     if enter_clicked:
         if user_id in ALLOWED_IDS:
             st.session_state.authorized = True
+            st.session_state.user_id = user_id
             st.rerun()
         elif user_id:
             st.warning("Unregistered ID. Please contact the administrator.")
@@ -94,25 +109,256 @@ def show_login():
 # 데이터 관련 설정/함수
 # =======================================
 PREDEFINED_FILE_PATH = 'jakarta.xlsx'
-
-@st.cache_data
-def load_data():
+# 월별/항로별 추출 파일 폴더가 있으면 폴더 전체를 사용 (없으면 jakarta.xlsx 1개)
+DATA_DIR = os.environ.get('KUMO_DATA_DIR', 'data')
+DATA_SOURCE = DATA_DIR if os.path.isdir(DATA_DIR) else PREDEFINED_FILE_PATH
+# 새 추출 파일 확인 주기 (변경이 없으면 기존 데이터셋을 그대로 재사용)
+DATA_REFRESH_SECONDS = 300
+COMPANY_SEARCH_LIMIT = 50
+# 성능 통계 JSON 을 주기적으로 내보낼 경로 (모니터링 수집용, 미설정 시 내보내지 않음)
+PERF_DUMP_PATH = os.environ.get('KUMO_PERF_DUMP')
+PERF_DUMP_INTERVAL = 60
+# 여러 워커 프로세스로 띄울 때 데이터셋/인덱스를 공유할 폴더 (설정 시 mmap 으로 연결, 미설정 시 프로세스별 로드)
+SHARED_DIR = os.environ.get('KUMO_SHARED_DIR')
+# 결과 표 페이지 크기 / 상위 N 선택지
+PAGE_SIZES = [25, 50, 100, 200]
+TOP_N_OPTIONS = ['전체', 10, 20, 50, 100, 500]
+
+# cache_resource: 세션마다 복사본을 만들지 않고 프로세스 내 1개의 데이터셋을 공유
+#  - 항로 선택별로 1개, 주기적으로 새 파일 확인 (내용이 같으면 같은 데이터셋 객체 반환)
+#  - 로더 캐시와 같은 개수만 유지 (오래된 항로 선택은 밀려남)
+@st.cache_resource(ttl=DATA_REFRESH_SECONDS, max_entries=MAX_LOADED)
+def load_data(routes=None):
     try:
-        df = pd.read_excel(PREDEFINED_FILE_PATH, engine='openpyxl')
-        return df
+        # 원본 엑셀 대신 컬럼형 스냅샷(폴더면 항로 파티션)을 읽고, 문자열 컬럼은 공유 사전으로 인코딩
+        if SHARED_DIR:
+            return load_shared_dataset(DATA_SOURCE, routes, SHARED_DIR)
+        return load_dataset(DATA_SOURCE, routes)
     except Exception as e:
         st.error(f"파일 로드 중 오류 발생: {e}")
         return None
 
 
-def show_data_overview(df, start_date=None, end_date=None):
-    st.markdown(f"✅ **분석 데이터 개요**")
+# 프로세스당 1번: 첫 접속(로그인 화면)과 동시에 백그라운드에서 데이터셋/인덱스/기본 조회 준비
+#  - 로그인 후 load_data 는 같은 로더 캐시를 쓰므로 준비된 데이터셋을 바로 받음
+@st.cache_resource
+def start_warmup():
+    return start_background_warmup(DATA_SOURCE, shared_dir=SHARED_DIR)
+
+
+# st.dataframe 은 호출 시점에 Arrow 로 직렬화하므로 표 단위로 계측
+def show_dataframe(df, name, **kwargs):
+    with PERF.span('render.dataframe', name):
+        st.dataframe(df, use_container_width=True, **kwargs)
+
+
+# 큰 결과 표: 정렬/필터/페이징을 서버에서 처리하고 현재 페이지 행만 전송
+#  - 캐시된 결과는 복사/이름 변경 없이 그대로 두고 표시 이름은 column_config 로 지정
+def show_paged_table(df, name, key, label_column, column_labels=None, value_column='컨테이너수'):
+    column_labels = column_labels or {}
+    columns = list(df.columns)
+    text_columns = [col for col in columns if not pd.api.types.is_numeric_dtype(df[col].dtype)]
+
+    def label(col):
+        return column_labels.get(col, col)
+
+    col1, col2, col3, col4, col5 = st.columns([2, 1.5, 2, 3, 1.5])
+    with col1:
+        sort_by = st.selectbox("정렬", columns, format_func=label, key=f"{key}_sort")
+    with col2:
+        # 기본값: 순위 오름차순 (원래 순서)
+        order = st.selectbox("순서", ['오름차순', '내림차순'], key=f"{key}_order")
+    with col3:
+        filter_column = st.selectbox("필터 컬럼", text_columns, format_func=label, key=f"{key}_filter_column")
+    with col4:
+        filter_text = st.text_input("필터", key=f"{key}_filter", placeholder="포함 검색")
+    with col5:
+        top_n = st.selectbox("표시", TOP_N_OPTIONS, format_func=lambda n: n if n == '전체' else f"상위 {n}", key=f"{key}_top")
+
+    view = TableView(
+        df, sort_by, order == '오름차순', filter_column, filter_text.strip(),
+        None if top_n == '전체' else top_n, label_column, value_column,
+    )
 
-    total_records = len(df)
-    total_exporters = df['수출자'].nunique()
-    total_importers = df['수입자'].nunique()
-    total_containers = df['컨테이너수'].sum()
-    total_container_lines = df['컨테이너선사'].nunique()
+    page_col, size_col, info_col = st.columns([1.5, 1.5, 4])
+    with size_col:
+        page_size = st.selectbox("행 수", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    n_pages = view.n_pages(page_size)
+    # 필터/정렬이 바뀌어 페이지 수가 줄면 첫 페이지로
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = 1
+    with page_col:
+        page = st.number_input("페이지", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+    with info_col:
+        first_row = (page - 1) * page_size
+        st.caption(f"{min(first_row + 1, len(view)):,}–{min(first_row + page_size, len(view)):,} / {len(view):,}행 · {page}/{n_pages} 페이지")
+
+    show_dataframe(view.page(page, page_size), name, column_config=column_labels, hide_index=True)
+
+
+def show_bar_chart(df, name):
+    with PERF.span('render.chart', name):
+        st.bar_chart(df, x='월', y='컨테이너수')
+
+
+# 선사 점유율 분석 기준 → 큐브 차원
+MARKET_VIEWS = {
+    '구간': ['선적항', '도착항'],
+    '선적항': ['선적항'],
+    '수출자 대분류': ['수출자 대분류'],
+    '수입자 대분류': ['수입자 대분류'],
+    '월': ['월'],
+}
+
+
+@PERF.timed('market_share')
+def show_market_share(dataset):
+    cube = dataset.market_cube()
+    st.write("✅ **선사 점유율 분석** (월 단위)")
+    with st.expander("🔍 구간 / 대분류 / 월별 선사 점유율", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        view = col1.selectbox("기준", list(MARKET_VIEWS), key='market_view')
+        exporter_category = col2.selectbox("수출자 대분류", dataset.category_options('수출자'), key='market_exporter_category')
+        importer_category = col3.selectbox("수입자 대분류", dataset.category_options('수입자'), key='market_importer_category')
+
+        filters = {}
+        if exporter_category != 'ALL':
+            filters['수출자 대분류'] = [exporter_category]
+        if importer_category != 'ALL':
+            filters['수입자 대분류'] = [importer_category]
+        if len(cube.months) > 1:
+            first, last = st.select_slider(
+                "기간 (월)", options=cube.months, value=(cube.months[0], cube.months[-1]), key='market_months',
+            )
+            months = cube.months[cube.months.index(first):cube.months.index(last) + 1]
+            if len(months) < len(cube.months):
+                filters['월'] = months
+
+        # 1단계: 기준 값별 합계 / 1위 선사 / HHI
+        dimensions = MARKET_VIEWS[view]
+        leaders = market_leaders(dataset, dimensions, filters)
+        if leaders.empty:
+            st.warning("조건에 맞는 데이터가 없습니다.")
+            return
+        show_dataframe(leaders, 'market_leaders', hide_index=True)
+
+        # 2단계: 기준 값 하나를 골라 선사별 점유율
+        keys = {' → '.join(map(str, key)): key for key in zip(*(leaders[dimension].astype(object) for dimension in dimensions))}
+        selected = st.selectbox(f"{view} 선택", list(keys), key='market_drill')
+        drill_filters = {**filters, **{dimension: [value] for dimension, value in zip(dimensions, keys[selected])}}
+        shares = market_share(dataset, ['컨테이너선사'], share_within=[], filters=drill_filters)
+        show_dataframe(shares, 'market_carriers', hide_index=True)
+
+        # 3단계: 선사를 골라 월별 점유율 추이
+        carrier = st.selectbox("선사 선택", shares['컨테이너선사'].astype(object).tolist(), key='market_carrier')
+        trend = market_share(dataset, ['월', '컨테이너선사'], share_within=['월'], filters=drill_filters)
+        trend = trend[trend['컨테이너선사'] == carrier][['월', '컨테이너수', SHARE_COLUMN]]
+        if len(trend) > 1:
+            with PERF.span('render.chart', 'market_trend'):
+                st.line_chart(trend, x='월', y=SHARE_COLUMN)
+        show_dataframe(trend, 'market_trend', hide_index=True)
+
+
+# 품목 검색 일치도 (검색어 2-gram 중 품목 설명에 포함된 비율)
+COMMODITY_MATCH_LEVELS = {'전체 포함': 1.0, '대부분 포함': 0.75, '일부 포함': 0.5}
+
+
+@PERF.timed('commodity_search')
+def show_commodity_search(dataset, start_date=None, end_date=None):
+    st.write("✅ **품목별 수출자/수입자 검색**")
+    with st.expander("🔍 화물품목 / 화물분류로 선적 회사 찾기", expanded=bool(st.session_state.get('commodity_query'))):
+        col1, col2 = st.columns([3, 1])
+        query = col1.text_input("품목 검색어", key='commodity_query', placeholder="예: 합성고무, 라이터, 타이어")
+        level = col2.selectbox("일치도", list(COMMODITY_MATCH_LEVELS), key='commodity_match_level')
+        if not query.strip():
+            return
+        min_score = COMMODITY_MATCH_LEVELS[level]
+
+        # 품목 역색인으로 일치 품목만 찾고 해당 행만 집계 (품목 설명 전체 스캔 X)
+        stats = commodity_summary(dataset, query, min_score, start_date, end_date)
+        if not stats['records']:
+            st.warning("검색어에 맞는 품목의 선적 건이 없습니다.")
+            return
+        st.caption(
+            f"품목 {stats['items']:,}개 · 선적 건 {stats['records']:,} · 컨테이너 {stats['containers']:,}대 · "
+            f"수출자 {stats['exporters']:,} · 수입자 {stats['importers']:,}"
+        )
+        items_tab, exporters_tab, importers_tab = st.tabs(["품목", "수출자", "수입자"])
+        with items_tab:
+            show_dataframe(commodity_items(dataset, query, min_score, start_date, end_date), 'commodity_items', hide_index=True)
+        for tab, party in ((exporters_tab, '수출자'), (importers_tab, '수입자')):
+            with tab:
+                column_labels = {f'{party} 대분류': '대분류', f'{party} 사업내용': '사업내용'}
+                show_paged_table(
+                    commodity_companies(dataset, query, party, min_score, start_date, end_date),
+                    f'commodity_{party}', f'commodity_{party}_table', party, column_labels,
+                )
+
+
+@PERF.timed('dependency')
+def show_dependency_leaderboard(dataset, analysis_type):
+    # 전체 회사의 거래처/선사/구간 HHI 를 한 번에 계산한 표에서 검색 조건(대분류, 최소 컨테이너)만 적용
+    st.write(f"✅ **{analysis_type} 거래 의존도 순위** (전체 기간 · HHI 10,000 = 한 곳에 100% 의존)")
+    with st.expander("🔍 거래처 / 선사 / 구간 집중도가 높은 회사", expanded=False):
+        leaderboard = dependency_leaderboard(
+            dataset, analysis_type, st.session_state.min_containers, st.session_state.selected_category,
+        )
+        if leaderboard.empty:
+            st.warning("조건에 맞는 데이터가 없습니다.")
+            return
+        column_labels = {f'{analysis_type} 대분류': '대분류'}
+        show_paged_table(leaderboard, 'dependency', 'dependency_table', analysis_type, column_labels)
+
+
+# 물량 예측 기준 (라벨 → 시계열 종류)
+FORECAST_SERIES = {'구간 (선적항 → 도착항)': '구간', '수출자': '수출자', '수입자': '수입자'}
+
+
+@PERF.timed('forecast')
+def show_volume_forecast(dataset):
+    st.write("✅ **월별 물량 예측** (전체 기간 실적 기준)")
+    with st.expander("🔍 구간 / 수출자 / 수입자별 다음 3개월 컨테이너 예측", expanded=False):
+        col1, col2 = st.columns([2, 1])
+        label = col1.selectbox("기준", list(FORECAST_SERIES), key='forecast_series')
+        min_containers = col2.selectbox("최소 실적 컨테이너", [0, 10, 50, 100, 500], key='forecast_min')
+        series = FORECAST_SERIES[label]
+        forecast_df = volume_forecast(dataset, series, min_containers)
+        if forecast_df.empty:
+            st.warning("조건에 맞는 데이터가 없습니다.")
+            return
+        st.caption("SES = 단순 지수평활, 계절 naive = 1년 전 같은 달 (24개월 이상 쌓인 경우) · 상한 = 80% 예측 구간")
+        if series == '구간':
+            show_dataframe(forecast_df, 'forecast_lanes', hide_index=True)
+        else:
+            show_paged_table(forecast_df, f'forecast_{series}', f'forecast_{series}_table', series, value_column='예측 합계')
+
+
+def show_company_forecast(dataset, analysis_type, selected_company):
+    forecast_df = company_forecast(dataset, analysis_type, selected_company)
+    model = forecast_model(dataset, analysis_type, selected_company)
+    st.markdown("✅ **물량 예측** (전체 기간 실적 기준)")
+    with st.expander("🔍 **다음 3개월 컨테이너 예측 확인**", expanded=False):
+        if model is None:
+            st.warning("예측할 실적이 없습니다.")
+            return
+        model_label = f"{model['model']} (평활 계수 {model['alpha']})" if model['alpha'] is not None else model['model']
+        st.caption(f"모델: {model_label} · 학습 {model['months']}개월 · 하한/상한 = 80% 예측 구간")
+        with PERF.span('render.chart', 'company_forecast'):
+            st.line_chart(forecast_df, x='월', y=['실적', '예측', '상한'])
+        show_dataframe(forecast_df, 'company_forecast', hide_index=True)
+
+
+@PERF.timed('overview')
+def show_data_overview(dataset, start_date=None, end_date=None):
+    st.markdown(f"✅ **분석 데이터 개요** ({format_date_range(dataset, start_date, end_date)})")
+
+    # 기간 합계/고유 수는 선적일 누적합 롤업에서 계산 (원본 행 스캔 X)
+    stats = overview(dataset, start_date, end_date)
+    total_records = stats['records']
+    total_exporters = stats['exporters']
+    total_importers = stats['importers']
+    total_containers = stats['containers']
+    total_container_lines = stats['carriers']
 
     col1, col2, col3, col4, col5 = st.columns(5)
 
@@ -167,42 +413,228 @@ def show_data_overview(df, start_date=None, end_date=None):
     )
 
     st.write("")    
-    st.image("jakarta1.jpg", width=700)
+    with PERF.span('render.image', 'jakarta1.jpg'):
+        st.image("jakarta1.jpg", width=700)
     
     # 컨테이너선사 정보 추가
     st.markdown("---")
-    container_line_df = df.groupby('컨테이너선사').agg({'컨테이너수': 'sum'}).reset_index()
-    container_line_df = container_line_df.sort_values(by='컨테이너수', ascending=False)
-    container_line_df['순위'] = range(1, len(container_line_df) + 1)
-    container_line_df = container_line_df[['순위', '컨테이너선사', '컨테이너수']].reset_index(drop=True)
+    container_line_df = carrier_ranking(dataset, start_date, end_date)
     total_lines = len(container_line_df)
     
     st.write("✅ **컨테이너선사 정보**")
     with st.expander(f"🔍 총 **{total_lines}**개 선사 확인", expanded=False):
-        st.dataframe(container_line_df, use_container_width=True)
+        show_dataframe(container_line_df, 'carriers')
+
+    # 선적항 → 도착항 구간 정보
+    lane_df = lane_ranking(dataset, start_date, end_date)
+    st.write("✅ **선적항 → 도착항 구간 정보**")
+    with st.expander(f"🔍 총 **{len(lane_df)}**개 구간 확인", expanded=False):
+        show_dataframe(lane_df, 'lanes')
+
+    # 구간/수출자/수입자별 물량 예측 (월별 시계열 행렬 일괄 적합)
+    show_volume_forecast(dataset)
+
+    # 선사 점유율 (구간 / 대분류 / 월 드릴다운, 사전 집계 큐브)
+    show_market_share(dataset)
+
+    # 품목 검색 (화물품목한글명/화물분류명 역색인)
+    show_commodity_search(dataset, start_date, end_date)
 
+    # 월별 추이 (전월 대비)
+    trend_df = monthly_trend(dataset, start_date, end_date)
+    st.write("✅ **월별 컨테이너 추이**")
+    with st.expander("🔍 월별 추이 확인 (전월 대비)", expanded=False):
+        show_bar_chart(trend_df, 'monthly')
+        show_dataframe(trend_df, 'monthly')
 
-def filter_data(df, analysis_type, min_containers, selected_category='ALL'):
-    # 대분류 필터링
-    if selected_category != 'ALL':
-        if analysis_type == '수출자':
-            df = df[df['수출자 대분류'] == selected_category]
+
+# =======================================
+# 개별 상세 분석 화면
+# =======================================
+CONCENTRATION_LABELS = {'partner': '거래처', 'carrier': '선사', 'lane': '구간'}
+
+
+@PERF.timed('trade_network')
+def show_trade_network(dataset, analysis_type, selected_company):
+    partner_type = partner_type_of(analysis_type)
+    st.markdown("✅ **거래 네트워크** (전체 기간 기준)")
+
+    concentration = trade_concentration(dataset, analysis_type, selected_company)
+    if concentration is None:
+        st.warning("거래 네트워크 데이터가 없습니다.")
+        return
+    # HHI: 비중 제곱합 × 10,000 (10,000 = 한 곳에 100% 집중)
+    for col, (dimension, label) in zip(st.columns(3), CONCENTRATION_LABELS.items()):
+        stats = concentration[dimension]
+        col.metric(f"{label} 집중도 (HHI)", f"{stats['hhi']:,}", help=f"{label} 수 {stats['count']:,}")
+        if stats['top']:
+            col.caption(f"최대: {stats['top']} ({stats['top_share']}%)")
+
+    st.markdown(f"**🎯 잠재 {partner_type}** (거래처가 겹치는 {analysis_type}들의 {partner_type} 중 아직 거래하지 않는 곳)")
+    prospects = trade_prospects(dataset, analysis_type, selected_company)
+    if prospects is None or prospects.empty:
+        st.info(f"추천할 {partner_type}가 없습니다.")
+    else:
+        show_dataframe(prospects, 'trade_prospects', hide_index=True)
+
+    st.markdown(f"**👥 거래처가 겹치는 {analysis_type}**")
+    peers = trade_peers(dataset, analysis_type, selected_company)
+    if peers is None or peers.empty:
+        st.info(f"거래처가 겹치는 {analysis_type}가 없습니다.")
+    else:
+        show_dataframe(peers, 'trade_peers', hide_index=True)
+        other = st.selectbox(f"공통 {partner_type} 비교 대상", peers[analysis_type].tolist(), key="trade_compare_company")
+        common = shared_partners(dataset, analysis_type, selected_company, other)
+        if common is not None and not common.empty:
+            show_dataframe(common, 'shared_partners', hide_index=True)
+
+    cluster = trade_cluster(dataset, analysis_type, selected_company)
+    if cluster is not None and len(cluster) > 1:
+        from network import CLUSTER_MIN_SHARE  # scipy 는 네트워크를 처음 열 때 로드
+        counts = cluster['구분'].value_counts()
+        st.markdown(
+            f"**🔗 거래 클러스터** (서로 물량 비중 {CLUSTER_MIN_SHARE:.0%} 이상인 거래로 연결된 회사: "
+            f"수출자 {counts.get('수출자', 0):,} · 수입자 {counts.get('수입자', 0):,})"
+        )
+        show_dataframe(cluster, 'trade_cluster', hide_index=True)
+
+
+@PERF.timed('detail_view')
+def show_company_detail(dataset, analysis_type, selected_company, start_date=None, end_date=None):
+    st.subheader(f"📈 {selected_company} 상세 분석 결과")
+    st.caption(f"📅 선적일 기간: {format_date_range(dataset, start_date, end_date)}")
+    st.markdown("<hr style='margin-top: 5px; margin-bottom: 10px;'>", unsafe_allow_html=True)
+    st.markdown("✅ **요약 정보**")
+
+    summary = company_summary(dataset, analysis_type, selected_company, start_date, end_date)
+    total_records = summary['records']
+    total_containers = summary['containers']
+    total_container_lines = summary['carriers']
+        
+    # 상대방 수 계산
+    partner_type = partner_type_of(analysis_type)
+    partner_count = summary['partners']
+    partner_label = f"거래 {partner_type}"
+
+    col1, col2, col3, col4 = st.columns(4)
+        
+    col1.markdown(f"""
+    <div style='text-align: center;'>
+        📄 <b>선적 건</b><br>
+        <span style='font-size: 20px;'>{total_records:,}</span>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col2.markdown(f"""
+    <div style='text-align: center;'>
+        📦 <b>컨테이너</b><br>
+        <span style='font-size: 20px;'>{total_containers:,}</span>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col3.markdown(f"""
+    <div style='text-align: center;'>
+        👥 <b>{partner_label}</b><br>
+        <span style='font-size: 20px;'>{partner_count}</span>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col4.markdown(f"""
+    <div style='text-align: center;'>
+        🚢 <b>부킹 선사</b><br>
+        <span style='font-size: 20px;'>{total_container_lines}</span>
+    </div>
+    """, unsafe_allow_html=True)
+        
+    st.markdown("")
+        
+    # 회사 정보 표시
+    info = company_info(dataset, analysis_type, selected_company)
+    st.markdown("✅ **회사 정보**")
+    st.markdown(f"**회사명:** {info['회사명']}")
+    st.markdown(f"**대분류:** {info['대분류']}")
+    st.markdown(f"**사업내용:** {info['사업내용']}")
+
+    # 유사 고객 찾기 (거래 상대방/선사/구간/화물 구성이 비슷한 회사)
+    if st.button(f"🤝 유사 {analysis_type} 찾기", key="similar_customers_button"):
+        st.session_state.show_similar_customers = True
+
+    if st.session_state.get('show_similar_customers', False):
+        similar_df = similar_customers(dataset, analysis_type, selected_company)
+        st.markdown(f"✅ **유사 {analysis_type}**")
+        if similar_df is None or similar_df.empty:
+            st.warning(f"유사한 {analysis_type}를 찾을 수 없습니다.")
         else:
-            df = df[df['수입자 대분류'] == selected_category]
-    
-    # 분석 타입에 따라 데이터 필터링
-    if analysis_type == '수출자':
-        grouped = df.groupby(['수출자', '수출자 대분류', '수출자 사업내용']).agg({'컨테이너수': 'sum'}).reset_index()
-        grouped = grouped[grouped['컨테이너수'] >= min_containers]
-        grouped = grouped.sort_values(by='컨테이너수', ascending=False).reset_index(drop=True)
-        grouped['순위'] = range(1, len(grouped) + 1)
-        return grouped[['순위', '수출자', '수출자 대분류', '수출자 사업내용', '컨테이너수']]
-    else:  # 수입자
-        grouped = df.groupby(['수입자', '수입자 대분류', '수입자 사업내용']).agg({'컨테이너수': 'sum'}).reset_index()
-        grouped = grouped[grouped['컨테이너수'] >= min_containers]
-        grouped = grouped.sort_values(by='컨테이너수', ascending=False).reset_index(drop=True)
-        grouped['순위'] = range(1, len(grouped) + 1)
-        return grouped[['순위', '수입자', '수입자 대분류', '수입자 사업내용', '컨테이너수']]
+            show_dataframe(similar_df, 'similar')
+
+    # 거래 네트워크 (거래처 집중도 / 동종 회사 / 잠재 거래처 / 거래 클러스터)
+    if st.button("🕸️ 거래 네트워크 분석", key="trade_network_button"):
+        st.session_state.show_trade_network = True
+
+    if st.session_state.get('show_trade_network', False):
+        show_trade_network(dataset, analysis_type, selected_company)
+
+    # 월별 추이 (전월 대비)
+    company_trend = monthly_trend(dataset, start_date, end_date, analysis_type, selected_company)
+    st.markdown("✅ **월별 추이**")
+    with st.expander("🔍 **월별 컨테이너 추이 확인**", expanded=False):
+        show_bar_chart(company_trend, 'company_monthly')
+        show_dataframe(company_trend, 'company_monthly')
+
+    # 물량 예측 (실적 + 다음 3개월)
+    show_company_forecast(dataset, analysis_type, selected_company)
+
+    st.markdown("✅ **상세 정보**")
+
+    with st.expander("🔍 **상세 정보 확인**", expanded=False):
+        # 상대방 분석 (수출자 분석 시 → 수입자 정보, 수입자 분석 시 → 수출자 정보)
+        partner_icon = '👳' if partner_type == '수입자' else '🧑'
+
+        partner_df = partner_summary(dataset, analysis_type, selected_company, start_date, end_date)
+        st.markdown(f"{partner_icon} **거래 {partner_type} 분석**")
+        show_paged_table(partner_df, 'partners', 'partners_table', partner_type)
+
+        st.markdown("---")
+
+        # 거래 상대방 분석2 (선적항/도착항 기준)
+        route_df = route_summary(dataset, analysis_type, selected_company, start_date, end_date)
+        st.markdown(f"{partner_icon} **거래 {partner_type} 분석2**")
+        show_paged_table(route_df, 'routes', 'routes_table', partner_type)
+
+        st.markdown("---")
+
+        # 컨테이너선사별 분석
+        container_line_summary = carrier_share_summary(dataset, analysis_type, selected_company, start_date, end_date)
+        st.markdown("🚢 **컨테이너선사별 분석**")
+        show_dataframe(container_line_summary, 'company_carriers')
+
+
+# 항로 목록 (데이터 폴더를 쓸 때만, 새 파일 적재 후 매니페스트에서 읽음)
+@st.cache_data(ttl=DATA_REFRESH_SECONDS)
+def available_routes():
+    if not os.path.isdir(DATA_SOURCE):
+        return ()
+    ingest(DATA_SOURCE)
+    return tuple(route for route, _ in list_routes(DATA_SOURCE))
+
+
+# 선택한 항로: 전체 선택이면 None 으로 정규화해서 캐시 키를 통일
+def selected_routes(routes):
+    selected = st.session_state.get('selected_routes')
+    if not selected or set(selected) >= set(routes):
+        return None
+    return tuple(sorted(selected))
+
+
+# 선적일 기간: 전체 기간이면 (None, None) 으로 정규화해서 캐시 키를 통일
+def selected_date_range(dataset):
+    date_range = st.session_state.get('date_range')
+    if not date_range or len(date_range) < 2:
+        return None, None
+    start_date, end_date = date_range
+    if dataset.timeline.is_full_range(start_date, end_date):
+        return None, None
+    return start_date, end_date
 
 
 
@@ -217,6 +649,7 @@ def reset_to_home():
     st.session_state.has_analysis_results = False
     st.session_state.analysis_data = None
     st.session_state.show_similar_customers = False
+    st.session_state.show_trade_network = False
     st.session_state.analysis_type = '수출자'
     st.session_state.min_containers = 0
     st.session_state.selected_company = None
@@ -228,22 +661,54 @@ def reset_to_home():
     # 사이드바 조건들 초기화
     for key in [
         'analysis_type', 'min_containers', 'selected_company', 'selected_category', 'selected_business', 'has_business_filter',
+        'company_query', 'date_range',
     ]:
         if key in st.session_state:
             del st.session_state[key]
 
 
+# =======================================
+# 성능 모니터 (관리자 전용)
+#  - 단계별/형태별 최근 실행 시간 p50/p95/p99 (프로세스 내 모든 세션 합산)
+# =======================================
+def perf_report():
+    return PERF.to_json({'query_cache': QUERY_CACHE.stats()})
+
+
+def show_perf_panel():
+    with st.expander("⚙️ 성능 모니터", expanded=False):
+        rows = PERF.rows()
+        if rows:
+            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        else:
+            st.caption("기록된 실행 시간이 없습니다.")
+        cache = QUERY_CACHE.stats()
+        st.caption(f"쿼리 캐시: {cache['entries']:,}개 / 적중률 {cache['hit_rate']:.1%}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("JSON", perf_report(), file_name="kumo_perf.json", mime="application/json", use_container_width=True)
+        with col2:
+            if st.button("초기화", key="perf_reset", use_container_width=True):
+                PERF.reset()
+                st.rerun()
+
+
 # =======================================
 # 메인 앱
 #  - 로그인 중복 제거 (show_login만 사용)
 #  - 인증 전: show_login() -> st.stop()
+#  - rerun 전체 시간은 'app', 주요 단계는 각각 span 으로 계측
 # =======================================
 
+@PERF.timed('app')
 def app():
     # 쿼리 파라미터에 home 있으면 홈 초기화
     if "home" in st.query_params:
         reset_to_home()
 
+    start_warmup()
+
     # 인증 확인 (여기서는 새 로그인 UI를 만들지 않음)
     if not st.session_state.get('authorized', False):
         show_login()  # 방어적 호출
@@ -261,10 +726,12 @@ def app():
         
         st.markdown("<hr style='margin-top: 10px; margin-bottom: 10px;'>", unsafe_allow_html=True)
 
-    with st.spinner("⏳ 조금만 기다려주세요. 데이터 로딩 중입니다."):
-        df = load_data()
-    if df is None:
+    with st.spinner("⏳ 조금만 기다려주세요. 데이터 로딩 중입니다."), PERF.span('load_data'):
+        routes = available_routes()
+        dataset = load_data(selected_routes(routes))
+    if dataset is None:
         return
+    df = dataset.df
 
     # 세션 키 기본값 설정
     for key, val in {
@@ -277,11 +744,13 @@ def app():
         'selected_category': 'ALL',
         'selected_business': 'ALL',
         'has_business_filter': False,
+        'show_similar_customers': False,
+        'show_trade_network': False,
     }.items():
         if key not in st.session_state:
             st.session_state[key] = val
 
-    with st.sidebar:
+    with st.sidebar, PERF.span('sidebar'):
         # ✅ 사이드바: 제목 + 홈 버튼을 한 줄에 배치
         col1, col2 = st.columns([2.8, 1])
         with col1:
@@ -291,6 +760,13 @@ def app():
                 reset_to_home()
                 st.rerun()
         
+        # 항로 선택 (선택한 항로 파티션만 읽어서 분석)
+        if len(routes) > 1:
+            selected = st.session_state.get('selected_routes')
+            if not selected or not set(selected) <= set(routes):
+                st.session_state.selected_routes = list(routes)
+            st.multiselect("**🛳️ 항로**(도착항)", routes, key='selected_routes')
+
         # 분석 타입 선택
         st.session_state.analysis_type = st.selectbox(
             "**❓ 분석 대상**(수출자/수입자)", 
@@ -299,12 +775,9 @@ def app():
         )
         
         # 대분류 선택 (분석 타입에 따라 동적 변경)
-        if st.session_state.analysis_type == '수출자':
-            available_categories = ['ALL'] + sorted(df['수출자 대분류'].dropna().unique().tolist())
-            category_label = "**🏢 수출자 대분류**"
-        else:
-            available_categories = ['ALL'] + sorted(df['수입자 대분류'].dropna().unique().tolist())
-            category_label = "**🏢 수입자 대분류**"
+        #  - 선택지는 데이터셋에 캐시된 tuple 을 그대로 사용 (매 rerun 정렬/unique X)
+        available_categories = dataset.category_options(st.session_state.analysis_type)
+        category_label = f"**🏢 {st.session_state.analysis_type} 대분류**"
         
         # 현재 선택된 대분류가 새로운 분석 타입에 없으면 ALL로 초기화
         if st.session_state.selected_category not in available_categories:
@@ -321,6 +794,24 @@ def app():
         container_index = container_values.index(st.session_state.min_containers) if st.session_state.min_containers in container_values else 0
         st.session_state.min_containers = st.selectbox("**📦 최소 컨테이너 수**", container_values, index=container_index)
 
+        # 선적일 기간 설정 (개요/전체 분석/상세 분석 모두 적용)
+        #  - 데이터셋이 바뀌어 저장된 기간이 범위를 벗어나면 전체 기간으로 초기화
+        #  - 선택한 항로에 선적일이 하나도 없으면 기간을 만들 수 없으므로 안내만 하고 종료 (항로 선택은 위에서 바꿀 수 있음)
+        if not dataset.timeline.n_days:
+            st.info("선택한 데이터에 선적 기록이 없습니다. 항로 선택을 바꿔 주세요.")
+            return
+        first_date, last_date = dataset.timeline.first_date, dataset.timeline.last_date
+        date_range = st.session_state.get('date_range')
+        if not date_range or any(d < first_date or d > last_date for d in date_range):
+            st.session_state.date_range = (first_date, last_date)
+        st.date_input(
+            "**📅 선적일 기간**",
+            key='date_range',
+            min_value=first_date,
+            max_value=last_date,
+        )
+        start_date, end_date = selected_date_range(dataset)
+
         if st.button("조건 검색", use_container_width=True):
             st.session_state.has_search_results = True
             st.session_state.has_analysis_results = False
@@ -334,32 +825,37 @@ def app():
         st.markdown("---")
         st.subheader(" **🔍 개별 상세 분석**")
         
-        # 선택된 대분류에 따라 회사 목록 필터링
-        if st.session_state.analysis_type == '수출자':
-            if st.session_state.selected_category == 'ALL':
-                filtered_companies = df['수출자'].dropna().astype(str).unique()
-            else:
-                filtered_companies = df[df['수출자 대분류'] == st.session_state.selected_category]['수출자'].dropna().astype(str).unique()
-            all_companies = sorted(filtered_companies.tolist())
-            company_label = "수출자"
-        else:
-            if st.session_state.selected_category == 'ALL':
-                filtered_companies = df['수입자'].dropna().astype(str).unique()
-            else:
-                filtered_companies = df[df['수입자 대분류'] == st.session_state.selected_category]['수입자'].dropna().astype(str).unique()
-            all_companies = sorted(filtered_companies.tolist())
-            company_label = "수입자"
-        
-        company_options = [f"{company_label} 입력하세요"] + all_companies
+        # 회사명 검색 (접두어/n-gram/오타 허용 인덱스)
+        #  - 전체 회사 목록 대신 검색어에 맞는 상위 회사만 선택지로 전송
+        #  - 검색어가 없으면 선택된 대분류의 컨테이너 물량 상위 회사
+        company_label = st.session_state.analysis_type
+        company_query = st.text_input(
+            f"🧑 **{company_label} 검색**",
+            key="company_query",
+            placeholder="회사명 또는 사업내용 (예: lg chem, 물류)",
+        )
+        matched_companies = search_companies(
+            dataset, company_label, company_query, st.session_state.selected_category, k=COMPANY_SEARCH_LIMIT
+        )
+
+        company_options = (f"{company_label} 입력하세요",) + matched_companies
+        # 이미 선택한 회사는 검색 결과에 없어도 선택지에 유지
+        if (
+            st.session_state.get("selected_company")
+            and st.session_state.selected_company not in company_options
+            and len(dataset.company_index(company_label).positions(st.session_state.selected_company)) > 0
+        ):
+            company_options = company_options[:1] + (st.session_state.selected_company,) + company_options[1:]
         default_company = st.session_state.selected_company if st.session_state.get("selected_company") else company_options[0]
         
         selected_company = st.selectbox(
-            f"🧑 **{company_label} 검색**", 
+            "검색 결과",
             company_options, 
-            index=company_options.index(default_company) if default_company in company_options else 0
+            index=company_options.index(default_company) if default_company in company_options else 0,
+            label_visibility="collapsed",
         )
 
-        if selected_company != f"{company_label} 선택":
+        if selected_company != company_options[0]:
             st.session_state.selected_company = selected_company
         else:
             st.session_state.selected_company = None
@@ -368,18 +864,19 @@ def app():
             if st.session_state.selected_company:
                 st.session_state.has_analysis_results = True
                 st.session_state.has_search_results = False
+                st.session_state.show_similar_customers = False
+                st.session_state.show_trade_network = False
                 
                 # 개별 분석 데이터 준비
-                if st.session_state.analysis_type == '수출자':
-                    filtered = df[df['수출자'] == st.session_state.selected_company]
-                else:
-                    filtered = df[df['수입자'] == st.session_state.selected_company]
+                #  - 세션에는 회사 키와 데이터셋 버전만 저장 (DataFrame 복사본 저장 X)
+                #  - 행 목록은 공유 데이터셋의 회사 인덱스에서 바로 슬라이스
+                company_positions = dataset.company_index(st.session_state.analysis_type).positions(st.session_state.selected_company)
                 
-                if not filtered.empty:
+                if len(company_positions) > 0:
                     st.session_state.analysis_data = {
-                        'filtered': filtered,
                         'company': st.session_state.selected_company,
-                        'type': st.session_state.analysis_type
+                        'type': st.session_state.analysis_type,
+                        'version': dataset.version,
                     }
                 else:
                     st.session_state.analysis_data = None
@@ -389,7 +886,11 @@ def app():
                 st.rerun()
             else:
                 st.warning(f"{company_label}를 선택해 주세요.")
-        
+
+        # 관리자 전용 성능 모니터
+        if st.session_state.get('user_id') in ADMIN_IDS:
+            show_perf_panel()
+
         st.markdown(
             "<div style='font-size:11px; text-align:center; color:gray;'>ⓒ 2025 KUMO Logistics</div>",
             unsafe_allow_html=True
@@ -417,40 +918,36 @@ def app():
                 <strong>📦 최소 컨테이너 수</strong><br>
                 <span style='font-size:16px;'>{st.session_state.min_containers:,}</span>
             </div>
+            <div>
+                <strong>📅 선적일 기간</strong><br>
+                <span style='font-size:16px;'>{format_date_range(dataset, start_date, end_date)}</span>
+            </div>
         </div>
         """, unsafe_allow_html=True)
 
         st.markdown("<hr style='margin-top: 10px; margin-bottom: 10px;'>", unsafe_allow_html=True)
         
-        with st.spinner("⌛ 데이터를 분석 중입니다..."):
-            result_df = filter_data(df, analysis_type, st.session_state.min_containers, st.session_state.selected_category)
+        with st.spinner("⌛ 데이터를 분석 중입니다..."), PERF.span('search_results'):
+            result_df = filter_data(dataset, analysis_type, st.session_state.min_containers, st.session_state.selected_category, start_date, end_date)
             
             if not result_df.empty:
                 total_companies = len(result_df)
                 total_containers = result_df['컨테이너수'].sum()
                 
                 st.write(f"✅ **{analysis_type} 리스트**")
+                # 표시용 컬럼 이름 (원본 결과는 그대로 두고 column_config 로만 변경)
+                column_labels = {f'{analysis_type} 대분류': '대분류', f'{analysis_type} 사업내용': '사업내용'}
                 with st.expander(f"🔍 총 **{total_companies}**개 {analysis_type} 확인 (총 컨테이너: {total_containers:,}대)", expanded=True):
-                    # 컬럼 이름을 더 보기 좋게 변경
-                    display_df = result_df.copy()
-                    if analysis_type == '수출자':
-                        display_df.columns = ['순위', '수출자', '대분류', '사업내용', '컨테이너수']
-                    else:
-                        display_df.columns = ['순위', '수입자', '대분류', '사업내용', '컨테이너수']
-                    
-                    st.dataframe(display_df, use_container_width=True)
+                    show_paged_table(result_df, 'companies', 'companies_table', analysis_type, column_labels)
                 
                 # 사업내용별 추가 필터링 기능
                 st.markdown("---")
                 st.markdown("🔍 **사업내용별 추가 검색**")
                 
                 # 결과 데이터에서 사업내용 목록 추출
-                if analysis_type == '수출자':
-                    available_businesses = ['ALL'] + sorted(result_df['수출자 사업내용'].dropna().unique().tolist())
-                    business_column = '수출자 사업내용'
-                else:
-                    available_businesses = ['ALL'] + sorted(result_df['수입자 사업내용'].dropna().unique().tolist())
-                    business_column = '수입자 사업내용'
+                available_businesses = business_options(
+                    dataset, analysis_type, st.session_state.min_containers, st.session_state.selected_category, start_date, end_date
+                )
                 
                 col1, col2 = st.columns([3, 1])
                 
@@ -471,7 +968,10 @@ def app():
                 
                 # 사업내용 필터링 결과 표시
                 if st.session_state.get('has_business_filter', False) and st.session_state.get('selected_business', 'ALL') != 'ALL':
-                    filtered_business_df = result_df[result_df[business_column] == st.session_state.selected_business]
+                    filtered_business_df = filter_business(
+                        dataset, analysis_type, st.session_state.min_containers,
+                        st.session_state.selected_category, st.session_state.selected_business, start_date, end_date,
+                    )
                     
                     if not filtered_business_df.empty:
                         total_filtered = len(filtered_business_df)
@@ -479,155 +979,35 @@ def app():
                         
                         st.markdown(f"**📊 '{st.session_state.selected_business}' 사업내용 결과**")
                         with st.expander(f"🔍 총 **{total_filtered}**개 {analysis_type} 확인 (총 컨테이너: {total_filtered_containers:,}대)", expanded=True):
-                            # 컬럼 이름을 더 보기 좋게 변경
-                            display_filtered_df = filtered_business_df.copy()
-                            if analysis_type == '수출자':
-                                display_filtered_df.columns = ['순위', '수출자', '대분류', '사업내용', '컨테이너수']
-                            else:
-                                display_filtered_df.columns = ['순위', '수입자', '대분류', '사업내용', '컨테이너수']
-                            
-                            st.dataframe(display_filtered_df, use_container_width=True)
+                            show_paged_table(filtered_business_df, 'business', 'business_table', analysis_type, column_labels)
                     else:
                         st.warning("선택한 사업내용에 해당하는 데이터가 없습니다.")
 
+                st.markdown("---")
+                show_dependency_leaderboard(dataset, analysis_type)
+
             else:
                 st.warning("조건에 맞는 데이터가 없습니다.")
+    # 데이터셋이 갱신되어 선택했던 회사가 없어졌으면 상세 분석 초기화
+    if st.session_state.has_analysis_results and st.session_state.analysis_data:
+        analysis_data = st.session_state.analysis_data
+        if analysis_data['version'] != dataset.version and len(dataset.company_index(analysis_data['type']).positions(analysis_data['company'])) == 0:
+            st.session_state.has_analysis_results = False
+            st.session_state.analysis_data = None
+            st.warning(f"{analysis_data['company']} 데이터가 더 이상 없습니다.")
+
     # 개별 분석 결과 표시 (세션 상태 기반)
     if st.session_state.has_analysis_results and st.session_state.analysis_data:
-        filtered = st.session_state.analysis_data['filtered']
         selected_company = st.session_state.analysis_data['company']
         analysis_type = st.session_state.analysis_data['type']
 
-        st.subheader(f"📈 {selected_company} 상세 분석 결과")
-        st.markdown("<hr style='margin-top: 5px; margin-bottom: 10px;'>", unsafe_allow_html=True)
-        st.markdown("✅ **요약 정보**")
-
-        total_records = len(filtered)
-        total_containers = filtered['컨테이너수'].sum()
-        total_container_lines = filtered['컨테이너선사'].nunique()
-        
-        # 상대방 수 계산
-        if analysis_type == '수출자':
-            partner_count = filtered['수입자'].nunique()
-            partner_label = "거래 수입자"
-        else:
-            partner_count = filtered['수출자'].nunique()
-            partner_label = "거래 수출자"
-
-        col1, col2, col3, col4 = st.columns(4)
-        
-        col1.markdown(f"""
-        <div style='text-align: center;'>
-            📄 <b>선적 건</b><br>
-            <span style='font-size: 20px;'>{total_records:,}</span>
-        </div>
-        """, unsafe_allow_html=True)
-
-        col2.markdown(f"""
-        <div style='text-align: center;'>
-            📦 <b>컨테이너</b><br>
-            <span style='font-size: 20px;'>{total_containers:,}</span>
-        </div>
-        """, unsafe_allow_html=True)
-
-        col3.markdown(f"""
-        <div style='text-align: center;'>
-            👥 <b>{partner_label}</b><br>
-            <span style='font-size: 20px;'>{partner_count}</span>
-        </div>
-        """, unsafe_allow_html=True)
-
-        col4.markdown(f"""
-        <div style='text-align: center;'>
-            🚢 <b>부킹 선사</b><br>
-            <span style='font-size: 20px;'>{total_container_lines}</span>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("")
-        
-        # 회사 정보 표시
-        if analysis_type == '수출자':
-            company_info = filtered[['수출자', '수출자 대분류', '수출자 사업내용']].drop_duplicates().iloc[0]
-            st.markdown("✅ **회사 정보**")
-            st.markdown(f"**회사명:** {company_info['수출자']}")
-            st.markdown(f"**대분류:** {company_info['수출자 대분류']}")
-            st.markdown(f"**사업내용:** {company_info['수출자 사업내용']}")
-        else:
-            company_info = filtered[['수입자', '수입자 대분류', '수입자 사업내용']].drop_duplicates().iloc[0]
-            st.markdown("✅ **회사 정보**")
-            st.markdown(f"**회사명:** {company_info['수입자']}")
-            st.markdown(f"**대분류:** {company_info['수입자 대분류']}")
-            st.markdown(f"**사업내용:** {company_info['수입자 사업내용']}")
-
-        st.markdown("✅ **상세 정보**")
-
-        with st.expander("🔍 **상세 정보 확인**", expanded=False):
-            # 상대방 분석 (수출자 분석 시 → 수입자 정보, 수입자 분석 시 → 수출자 정보)
-            if analysis_type == '수출자':
-                # 수출자 분석 시 수입자 정보 표시
-                partner_summary = filtered.groupby(['수입자', '수입자 대분류', '수입자 사업내용']).agg({'컨테이너수': 'sum'}).reset_index()
-                partner_summary = partner_summary.sort_values(by='컨테이너수', ascending=False).reset_index(drop=True)
-                partner_summary['순위'] = range(1, len(partner_summary) + 1)
-                partner_summary = partner_summary[['순위', '수입자', '수입자 대분류', '수입자 사업내용', '컨테이너수']]
-                
-                # 비중(%) 계산
-                total_containers_partner = partner_summary['컨테이너수'].sum()
-                partner_summary['비중(%)'] = (partner_summary['컨테이너수'] / total_containers_partner * 100).round(1)
-                
-                st.markdown("👳 **거래 수입자 분석**")
-                st.dataframe(partner_summary, use_container_width=True)
-                
-                st.markdown("---")
-                
-                # 거래 수입자 분석2 (수출자 분석 시에만 표시)
-                partner_summary2 = filtered.groupby(['수입자', '선적항', '도착항']).agg({'컨테이너수': 'sum'}).reset_index()
-                partner_summary2 = partner_summary2.sort_values(by='컨테이너수', ascending=False).reset_index(drop=True)
-                partner_summary2['순위'] = range(1, len(partner_summary2) + 1)
-                partner_summary2 = partner_summary2[['순위', '수입자', '선적항', '도착항', '컨테이너수']]
-                
-                st.markdown("👳 **거래 수입자 분석2**")
-                st.dataframe(partner_summary2, use_container_width=True)
-            else:
-                # 수입자 분석 시 수출자 정보 표시
-                partner_summary = filtered.groupby(['수출자', '수출자 대분류', '수출자 사업내용']).agg({'컨테이너수': 'sum'}).reset_index()
-                partner_summary = partner_summary.sort_values(by='컨테이너수', ascending=False).reset_index(drop=True)
-                partner_summary['순위'] = range(1, len(partner_summary) + 1)
-                partner_summary = partner_summary[['순위', '수출자', '수출자 대분류', '수출자 사업내용', '컨테이너수']]
-                
-                # 비중(%) 계산
-                total_containers_partner = partner_summary['컨테이너수'].sum()
-                partner_summary['비중(%)'] = (partner_summary['컨테이너수'] / total_containers_partner * 100).round(1)
-                
-                st.markdown("🧑 **거래 수출자 분석**")
-                st.dataframe(partner_summary, use_container_width=True)
-                
-                st.markdown("---")
-                
-                # 거래 수출자 분석2 (수입자 분석 시에만 표시)
-                partner_summary2 = filtered.groupby(['수출자', '선적항', '도착항']).agg({'컨테이너수': 'sum'}).reset_index()
-                partner_summary2 = partner_summary2.sort_values(by='컨테이너수', ascending=False).reset_index(drop=True)
-                partner_summary2['순위'] = range(1, len(partner_summary2) + 1)
-                partner_summary2 = partner_summary2[['순위', '수출자', '선적항', '도착항', '컨테이너수']]
-                
-                st.markdown("🧑 **거래 수출자 분석2**")
-                st.dataframe(partner_summary2, use_container_width=True)
-            
-            st.markdown("---")
-            
-            # 컨테이너선사별 분석
-            container_line_summary = filtered.groupby('컨테이너선사').agg({'컨테이너수': 'sum'}).reset_index()
-            container_line_summary = container_line_summary.sort_values(by='컨테이너수', ascending=False).reset_index(drop=True)
-            
-            # 비중(%) 계산
-            total_containers_for_pct = container_line_summary['컨테이너수'].sum()
-            container_line_summary['비중(%)'] = (container_line_summary['컨테이너수'] / total_containers_for_pct * 100).round(1)
-            
-            st.markdown("🚢 **컨테이너선사별 분석**")
-            st.dataframe(container_line_summary, use_container_width=True)
+        show_company_detail(dataset, analysis_type, selected_company, start_date, end_date)
 
     if not st.session_state.has_search_results and not st.session_state.has_analysis_results:
-        show_data_overview(df)
+        show_data_overview(dataset, start_date, end_date)
+
+    if PERF_DUMP_PATH:
+        PERF.maybe_dump(PERF_DUMP_PATH, PERF_DUMP_INTERVAL, {'query_cache': QUERY_CACHE.stats()})
 
 if __name__ == "__main__":
 
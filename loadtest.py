@@ -0,0 +1,359 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from perf import PERF, PerfRecorder
+
+
+# =======================================
+# 동시 세션 부하 테스트 (대시보드 1개 워커 프로세스 기준)
+#  예) python loadtest.py run                                  # 세션 1 / 4 / 8 / 16개
+#      python loadtest.py run --sessions 8 32 --iterations 5 -o load.json
+#  - 세션 1개 = Streamlit AppTest 1개 (자기 session_state 유지), 세션마다 스레드 1개로 동시에 실행
+#    → 실제 서버처럼 한 프로세스 안에서 데이터셋/쿼리 캐시/PERF 를 모든 세션이 공유
+#  - 흐름: 로그인(허용 ID) → [분석 대상/대분류/최소 컨테이너 변경 → 조건 검색 → 회사 선택 → 상세 분석 → 🏠] × 반복
+#  - 위젯 조작 1번 = rerun 1번, AppTest.run() 시간을 단계별 p50/p95/p99 로 집계 (클라이언트 관점)
+#    서버 관점 시간은 앱이 기록하는 PERF 'app' 단계 (같은 프로세스라 그대로 읽음)
+#  - 세션 수마다 별도 프로세스 → 세션당 메모리 = (모든 세션 종료 후 RSS - 워밍업 후 RSS) / 세션 수
+#    (세션이 끝나도 AppTest 객체를 유지해서 session_state/위젯 상태가 살아있는 상태로 측정)
+#  - 런타임 공유는 Streamlit 내부 구현(Runtime/ScriptCache/BidiComponentManager)을 바꿔 끼우므로
+#    확인한 버전 범위(SUPPORTED_STREAMLIT)에서만 실행, 범위 밖이면 바로 종료
+# =======================================
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, 'jakarta.py')
+DEFAULT_SESSIONS = (1, 4, 8, 16)
+DEFAULT_ITERATIONS = 3
+DEFAULT_OUTPUT = 'loadtest_results.json'
+RUN_TIMEOUT = 300
+# 사이드바 선택지 (jakarta.py 와 동일)
+ANALYSIS_TYPES = ['수출자', '수입자']
+CONTAINER_VALUES = [0, 10, 50, 100, 500, 1000]
+# 상세 분석 회사는 검색 결과 상위 N 개 중에서 고름
+COMPANY_PICKS = 10
+# 런타임 공유를 확인한 Streamlit 버전 [이상, 미만) → 새 버전에서 확인한 뒤 올림
+SUPPORTED_STREAMLIT = ((1, 65), (1, 66))
+
+
+def _rss_mb():
+    # 현재 RSS (리눅스 /proc), 없으면 최대 RSS 로 대신
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _labelled(widgets, text):
+    for widget in widgets:
+        if text in widget.label:
+            return widget
+    raise LookupError(f"위젯 없음: {text}")
+
+
+def _allowed_ids():
+    # 앱의 허용 ID 목록을 그대로 사용 (앱 모듈을 import 하면 Streamlit 스크립트가 실행되므로 소스에서 읽음)
+    import ast
+
+    with open(APP_PATH, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'ALLOWED_IDS' for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise LookupError("ALLOWED_IDS 없음")
+
+
+ANALYSIS_USERS = _allowed_ids()
+
+
+# =======================================
+# 세션 1개 (사용자 1명)
+# =======================================
+class Session:
+    def __init__(self, number, seed, recorder, think_ms=0):
+        from streamlit.testing.v1 import AppTest
+
+        self.number = number
+        self.rng = np.random.default_rng([seed, number + 1])
+        self.recorder = recorder
+        self.think_ms = think_ms
+        self.app = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT)
+        self.analysis_type = ANALYSIS_TYPES[0]
+        self.reruns = 0
+        self.errors = []
+
+    def _run(self, step):
+        # 위젯 조작 후 rerun 1번 (st.rerun 으로 이어지는 재실행 포함) 시간 기록
+        start = time.perf_counter()
+        self.app.run()
+        self.recorder.record('rerun', (time.perf_counter() - start) * 1000, step)
+        self.reruns += 1
+        if self.app.exception:
+            self.errors.append({'step': step, 'message': self.app.exception[0].message})
+        if self.think_ms:
+            time.sleep(self.rng.uniform(0.5, 1.5) * self.think_ms / 1000)
+
+    def login(self):
+        self._run('open')
+        user_id = ANALYSIS_USERS[self.number % len(ANALYSIS_USERS)]
+        self.app.text_input(key='login_user_id').input(user_id)
+        _labelled(self.app.button, 'Enter').click()
+        self._run('login')
+
+    def search(self):
+        sidebar = self.app.sidebar
+        self.analysis_type = ANALYSIS_TYPES[self.rng.integers(len(ANALYSIS_TYPES))]
+        _labelled(sidebar.selectbox, '분석 대상').set_value(self.analysis_type)
+        self._run('analysis_type')
+
+        category = _labelled(self.app.sidebar.selectbox, '대분류')
+        category.select_index(int(self.rng.integers(len(category.options))))
+        _labelled(self.app.sidebar.selectbox, '최소 컨테이너 수').set_value(
+            CONTAINER_VALUES[self.rng.integers(len(CONTAINER_VALUES))])
+        self._run('filters')
+
+        _labelled(self.app.sidebar.button, '조건 검색').click()
+        self._run('search')
+
+    def detail(self):
+        companies = _labelled(self.app.sidebar.selectbox, '검색 결과')
+        if len(companies.options) < 2:
+            return
+        companies.select_index(int(self.rng.integers(1, min(len(companies.options), COMPANY_PICKS + 1))))
+        self._run('select_company')
+        _labelled(self.app.sidebar.button, f'{self.analysis_type} 분석').click()
+        self._run('detail')
+
+    def home(self):
+        _labelled(self.app.sidebar.button, '🏠').click()
+        self._run('home')
+
+    def flow(self, iterations, start_barrier=None):
+        try:
+            self.login()
+        except BaseException:
+            # 로그인 실패 시 출발 대기 중인 다른 세션/측정 스레드가 멈춰 있지 않도록 해제
+            if start_barrier is not None:
+                start_barrier.abort()
+            raise
+        if start_barrier is not None:
+            start_barrier.wait()
+        for _ in range(iterations):
+            self.search()
+            self.detail()
+            self.home()
+        return self
+
+
+# =======================================
+# 세션 N 개 동시 실행
+# =======================================
+def _step_stats(recorder):
+    stats = recorder.stats().get('rerun', {})
+    return {step: {k: v for k, v in summary.items() if k not in ('window', 'last_ms')} for step, summary in stats.items()}
+
+
+def check_streamlit_version():
+    import streamlit
+
+    version = tuple(int(part) for part in streamlit.__version__.split('.')[:2] if part.isdigit())
+    low, high = SUPPORTED_STREAMLIT
+    if not low <= version < high:
+        raise RuntimeError(
+            f"부하 테스트는 streamlit >={'.'.join(map(str, low))},<{'.'.join(map(str, high))} 에서만 실행됩니다 "
+            f"(설치됨: {streamlit.__version__}, 런타임 공유가 Streamlit 내부 구현에 의존)"
+        )
+
+
+def _share_runtime():
+    # AppTest 는 run() 마다 가짜 런타임/ScriptCache 를 새로 만들고 끝나면 지움 (한 번에 세션 1개 가정)
+    #  → 실제 서버처럼 프로세스에 런타임 1개를 두고 모든 세션이 공유
+    #  - global.appTest: run() 이 끝나면 이전 값으로 되돌리므로 프로세스 전체에서 켜 둠
+    #  - 런타임: 다른 세션의 run() 이 끝나도 지워지지 않음, cache_data 저장소도 세션 간 공유 (서버와 동일)
+    #  - ScriptCache: 스크립트 컴파일 1번 (3.11 은 동시 ast.parse 에서 깨짐)
+    from unittest.mock import MagicMock
+
+    check_streamlit_version()
+    from streamlit import config
+    from streamlit.components.v2.component_manager import BidiComponentManager
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    config.set_option('global.appTest', True)
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage('/mock/media'))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.bidi_component_registry = BidiComponentManager()
+    runtime.bidi_component_registry.discover_and_register_components(start_file_watching=False)
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+
+    shared = ScriptCache()
+    get_bytecode = ScriptCache.get_bytecode
+    ScriptCache.get_bytecode = lambda self, script_path: get_bytecode(shared, script_path)
+
+
+def run_sessions(n_sessions, iterations=DEFAULT_ITERATIONS, seed=0, think_ms=0):
+    _share_runtime()
+
+    # 워밍업: 세션 1개로 흐름 1회 (데이터셋 적재/인덱스 생성은 측정 제외)
+    warmup_recorder = PerfRecorder(window_size=None)
+    start = time.perf_counter()
+    Session(-1, seed, warmup_recorder).flow(1)
+    warmup_ms = (time.perf_counter() - start) * 1000
+    rss_before = _rss_mb()
+
+    recorder = PerfRecorder(window_size=None)
+    sessions = [Session(i, seed, recorder, think_ms) for i in range(n_sessions)]
+    # 로그인까지 마친 뒤 동시에 출발 (로그인 rerun 은 기록하되 처리량 구간에서는 제외)
+    barrier = threading.Barrier(n_sessions + 1)
+    with ThreadPoolExecutor(max_workers=n_sessions) as pool:
+        futures = [pool.submit(session.flow, iterations, barrier) for session in sessions]
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            # 로그인에 실패한 세션의 예외를 그대로 전달 (나머지 세션은 대기 해제로 끝남)
+            wait(futures)
+            raise next(
+                future.exception() for future in futures
+                if not isinstance(future.exception(), threading.BrokenBarrierError)
+            )
+        PERF.reset()
+        start = time.perf_counter()
+        reruns_before = sum(session.reruns for session in sessions)
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+    rss_after = _rss_mb()
+
+    reruns = sum(session.reruns for session in sessions) - reruns_before
+    errors = [dict(session=session.number, **error) for session in sessions for error in session.errors]
+    server = PERF.stats().get('app', {}).get('*')
+    return {
+        'sessions': n_sessions,
+        'iterations': iterations,
+        'think_ms': think_ms,
+        'warmup_ms': round(warmup_ms, 1),
+        'elapsed_s': round(elapsed, 3),
+        'throughput': {
+            'reruns_per_s': round(reruns / elapsed, 2),
+            'flows_per_min': round(n_sessions * iterations / elapsed * 60, 2),
+        },
+        'latency_ms': _step_stats(recorder),
+        'server_app_ms': {k: v for k, v in server.items() if k not in ('window', 'last_ms')} if server else None,
+        'memory_mb': {
+            'rss_after_warmup': rss_before,
+            'rss_after_sessions': rss_after,
+            'per_session': round((rss_after - rss_before) / n_sessions, 2),
+        },
+        'errors': errors,
+    }
+
+
+def run(session_counts=DEFAULT_SESSIONS, iterations=DEFAULT_ITERATIONS, seed=0, think_ms=0):
+    results = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'data_source': os.environ.get('KUMO_DATA_DIR') or 'jakarta.xlsx',
+            'seed': seed,
+        },
+        'runs': {},
+    }
+    for n_sessions in session_counts:
+        print(f"{n_sessions} sessions ...", file=sys.stderr)
+        # 세션 수마다 새 프로세스 (메모리/캐시가 이전 실행의 영향을 받지 않음), 앱 기준 상대 경로를 위해 cwd 고정
+        output = subprocess.run(
+            [
+                sys.executable, os.path.abspath(__file__), 'sessions', str(n_sessions),
+                '--iterations', str(iterations), '--seed', str(seed), '--think-ms', str(think_ms),
+            ],
+            check=True, stdout=subprocess.PIPE, text=True, cwd=APP_DIR,
+        ).stdout
+        results['runs'][str(n_sessions)] = json.loads(output)
+    return results
+
+
+def summary_table(results):
+    # 세션 수별 한 줄: 전체 rerun 지연 / 처리량 / 세션당 메모리 / 오류
+    rows = []
+    for n_sessions, result in results['runs'].items():
+        latency = result['latency_ms'].get('*', {})
+        rows.append({
+            'sessions': int(n_sessions),
+            'reruns': latency.get('count', 0),
+            'p50_ms': latency.get('p50_ms'),
+            'p95_ms': latency.get('p95_ms'),
+            'p99_ms': latency.get('p99_ms'),
+            'max_ms': latency.get('max_ms'),
+            'reruns_per_s': result['throughput']['reruns_per_s'],
+            'flows_per_min': result['throughput']['flows_per_min'],
+            'mb_per_session': result['memory_mb']['per_session'],
+            'errors': len(result['errors']),
+        })
+    return pd.DataFrame(rows)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="KUMO 대시보드 동시 세션 부하 테스트")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="세션 수별 부하 테스트 실행")
+    run_parser.add_argument('--sessions', type=int, nargs='+', default=list(DEFAULT_SESSIONS))
+    run_parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS, help="세션당 검색→상세→홈 반복 횟수")
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--think-ms', type=int, default=0, help="조작 사이 평균 대기 시간 (0 = 쉬지 않고 조작)")
+    run_parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT)
+
+    # 내부용: 세션 수 하나를 현재 프로세스에서 실행하고 JSON 출력
+    sessions_parser = subparsers.add_parser('sessions')
+    sessions_parser.add_argument('count', type=int)
+    sessions_parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    sessions_parser.add_argument('--seed', type=int, default=0)
+    sessions_parser.add_argument('--think-ms', type=int, default=0)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        check_streamlit_version()
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    if args.command == 'sessions':
+        print(json.dumps(run_sessions(args.count, args.iterations, args.seed, args.think_ms), ensure_ascii=False))
+        return 0
+
+    results = run(args.sessions, args.iterations, args.seed, args.think_ms)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(summary_table(results).to_string(index=False))
+    print(f"결과: {args.output}", file=sys.stderr)
+    errors = sum(len(result['errors']) for result in results['runs'].values())
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
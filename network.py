@@ -0,0 +1,310 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse import csgraph
+
+
+# =======================================
+# 수출자-수입자 거래 네트워크 (희소 행렬)
+#  - 수출자 × 수입자 컨테이너수 행렬 1개 + 회사 × 컨테이너선사 / 회사 × 구간(선적항→도착항) 보조 행렬
+#  - 데이터셋 버전별로 한 번만 생성 (전체 기간 기준), 이후 조회는 행 슬라이스와 희소 행렬 곱
+#  - 공통 거래처: 두 회사 행의 원소곱
+#  - 동종 회사: 거래처 비중 벡터(L2 정규화) 코사인 = 행렬 × 내 행
+#  - 2차 잠재 거래처: 동종 회사 유사도 × 그 회사들의 거래처 비중 (이미 거래 중인 곳 제외)
+#  - 집중도: 행 비중 제곱합(HHI), 최대 비중, 거래처 수 (모든 회사 한 번에)
+#  - 의존도 리더보드: 거래처/선사/구간 집중도 + 최대 상대를 모든 회사에 대해 한 표로 (회사 유형별 1회 계산)
+#  - 클러스터: 양쪽 모두에서 물량 비중 CLUSTER_MIN_SHARE 이상인 '강한 거래' 간선만 남긴 연결 요소
+#    (단순 물량 기준으로 자르면 대형 포워더를 통해 대부분의 회사가 하나로 묶임)
+# =======================================
+PARTY_TYPES = ('수출자', '수입자')
+DIMENSIONS = ('partner', 'carrier', 'lane')
+DIMENSION_LABELS = {'partner': '거래처', 'carrier': '선사', 'lane': '구간'}
+CLUSTER_MIN_SHARE = 0.1
+
+
+def _partner_type(analysis_type):
+    return '수입자' if analysis_type == '수출자' else '수출자'
+
+
+def _compact(codes):
+    # 풀 코드 → 0..n-1 행 번호 (결측 -1 은 -1 유지)
+    values, keys = np.unique(codes, return_inverse=True)
+    keys = keys.reshape(-1)
+    if len(values) and values[0] < 0:
+        values = values[1:]
+        keys = keys - 1
+    return values, keys
+
+
+def _matrix(row_keys, column_keys, weights, shape):
+    valid = (row_keys >= 0) & (column_keys >= 0)
+    matrix = sparse.csr_matrix((weights[valid].astype(np.float64), (row_keys[valid], column_keys[valid])), shape=shape)
+    matrix.sum_duplicates()
+    return matrix
+
+
+def _row_scale(matrix, scale):
+    return sparse.diags(scale) @ matrix
+
+
+def _safe_inverse(values):
+    values = np.asarray(values, dtype=np.float64).reshape(-1)
+    return np.divide(1.0, values, out=np.zeros_like(values), where=values > 0)
+
+
+def _concentration(matrix):
+    # 행별 HHI(비중 제곱합), 최대 비중, 0 이 아닌 열 수
+    totals = np.asarray(matrix.sum(axis=1)).reshape(-1)
+    shares = _row_scale(matrix, _safe_inverse(totals)).tocsr()
+    hhi = np.asarray(shares.multiply(shares).sum(axis=1)).reshape(-1)
+    top = shares.max(axis=1).toarray().reshape(-1)
+    return totals, np.diff(shares.indptr), top, hhi
+
+
+class TradeNetwork:
+    def __init__(self, dataset):
+        containers = dataset.df['컨테이너수'].to_numpy()
+        self._pool = dataset.pool
+        self.companies = {}
+        self.categories = {}
+        keys = {}
+        for analysis_type in PARTY_TYPES:
+            self.companies[analysis_type], keys[analysis_type] = _compact(dataset.codes(analysis_type))
+            # 회사별 대분류: 처음 등장한 값 (역순으로 덮어써서 첫 행이 남게)
+            categories = np.full(len(self.companies[analysis_type]), -1, dtype=np.int64)
+            valid = keys[analysis_type] >= 0
+            categories[keys[analysis_type][valid][::-1]] = dataset.codes(f'{analysis_type} 대분류')[valid][::-1]
+            self.categories[analysis_type] = categories
+
+        n_exporters, n_importers = len(self.companies['수출자']), len(self.companies['수입자'])
+        trade = _matrix(keys['수출자'], keys['수입자'], containers, (n_exporters, n_importers))
+        self._matrices = {('수출자', 'partner'): trade, ('수입자', 'partner'): trade.T.tocsr()}
+
+        self.carriers, carrier_keys = _compact(dataset.codes('컨테이너선사'))
+        lane_codes = dataset.codes('선적항').astype(np.int64) * len(self._pool) + dataset.codes('도착항')
+        lane_codes[(dataset.codes('선적항') < 0) | (dataset.codes('도착항') < 0)] = -1
+        self.lanes, lane_keys = _compact(lane_codes)
+        for analysis_type in PARTY_TYPES:
+            n_rows = len(self.companies[analysis_type])
+            self._matrices[(analysis_type, 'carrier')] = _matrix(
+                keys[analysis_type], carrier_keys, containers, (n_rows, len(self.carriers)))
+            self._matrices[(analysis_type, 'lane')] = _matrix(
+                keys[analysis_type], lane_keys, containers, (n_rows, len(self.lanes)))
+
+        # 동종 회사 유사도용 거래처 비중 (L2 정규화 → 내적 = 코사인)
+        self._shares = {}
+        self._unit = {}
+        for analysis_type in PARTY_TYPES:
+            matrix = self._matrices[(analysis_type, 'partner')]
+            self._shares[analysis_type] = _row_scale(matrix, _safe_inverse(matrix.sum(axis=1))).tocsr()
+            norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).reshape(-1))
+            self._unit[analysis_type] = _row_scale(matrix, _safe_inverse(norms)).tocsr()
+        self._cluster_labels = None
+        self._dependency = {}
+
+    def matrix(self, analysis_type, dimension='partner'):
+        return self._matrices[(analysis_type, dimension)]
+
+    def names(self, analysis_type, positions):
+        return self._pool[self.companies[analysis_type][positions]].to_numpy(dtype=object)
+
+    def column_names(self, analysis_type, dimension, positions):
+        if dimension == 'partner':
+            return self.names(_partner_type(analysis_type), positions)
+        if dimension == 'carrier':
+            return self._pool[self.carriers[positions]].to_numpy(dtype=object)
+        ports, destinations = np.divmod(self.lanes[positions], len(self._pool))
+        return np.array([f"{a} → {b}" for a, b in zip(self._pool[ports], self._pool[destinations])], dtype=object)
+
+    def category_names(self, analysis_type, positions):
+        codes = self.categories[analysis_type][positions]
+        names = self._pool[np.maximum(codes, 0)].to_numpy(dtype=object)
+        names[codes < 0] = None
+        return names
+
+    def position(self, analysis_type, company):
+        try:
+            code = self._pool.get_loc(company)
+        except KeyError:
+            return None
+        companies = self.companies[analysis_type]
+        position = np.searchsorted(companies, code)
+        if position < len(companies) and companies[position] == code:
+            return int(position)
+        return None
+
+    def volume(self, analysis_type):
+        return np.asarray(self.matrix(analysis_type).sum(axis=1)).reshape(-1)
+
+    def shared_partners(self, analysis_type, company, other):
+        # 두 회사 행의 원소곱이 0 이 아닌 열 = 공통 거래처
+        a, b = self.position(analysis_type, company), self.position(analysis_type, other)
+        if a is None or b is None:
+            return None
+        matrix = self.matrix(analysis_type)
+        row_a, row_b = matrix[a], matrix[b]
+        common = row_a.multiply(row_b).tocsr().indices
+        containers_a = row_a[:, common].toarray().reshape(-1).astype(np.int64)
+        containers_b = row_b[:, common].toarray().reshape(-1).astype(np.int64)
+        order = np.lexsort((-containers_b, -(containers_a + containers_b)))
+        partner_type = _partner_type(analysis_type)
+        return pd.DataFrame({
+            '순위': np.arange(1, len(common) + 1),
+            partner_type: self.names(partner_type, common[order]),
+            company: containers_a[order],
+            other: containers_b[order],
+        })
+
+    def _peer_similarity(self, analysis_type, position):
+        # 거래처 비중 코사인 = 단위 행렬 × 내 행 (희소 결과, 자기 자신 제외)
+        unit = self._unit[analysis_type]
+        column = (unit @ unit[position].T).tocoo()
+        keep = (column.row != position) & (column.data > 0)
+        return column.row[keep], column.data[keep]
+
+    def peers(self, analysis_type, company, k=10):
+        # 거래처가 겹치는 동종 회사 (같은 수출자/수입자 중)
+        position = self.position(analysis_type, company)
+        if position is None:
+            return None
+        candidates, scores = self._peer_similarity(analysis_type, position)
+        order = np.lexsort((candidates, -scores))[:k]
+        top = candidates[order]
+        binary = self.matrix(analysis_type).astype(bool).astype(np.int64)
+        common = (binary[top] @ binary[position].T).toarray().reshape(-1)
+        return pd.DataFrame({
+            '순위': np.arange(1, len(top) + 1),
+            analysis_type: self.names(analysis_type, top),
+            '대분류': self.category_names(analysis_type, top),
+            '공통 거래처 수': common,
+            '컨테이너수': self.volume(analysis_type)[top].astype(np.int64),
+            '유사도(%)': (scores[order] * 100).round(1),
+        })
+
+    def prospects(self, analysis_type, company, k=10):
+        # 2차 잠재 거래처: 나와 비슷한 회사들이 거래하는데 나는 아직 거래하지 않는 상대방
+        #  점수 = Σ(동종 회사 유사도 × 그 회사의 거래처 비중)
+        position = self.position(analysis_type, company)
+        if position is None:
+            return None
+        peers, similarity = self._peer_similarity(analysis_type, position)
+        peer_shares = self._shares[analysis_type][peers]
+        scores = peer_shares.T @ similarity
+        links = np.asarray(peer_shares.astype(bool).sum(axis=0)).reshape(-1)
+        scores[self.matrix(analysis_type)[position].indices] = 0
+        candidates = np.flatnonzero(scores > 0)
+        top = candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+        partner_type = _partner_type(analysis_type)
+        best = scores[top[0]] if len(top) else 1.0
+        return pd.DataFrame({
+            '순위': np.arange(1, len(top) + 1),
+            partner_type: self.names(partner_type, top),
+            '대분류': self.category_names(partner_type, top),
+            f'연결 {analysis_type} 수': links[top],
+            '컨테이너수': self.volume(partner_type)[top].astype(np.int64),
+            '추천 점수': (scores[top] / best * 100).round(1),
+        })
+
+    def concentration(self, analysis_type, dimension='partner'):
+        # 모든 회사 집중도 한 번에: 회사 × (컨테이너수, 거래처 수, 최대 비중, HHI)
+        totals, counts, top, hhi = _concentration(self.matrix(analysis_type, dimension))
+        positions = np.arange(len(totals))
+        return pd.DataFrame({
+            analysis_type: self.names(analysis_type, positions),
+            '대분류': self.category_names(analysis_type, positions),
+            '컨테이너수': totals.astype(np.int64),
+            '수': counts,
+            '최대 비중(%)': (top * 100).round(1),
+            'HHI': (hhi * 10000).round().astype(np.int64),
+        })
+
+    def dependency(self, analysis_type):
+        # 모든 회사 × 차원별 (수, 최대 상대, 최대 비중, HHI) + 평균 HHI
+        #  - 차원별 희소 행렬 1번씩만 계산 → 회사 유형별로 보관
+        if analysis_type not in self._dependency:
+            positions = np.arange(len(self.companies[analysis_type]))
+            table = pd.DataFrame({
+                analysis_type: self.names(analysis_type, positions),
+                f'{analysis_type} 대분류': self.category_names(analysis_type, positions),
+            })
+            hhis = []
+            for dimension in DIMENSIONS:
+                matrix = self.matrix(analysis_type, dimension)
+                totals, counts, top, hhi = _concentration(matrix)
+                label = DIMENSION_LABELS[dimension]
+                if dimension == 'partner':
+                    table['컨테이너수'] = totals.astype(np.int64)
+                best = np.asarray(matrix.argmax(axis=1)).reshape(-1)
+                names = self.column_names(analysis_type, dimension, best)
+                names[counts == 0] = None
+                table[f'{label} 수'] = counts
+                table[f'최대 {label}'] = names
+                table[f'최대 {label} 비중(%)'] = (top * 100).round(1)
+                table[f'{label} HHI'] = (hhi * 10000).round().astype(np.int64)
+                # 전체 시장에 값이 하나뿐인 차원(예: 도착항 1곳)은 모두 10,000 이라 위험 신호가 아님
+                if matrix.shape[1] > 1:
+                    hhis.append(table[f'{label} HHI'].to_numpy())
+            # 종합 의존도: 차원별 HHI 평균 (한 차원만 100% 인 회사보다 여러 차원에서 쏠린 회사가 위로)
+            table['평균 HHI'] = np.mean(hhis, axis=0).round().astype(np.int64) if hhis else 0
+            table = table.sort_values(['평균 HHI', '컨테이너수'], ascending=False, kind='stable').reset_index(drop=True)
+            table.insert(0, '순위', np.arange(1, len(table) + 1))
+            self._dependency[analysis_type] = table
+        return self._dependency[analysis_type]
+
+    def company_concentration(self, analysis_type, company):
+        # {차원: {'count', 'top', 'top_share', 'hhi'}} (거래처 / 선사 / 구간)
+        position = self.position(analysis_type, company)
+        if position is None:
+            return None
+        result = {}
+        for dimension in DIMENSIONS:
+            row = self.matrix(analysis_type, dimension)[position]
+            total = row.sum()
+            if total <= 0:
+                result[dimension] = {'count': 0, 'top': None, 'top_share': 0.0, 'hhi': 0}
+                continue
+            shares = row.data / total
+            best = row.indices[np.argmax(shares)]
+            result[dimension] = {
+                'count': int(row.nnz),
+                'top': self.column_names(analysis_type, dimension, np.array([best]))[0],
+                'top_share': round(float(shares.max() * 100), 1),
+                'hhi': int(round(float((shares ** 2).sum() * 10000))),
+            }
+        return result
+
+    @property
+    def cluster_labels(self):
+        # 수출자 + 수입자 이분 그래프의 연결 요소 번호 (수출자 먼저, 수입자 뒤)
+        if self._cluster_labels is None:
+            trade = self.matrix('수출자').tocoo()
+            exporter_share = trade.data / self.volume('수출자')[trade.row]
+            importer_share = trade.data / self.volume('수입자')[trade.col]
+            strong = (exporter_share >= CLUSTER_MIN_SHARE) & (importer_share >= CLUSTER_MIN_SHARE)
+            n_exporters, n_importers = trade.shape
+            graph = sparse.coo_matrix(
+                (np.ones(strong.sum()), (trade.row[strong], trade.col[strong] + n_exporters)),
+                shape=(n_exporters + n_importers, n_exporters + n_importers),
+            )
+            _, self._cluster_labels = csgraph.connected_components(graph, directed=False)
+        return self._cluster_labels
+
+    def cluster(self, analysis_type, company):
+        # 같은 클러스터에 속한 수출자/수입자 목록 (컨테이너수 내림차순)
+        position = self.position(analysis_type, company)
+        if position is None:
+            return None
+        labels = self.cluster_labels
+        n_exporters = len(self.companies['수출자'])
+        label = labels[position if analysis_type == '수출자' else n_exporters + position]
+        members = np.flatnonzero(labels == label)
+        frames = []
+        for member_type, positions in (('수출자', members[members < n_exporters]), ('수입자', members[members >= n_exporters] - n_exporters)):
+            frames.append(pd.DataFrame({
+                '구분': member_type,
+                '회사명': self.names(member_type, positions),
+                '대분류': self.category_names(member_type, positions),
+                '컨테이너수': self.volume(member_type)[positions].astype(np.int64),
+            }))
+        members = pd.concat(frames, ignore_index=True).sort_values(['컨테이너수', '회사명'], ascending=[False, True], kind='stable')
+        return members.reset_index(drop=True)
@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+
+# =======================================
+# 결과 표 서버 측 페이징 / 정렬 / 필터 / 상위 N + 기타
+#  - 캐시된 결과 DataFrame 은 수정하지 않고 행 위치 배열만 정렬/필터
+#  - 브라우저로는 현재 페이지 행만 전송
+#  - 카테고리 컬럼은 공유 문자열 풀 전체가 사전으로 딸려가므로 페이지 행만 일반 문자열로 변환
+# =======================================
+OTHER_LABEL = '기타'
+
+
+def _contains(series, text):
+    # 카테고리 컬럼은 실제 등장한 값에 대해서만 문자열 검사 후 코드로 매핑
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        used = np.unique(codes[codes >= 0])
+        hit = series.cat.categories[used].str.contains(text, case=False, regex=False)
+        matched = np.zeros(len(series.cat.categories), dtype=bool)
+        matched[used[np.asarray(hit, dtype=bool)]] = True
+        return (codes >= 0) & matched[np.maximum(codes, 0)]
+    return series.astype(str).str.contains(text, case=False, regex=False).to_numpy()
+
+
+def _sort_keys(series):
+    # 공유 풀 categories 는 정렬되어 있으므로 코드 순서 = 문자열 순서
+    if isinstance(series.dtype, pd.CategoricalDtype) and series.cat.categories.is_monotonic_increasing:
+        codes = series.cat.codes.to_numpy()
+        return codes, codes < 0
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        values = series.to_numpy(dtype=float)
+        return values, np.isnan(values)
+    values = series.astype(str).to_numpy()
+    return values, series.isna().to_numpy()
+
+
+class TableView:
+    def __init__(self, df, sort_by=None, ascending=True, filter_column=None, filter_text='',
+                 top_n=None, label_column=None, value_column='컨테이너수'):
+        self.df = df
+        self.label_column = label_column
+        self.value_column = value_column
+        positions = np.arange(len(df))
+
+        if filter_column and filter_text:
+            positions = positions[_contains(df[filter_column], filter_text)]
+
+        if sort_by:
+            keys, missing = _sort_keys(df[sort_by].iloc[positions])
+            if not ascending:
+                # 같은 값끼리는 원래 순서를 유지 (안정 정렬로 역순 키 정렬)
+                keys = -keys if keys.dtype != object else -np.unique(keys, return_inverse=True)[1]
+            order = np.argsort(keys, kind='stable')
+            # 결측값은 정렬 방향과 관계없이 맨 뒤
+            order = np.concatenate([order[~missing[order]], order[missing[order]]])
+            positions = positions[order]
+
+        # 상위 N 개만 표시하고 나머지는 '기타' 한 줄로 합산 (합산할 컬럼이 없는 표는 개수만)
+        self.other = None
+        if top_n and len(positions) > top_n:
+            rest = positions[top_n:]
+            total = df[value_column].to_numpy()[rest].sum() if value_column in df.columns else None
+            self.other = (len(rest), total)
+            positions = positions[:top_n]
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions) + (1 if self.other else 0)
+
+    def n_pages(self, page_size):
+        return max(1, math.ceil(len(self) / page_size))
+
+    def page(self, page, page_size):
+        page = min(max(1, page), self.n_pages(page_size))
+        lo = (page - 1) * page_size
+        hi = lo + page_size
+        rows = self.df.iloc[self.positions[lo:hi]]
+        rows = rows.astype({
+            col: object for col in rows.columns if isinstance(rows[col].dtype, pd.CategoricalDtype)
+        }).reset_index(drop=True)
+
+        if self.other and hi > len(self.positions):
+            count, total = self.other
+            other = {col: [None] for col in rows.columns}
+            other[self.label_column] = [f"{OTHER_LABEL} ({count:,}개)"]
+            if total is not None:
+                other[self.value_column] = [total]
+            integer_columns = [col for col in rows.columns if pd.api.types.is_integer_dtype(self.df[col].dtype)]
+            rows = pd.concat([rows, pd.DataFrame(other)], ignore_index=True)
+            # 기타 행의 빈 순위 때문에 float 로 바뀌지 않도록 nullable 정수 유지
+            rows = rows.astype({col: 'Int64' for col in integer_columns})
+        return rows
@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+
+
+# =======================================
+# 단계별 실행 시간 계측
+#  - span(단계, 형태) 로 감싼 구간의 시간을 (단계, 형태) 별 최근 N개 창에 기록
+#  - 형태(shape): 같은 단계 안에서 성격이 다른 호출 구분 (예: 캐시 hit/miss, 전체/기간 조회)
+#  - p50/p95/p99 는 조회할 때 창에서 계산 (기록 비용은 deque append 1번)
+#  - 프로세스 공용 인스턴스(PERF)를 모든 세션이 공유
+# =======================================
+WINDOW_SIZE = 1000
+PERCENTILES = (50, 95, 99)
+ALL_SHAPES = '*'
+
+
+class Span:
+    def __init__(self, stage, shape=None):
+        self.stage = stage
+        self.shape = shape
+        self.elapsed_ms = None
+
+
+class PerfRecorder:
+    def __init__(self, window_size=WINDOW_SIZE, clock=time.perf_counter):
+        self.window_size = window_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._counts = {}
+        self._last_dump = 0.0
+        self.started_at = time.time()
+
+    def record(self, stage, elapsed_ms, shape=None):
+        key = (stage, shape or ALL_SHAPES)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = deque(maxlen=self.window_size)
+            window.append(elapsed_ms)
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    @contextmanager
+    def span(self, stage, shape=None):
+        # 예외(st.stop / st.rerun 포함)로 빠져나가도 기록
+        span = Span(stage, shape)
+        start = self._clock()
+        try:
+            yield span
+        finally:
+            span.elapsed_ms = (self._clock() - start) * 1000
+            self.record(span.stage, span.elapsed_ms, span.shape)
+
+    def timed(self, stage=None):
+        def decorator(func):
+            name = stage or func.__name__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def _summary(values, count):
+        values = np.fromiter(values, dtype=float, count=len(values))
+        p50, p95, p99 = np.percentile(values, PERCENTILES)
+        return {
+            'count': count,
+            'window': len(values),
+            'p50_ms': round(float(p50), 3),
+            'p95_ms': round(float(p95), 3),
+            'p99_ms': round(float(p99), 3),
+            'max_ms': round(float(values.max()), 3),
+            'last_ms': round(float(values[-1]), 3),
+        }
+
+    def stats(self):
+        # {단계: {'*': 전체 요약, 형태: 형태별 요약, ...}}
+        with self._lock:
+            windows = {key: list(window) for key, window in self._windows.items()}
+            counts = dict(self._counts)
+
+        result = {}
+        for stage in sorted({stage for stage, _ in windows}):
+            shapes = sorted(shape for s, shape in windows if s == stage)
+            merged = [v for shape in shapes for v in windows[(stage, shape)]]
+            stage_stats = {ALL_SHAPES: self._summary(merged, sum(counts[(stage, shape)] for shape in shapes))}
+            for shape in shapes:
+                if shape != ALL_SHAPES:
+                    stage_stats[shape] = self._summary(windows[(stage, shape)], counts[(stage, shape)])
+            result[stage] = stage_stats
+        return result
+
+    def rows(self):
+        # 표 표시용: 단계 × 형태 한 줄씩
+        return [
+            {'단계': stage, '형태': shape, **summary}
+            for stage, shapes in self.stats().items()
+            for shape, summary in shapes.items()
+        ]
+
+    def to_json(self, extra=None):
+        return json.dumps({
+            'generated_at': time.time(),
+            'started_at': self.started_at,
+            'window_size': self.window_size,
+            'stages': self.stats(),
+            **(extra or {}),
+        }, ensure_ascii=False, indent=2)
+
+    def dump(self, path, extra=None):
+        # 모니터링이 읽는 도중 잘린 파일을 보지 않도록 임시 파일에 쓰고 교체
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json(extra))
+        os.replace(tmp_path, path)
+
+    def maybe_dump(self, path, interval, extra=None):
+        # interval 초에 한 번만 파일로 내보냄 (매 rerun 마다 쓰지 않도록)
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_dump < interval:
+                return False
+            self._last_dump = now
+        self.dump(path, extra)
+        return True
+
+    def reset(self):
+        with self._lock:
+            self._windows.clear()
+            self._counts.clear()
+            self.started_at = time.time()
+
+
+PERF = PerfRecorder()
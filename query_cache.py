@@ -0,0 +1,125 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+# =======================================
+# 프로세스 공용 쿼리 결과 캐시
+#  - 정규화된 쿼리 키 (예: ('filter', 분석대상, 대분류, 최소컨테이너)) 기준
+#  - 크기(바이트) 기반 LRU 제거 + TTL 만료
+#  - 키는 (데이터셋 버전, 쿼리) → 항로 선택별 데이터셋이 동시에 쓰여도 서로 밀어내지 않음
+#  - 최근 사용한 버전 MAX_VERSIONS 개만 유지, 밀려난 버전의 결과는 한 번에 폐기
+#  - 캐시된 DataFrame 은 여러 세션이 공유하므로 호출 측에서 수정하지 않음
+# =======================================
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 60 * 60
+MAX_VERSIONS = 8
+
+
+def estimate_size(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class QueryCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL_SECONDS, clock=time.monotonic, max_versions=MAX_VERSIONS):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_versions = max_versions
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._versions = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _use_version(self, version):
+        # 최근 사용 버전 갱신, 오래된 버전이 밀려나면 그 버전 결과 전부 무효화
+        self._versions[version] = None
+        self._versions.move_to_end(version)
+        while len(self._versions) > self.max_versions:
+            stale, _ = self._versions.popitem(last=False)
+            for key in [key for key in self._entries if key[0] == stale]:
+                self._drop(key)
+
+    def get(self, version, key, default=None):
+        with self._lock:
+            self._use_version(version)
+            key = (version, key)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[2] <= self._clock():
+                self._drop(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, version, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            self._use_version(version)
+            key = (version, key)
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = (value, size, self._clock() + self.ttl)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, version, key, compute):
+        missing = object()
+        value = self.get(version, key, missing)
+        if value is missing:
+            # 계산은 잠금 밖에서 수행 (동시에 같은 키가 계산될 수 있으나 결과는 동일)
+            value = self.put(version, key, compute())
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'version': next(reversed(self._versions), None),
+                'versions': len(self._versions),
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# Streamlit 은 스크립트만 매 실행마다 다시 돌리고 import 된 모듈은 유지하므로
+# 이 인스턴스는 프로세스 내 모든 세션이 공유
+QUERY_CACHE = QueryCache()
@@ -0,0 +1,153 @@
+import os
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from analytics import PARTY_TYPES, partner_type_of
+
+
+# =======================================
+# 회사별 리포트 일괄 내보내기
+#  - 전체 데이터에서 회사별 요약/거래 상대방/구간/선사 표를 groupby 한 번씩으로 계산
+#  - 회사 코드 순으로 정렬해 두고 회사별 구간만 잘라서 워크북 작성
+#  - 워크북 쓰기는 프로세스 풀에서 병렬 처리, 동시에 대기하는 작업 수를 제한해서 메모리 유지
+# =======================================
+DEFAULT_MIN_CONTAINERS = 100
+MAX_PENDING_PER_WORKER = 4
+_INVALID_FILENAME = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def safe_filename(name):
+    return _INVALID_FILENAME.sub('_', str(name)).strip('._')[:120] or 'company'
+
+
+def _ranked_by_company(rows, analysis_type, keys, with_share):
+    # (회사, 키...) 별 합계 → 회사 코드 오름차순, 회사 안에서는 컨테이너수 내림차순
+    grouped = rows.groupby([analysis_type] + keys, observed=True)['컨테이너수'].sum().reset_index()
+    grouped = grouped.sort_values([analysis_type, '컨테이너수'], ascending=[True, False], kind='stable').reset_index(drop=True)
+    grouped.insert(1, '순위', grouped.groupby(analysis_type, observed=True).cumcount() + 1)
+    if with_share:
+        totals = grouped.groupby(analysis_type, observed=True)['컨테이너수'].transform('sum')
+        grouped['비중(%)'] = (grouped['컨테이너수'] / totals * 100).round(1)
+    return grouped
+
+
+class _CompanySlices:
+    # 회사 코드 순으로 정렬된 표에서 회사 하나의 구간을 이진 탐색으로 잘라냄
+    def __init__(self, table, analysis_type):
+        self.table = table
+        self.analysis_type = analysis_type
+        self.codes = table[analysis_type].cat.codes.to_numpy()
+
+    def get(self, code):
+        lo, hi = np.searchsorted(self.codes, [code, code + 1])
+        return self.table.iloc[lo:hi].drop(columns=self.analysis_type).reset_index(drop=True)
+
+
+class CompanyReports:
+    # (회사명, {시트명: DataFrame}) 를 컨테이너수 내림차순으로 생성
+    #  - 표는 생성 시점에 groupby 한 번씩으로 모두 계산, 순회할 때는 회사별 구간만 잘라냄
+    def __init__(self, dataset, analysis_type, min_containers=DEFAULT_MIN_CONTAINERS, start_date=None, end_date=None):
+        rows = dataset.df
+        if not dataset.timeline.is_full_range(start_date, end_date):
+            lo, hi = dataset.timeline.bounds(start_date, end_date)
+            day_index = dataset.timeline.day_index
+            rows = rows[(day_index >= lo) & (day_index < hi)]
+        self.analysis_type = analysis_type
+        self.partner_type = partner_type = partner_type_of(analysis_type)
+
+        # 요약 KPI: 선적 건 / 컨테이너 / 거래 상대방 수 / 부킹 선사 수
+        kpis = rows.groupby(analysis_type, observed=True).agg(
+            선적건=('컨테이너수', 'size'),
+            컨테이너=('컨테이너수', 'sum'),
+            거래상대방=(partner_type, 'nunique'),
+            부킹선사=('컨테이너선사', 'nunique'),
+        )
+        self.kpis = kpis[kpis['컨테이너'] >= min_containers].sort_values('컨테이너', ascending=False, kind='stable')
+        info = rows[[analysis_type, f'{analysis_type} 대분류', f'{analysis_type} 사업내용']].drop_duplicates(analysis_type)
+        self.info = info.set_index(analysis_type)
+        self.categories = rows[analysis_type].cat.categories
+
+        partner_keys = [partner_type, f'{partner_type} 대분류', f'{partner_type} 사업내용']
+        self.partners = _CompanySlices(_ranked_by_company(rows, analysis_type, partner_keys, True), analysis_type)
+        self.routes = _CompanySlices(_ranked_by_company(rows, analysis_type, [partner_type, '선적항', '도착항'], False), analysis_type)
+        carriers = _ranked_by_company(rows, analysis_type, ['컨테이너선사'], True).drop(columns='순위')
+        self.carriers = _CompanySlices(carriers, analysis_type)
+
+    def __len__(self):
+        return len(self.kpis)
+
+    def summary(self, company, kpi):
+        analysis_type = self.analysis_type
+        return pd.DataFrame({
+            '항목': ['회사명', '구분', '대분류', '사업내용', '선적 건', '컨테이너', f'거래 {self.partner_type}', '부킹 선사'],
+            '값': [
+                company, analysis_type,
+                self.info.at[company, f'{analysis_type} 대분류'], self.info.at[company, f'{analysis_type} 사업내용'],
+                int(kpi['선적건']), int(kpi['컨테이너']), int(kpi['거래상대방']), int(kpi['부킹선사']),
+            ],
+        })
+
+    def __iter__(self):
+        for company, kpi in self.kpis.iterrows():
+            code = self.categories.get_loc(company)
+            yield company, {
+                '요약': self.summary(company, kpi),
+                f'거래 {self.partner_type}': self.partners.get(code),
+                '구간': self.routes.get(code),
+                '컨테이너선사': self.carriers.get(code),
+            }
+
+
+def write_workbook(path, sheets):
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=name[:31], index=False)
+    return path
+
+
+def _print_progress(done, total, path):
+    print(f"[{done}/{total}] {path}", file=sys.stderr)
+
+
+def export_reports(dataset, out_dir, analysis_types=PARTY_TYPES, min_containers=DEFAULT_MIN_CONTAINERS,
+                   start_date=None, end_date=None, workers=None, progress=_print_progress):
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * MAX_PENDING_PER_WORKER
+
+    jobs = []
+    for analysis_type in analysis_types:
+        type_dir = os.path.join(out_dir, analysis_type)
+        os.makedirs(type_dir, exist_ok=True)
+        jobs.append((type_dir, CompanyReports(dataset, analysis_type, min_containers, start_date, end_date)))
+    total = sum(len(reports) for _, reports in jobs)
+
+    written = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for type_dir, reports in jobs:
+            used_names = set()
+            for company, sheets in reports:
+                filename = safe_filename(company)
+                # 정규화 후 이름이 겹치면 '_' 를 덧붙임
+                while filename in used_names:
+                    filename += '_'
+                used_names.add(filename)
+                pending.add(pool.submit(write_workbook, os.path.join(type_dir, f"{filename}.xlsx"), sheets))
+
+                # 대기 작업이 많으면 일부가 끝날 때까지 생성 중단 (메모리 제한)
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        written.append(future.result())
+                        if progress:
+                            progress(len(written), total, written[-1])
+
+        for future in wait(pending).done:
+            written.append(future.result())
+            if progress:
+                progress(len(written), total, written[-1])
+    return written
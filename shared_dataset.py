@@ -0,0 +1,214 @@
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from dataset import MAX_LOADED, CompanyIndex, CompanyRollup, Dataset, dataset_version, extract_cutoff, read_frame
+from timeline import DimensionRollup, PrefixRollup, Timeline
+
+
+# =======================================
+# 프로세스 간 공유 데이터셋 (여러 Streamlit 워커용)
+#  - 인코딩된 컬럼(카테고리 코드)과 파생 인덱스(누적합 롤업, 회사 인덱스, 타임라인)를
+#    버전별 폴더에 .npy 로 한 번만 내보냄
+#  - 각 워커는 np.load(mmap_mode='r') 로 연결 → OS 페이지 캐시를 공유 (워커 수와 무관하게 1벌)
+#  - 폴더 이름 = 데이터셋 버전, 임시 폴더에 쓴 뒤 rename 으로 교체 → 반쯤 쓰인 버전은 보이지 않음
+#  - 문자열 풀(카테고리 이름)과 검색/유사도 인덱스는 프로세스별로 보관
+# =======================================
+SHARED_DIR = os.path.join('.cache', 'shared')
+SHARED_FORMAT = 3
+KEEP_VERSIONS = 8
+STALE_TMP_SECONDS = 60 * 60
+
+# 데이터셋 객체를 원본/항로 선택별로 1개만 유지 (같은 버전이면 그대로 재사용)
+#  - 새 버전에 연결하면 이전 버전은 바로 놓고, 최근 사용한 선택 MAX_LOADED 개만 유지
+_ATTACHED = OrderedDict()
+_ATTACH_LOCK = threading.Lock()
+
+
+def default_shared_dir(source):
+    base = source if os.path.isdir(source) else os.path.dirname(os.path.abspath(source))
+    return os.path.join(base, SHARED_DIR)
+
+
+class _ArrayWriter:
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+
+    def save(self, array):
+        name = f"a{self.count:04d}.npy"
+        self.count += 1
+        np.save(os.path.join(self.path, name), np.ascontiguousarray(array), allow_pickle=False)
+        return name
+
+
+def _load(path, name):
+    return np.load(os.path.join(path, name), mmap_mode='r', allow_pickle=False)
+
+
+def _frame_spec(writer, df):
+    # 카테고리 → 코드, 숫자/날짜 → 값 그대로 (object 컬럼은 공유 대상 아님)
+    spec = []
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            spec.append({'name': col, 'kind': 'category', 'file': writer.save(series.cat.codes.to_numpy())})
+        elif series.dtype != object:
+            spec.append({'name': col, 'kind': 'array', 'file': writer.save(series.to_numpy())})
+        else:
+            raise ValueError(f"공유할 수 없는 컬럼 형식: {col} ({series.dtype})")
+    return spec
+
+
+def _frame_from_spec(path, spec, dtype):
+    columns = {}
+    for col in spec:
+        values = _load(path, col['file'])
+        columns[col['name']] = pd.Categorical.from_codes(values, dtype=dtype) if col['kind'] == 'category' else values
+    # copy=False: mmap 배열을 복사하지 않고 그대로 컬럼으로 사용
+    return pd.DataFrame(columns, copy=False)
+
+
+def _rollup_spec(writer, rollup):
+    # 누적합 롤업 = (셀, 누적합) 배열 2개
+    return [writer.save(rollup.cells), writer.save(rollup.cumulative)]
+
+
+def _rollup_arrays(path, spec):
+    return tuple(_load(path, name) for name in spec)
+
+
+def shared_path(shared_dir, version):
+    # 형식이 바뀌면 같은 데이터셋 버전이라도 새 폴더로 내보냄 (이전 형식 폴더는 연결하지 않음)
+    return os.path.join(shared_dir, f"{version}.f{SHARED_FORMAT}")
+
+
+def publish_dataset(dataset, shared_dir):
+    final_path = shared_path(shared_dir, dataset.version)
+    if os.path.isdir(final_path):
+        return final_path
+    dataset.precompute()
+    os.makedirs(shared_dir, exist_ok=True)
+    tmp_path = f"{final_path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    writer = _ArrayWriter(tmp_path)
+
+    timeline = dataset.timeline
+    meta = {
+        'format': SHARED_FORMAT,
+        'version': dataset.version,
+        'created_at': time.time(),
+        'columns': _frame_spec(writer, dataset.df),
+        'timeline': [writer.save(a) for a in (timeline.days, timeline.day_index, timeline.months, timeline.month_bounds)],
+        'rollups': {},
+        'company_indexes': {},
+        'dimensions': [],
+        'daily_totals': [_rollup_spec(writer, rollup) for rollup in dataset.daily_totals],
+    }
+    for analysis_type in ('수출자', '수입자'):
+        rollup = dataset.rollup(analysis_type)
+        meta['rollups'][analysis_type] = {
+            'table': _frame_spec(writer, rollup.table),
+            'containers': _rollup_spec(writer, rollup._daily_containers),
+            'records': _rollup_spec(writer, rollup._daily_records),
+        }
+        index = dataset.company_index(analysis_type)
+        meta['company_indexes'][analysis_type] = [writer.save(index.order), writer.save(index.offsets)]
+    for columns in Dataset.SHARED_DIMENSIONS:
+        rollup = dataset.dimension_rollup(columns)
+        meta['dimensions'].append({
+            'columns': list(columns),
+            'key_codes': [writer.save(codes) for codes in rollup.key_codes],
+            'containers': _rollup_spec(writer, rollup.containers),
+            'records': _rollup_spec(writer, rollup.records),
+        })
+
+    feather.write_feather(pa.table({'pool': pa.array(dataset.pool.to_numpy(dtype=object), pa.string())}),
+                          os.path.join(tmp_path, 'pool.feather'), compression='uncompressed')
+    with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    try:
+        os.rename(tmp_path, final_path)
+    except OSError:
+        # 다른 워커가 먼저 같은 버전을 내보냄 → 그 쪽을 사용
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    remove_old_versions(shared_dir)
+    return final_path
+
+
+def attach_dataset(path, cutoff=None):
+    with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    pool = feather.read_table(os.path.join(path, 'pool.feather')).column('pool').to_numpy(zero_copy_only=False)
+    dtype = pd.CategoricalDtype(pd.Index(pool, dtype=object))
+    df = _frame_from_spec(path, meta['columns'], dtype)
+
+    timeline = Timeline.from_arrays(*(_load(path, name) for name in meta['timeline']))
+    rollups = {
+        analysis_type: CompanyRollup.from_arrays(
+            analysis_type, _frame_from_spec(path, spec['table'], dtype),
+            _rollup_arrays(path, spec['containers']), _rollup_arrays(path, spec['records']), timeline.n_days,
+        )
+        for analysis_type, spec in meta['rollups'].items()
+    }
+    company_indexes = {
+        analysis_type: CompanyIndex.from_arrays(dtype.categories, _load(path, order), _load(path, offsets))
+        for analysis_type, (order, offsets) in meta['company_indexes'].items()
+    }
+    dimension_rollups = {
+        tuple(spec['columns']): DimensionRollup.from_arrays(
+            [_load(path, name) for name in spec['key_codes']],
+            _rollup_arrays(path, spec['containers']), _rollup_arrays(path, spec['records']), timeline.n_days,
+        )
+        for spec in meta['dimensions']
+    }
+    daily_totals = tuple(
+        PrefixRollup.from_arrays(*_rollup_arrays(path, spec), timeline.n_days, 1) for spec in meta['daily_totals']
+    )
+    return Dataset.from_parts(df, meta['version'], timeline, rollups, company_indexes, dimension_rollups, daily_totals, cutoff)
+
+
+def remove_old_versions(shared_dir, keep=KEEP_VERSIONS):
+    # 최근 버전 keep 개만 남김 (이미 연결한 워커는 파일이 지워져도 매핑이 유지됨, Windows 는 실패 무시)
+    now = time.time()
+    versions = []
+    for name in os.listdir(shared_dir):
+        path = os.path.join(shared_dir, name)
+        if '.tmp-' in name:
+            if now - os.path.getmtime(path) > STALE_TMP_SECONDS:
+                shutil.rmtree(path, ignore_errors=True)
+        elif os.path.isdir(path):
+            versions.append((os.path.getmtime(path), path))
+    for _, path in sorted(versions, reverse=True)[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def load_shared_dataset(source, routes=None, shared_dir=None):
+    # 현재 버전이 공유 폴더에 있으면 연결, 없으면 이 프로세스가 만들어서 내보낸 뒤 연결
+    routes = tuple(sorted(routes)) if routes else None
+    shared_dir = shared_dir or default_shared_dir(source)
+    key = (os.path.abspath(source), routes)
+    with _ATTACH_LOCK:
+        version = dataset_version(source, routes)
+        dataset = _ATTACHED.pop(key, None)
+        if dataset is None or dataset.version != version:
+            dataset = None
+            path = shared_path(shared_dir, version)
+            if not os.path.isdir(path):
+                publish_dataset(Dataset.from_frame(read_frame(source, routes), version), shared_dir)
+            # 추출 기준일은 공유 폴더에 저장하지 않고 프로세스 설정을 그대로 사용
+            dataset = attach_dataset(path, extract_cutoff())
+        _ATTACHED[key] = dataset
+        while len(_ATTACHED) > MAX_LOADED:
+            _ATTACHED.popitem(last=False)
+    return dataset
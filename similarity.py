@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import MinMaxScaler, normalize
+
+
+# =======================================
+# 유사 고객 추천
+#  - 회사별 희소 특성 행렬: 거래 상대방 / 컨테이너선사 / 선적항→도착항 / 화물분류명 비중
+#  - 물량 특성(컨테이너수, 선적 건, 상대방 수)은 log 후 MinMaxScaler 로 한 번만 스케일
+#  - TruncatedSVD 로 저차원 변환 → 단위 벡터 → BallTree 최근접 이웃
+#  - 데이터셋 버전별로 한 번만 생성
+# =======================================
+FEATURE_WEIGHTS = {
+    'partner': 1.0,
+    'carrier': 1.0,
+    'lane': 0.5,
+    'cargo': 1.0,
+    'volume': 0.5,
+}
+N_COMPONENTS = 32
+
+
+def _share_matrix(row_keys, feature_codes, weights, n_rows):
+    # (회사 × 특성값) 컨테이너 합계 → 행 단위 비중(L1 정규화)
+    valid = (row_keys >= 0) & (feature_codes >= 0)
+    _, columns = np.unique(feature_codes[valid], return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (weights[valid].astype(float), (row_keys[valid], columns)),
+        shape=(n_rows, int(columns.max()) + 1 if len(columns) else 0),
+    )
+    matrix.sum_duplicates()
+    return normalize(matrix, norm='l1')
+
+
+class SimilarCustomerIndex:
+    def __init__(self, dataset, analysis_type, n_components=N_COMPONENTS):
+        df = dataset.df
+        partner_type = '수입자' if analysis_type == '수출자' else '수출자'
+        codes = dataset.codes(analysis_type).astype(np.int64)
+        self.company_codes, row_keys = np.unique(codes, return_inverse=True)
+        row_keys = np.where(codes >= 0, row_keys, -1)
+        if len(self.company_codes) and self.company_codes[0] < 0:
+            # 결측 회사(-1)는 첫 번째 키로 잡히므로 제외하고 다시 번호 매김
+            self.company_codes = self.company_codes[1:]
+            row_keys = np.where(row_keys >= 0, row_keys - 1, -1)
+        self.analysis_type = analysis_type
+        self.names = dataset.decode(self.company_codes)
+        n_rows = len(self.company_codes)
+
+        containers = df['컨테이너수'].to_numpy()
+        lane_codes = dataset.codes('선적항').astype(np.int64) * len(dataset.pool) + dataset.codes('도착항')
+        # 선적항/도착항 결측(-1)은 다른 실제 구간 코드와 겹치므로 구간 없음(-1)으로 (network.py 와 동일)
+        lane_codes[(dataset.codes('선적항') < 0) | (dataset.codes('도착항') < 0)] = -1
+        blocks = [
+            FEATURE_WEIGHTS['partner'] * _share_matrix(row_keys, dataset.codes(partner_type), containers, n_rows),
+            FEATURE_WEIGHTS['carrier'] * _share_matrix(row_keys, dataset.codes('컨테이너선사'), containers, n_rows),
+            FEATURE_WEIGHTS['lane'] * _share_matrix(row_keys, lane_codes, containers, n_rows),
+            FEATURE_WEIGHTS['cargo'] * _share_matrix(row_keys, dataset.codes('화물분류명'), containers, n_rows),
+        ]
+
+        # 물량 특성: 컨테이너수 / 선적 건 / 거래 상대방 수
+        valid = row_keys >= 0
+        volume = np.bincount(row_keys[valid], weights=containers[valid], minlength=n_rows)
+        shipments = np.bincount(row_keys[valid], minlength=n_rows)
+        partners = np.diff(blocks[0].tocsr().indptr)
+        volume_features = MinMaxScaler().fit_transform(np.log1p(np.column_stack([volume, shipments, partners])))
+        blocks.append(FEATURE_WEIGHTS['volume'] * sparse.csr_matrix(volume_features))
+        self.volume = volume.astype(np.int64)
+
+        features = sparse.hstack(blocks, format='csr')
+        n_components = max(1, min(n_components, features.shape[1] - 1, n_rows - 1))
+        embedding = TruncatedSVD(n_components=n_components, random_state=0).fit_transform(features)
+        self.embedding = normalize(embedding)
+        self._neighbors = NearestNeighbors(algorithm='ball_tree').fit(self.embedding)
+        self._position = {code: i for i, code in enumerate(self.company_codes)}
+        self._pool = dataset.pool
+
+    def similar(self, company, k=10):
+        try:
+            code = self._pool.get_loc(company)
+        except KeyError:
+            return None
+        position = self._position.get(code)
+        if position is None:
+            return None
+
+        n_neighbors = min(k + 1, len(self.company_codes))
+        distances, indices = self._neighbors.kneighbors(self.embedding[position:position + 1], n_neighbors=n_neighbors)
+        distances, indices = distances[0], indices[0]
+        keep = indices != position
+        distances, indices = distances[keep][:k], indices[keep][:k]
+
+        # 단위 벡터 사이 유클리드 거리 → 코사인 유사도
+        similarity = np.clip(1.0 - distances ** 2 / 2.0, 0.0, 1.0)
+        return pd.DataFrame({
+            '순위': np.arange(1, len(indices) + 1),
+            self.analysis_type: self.names[indices],
+            '컨테이너수': self.volume[indices],
+            '유사도(%)': (similarity * 100).round(1),
+        })
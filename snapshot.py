@@ -0,0 +1,214 @@
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from entity import AliasMap, resolve_frame
+from xlsx_stream import read_xlsx
+
+
+# =======================================
+# jakarta.xlsx 컬럼형 스냅샷 (Arrow IPC / Feather)
+#  - 원본 엑셀을 한 번만 파싱해서 .cache 에 저장 (카테고리 컬럼 그대로)
+#  - 원본 파일의 mtime/크기/해시로 무효화
+#  - 비압축 Feather 로 저장해서 memory-map 으로 바로 읽음
+#  - 수출자/수입자 표기는 별칭 맵으로 대표 이름에 통일해서 저장 (entity.py, 별칭 맵은 스냅샷 옆에 유지)
+#  - 재생성은 잠금 파일로 한 번에 1개 프로세스만, 파일은 고유 임시 파일에 쓴 뒤 교체
+# =======================================
+SNAPSHOT_DIR = '.cache'
+SNAPSHOT_FORMAT = 4
+LOCK_TIMEOUT = 600
+
+
+def _snapshot_paths(source, snapshot_dir=None):
+    # 기본 저장 위치: 원본 파일과 같은 폴더의 .cache (실행 위치와 무관)
+    if snapshot_dir is None:
+        snapshot_dir = os.path.join(os.path.dirname(os.path.abspath(source)), SNAPSHOT_DIR)
+    name = os.path.splitext(os.path.basename(source))[0]
+    data_path = os.path.join(snapshot_dir, f"{name}.feather")
+    meta_path = os.path.join(snapshot_dir, f"{name}.meta.json")
+    return data_path, meta_path
+
+
+def alias_path(source, snapshot_dir=None):
+    data_path, _ = _snapshot_paths(source, snapshot_dir)
+    return data_path[:-len('.feather')] + '.aliases.json'
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_stat(source):
+    stat = os.stat(source)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@contextlib.contextmanager
+def _file_lock(lock_path, timeout=LOCK_TIMEOUT):
+    # 여러 프로세스가 동시에 같은 파일을 만들지 않도록 잠금 파일 사용 (오래된 잠금은 무시)
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > timeout:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue
+            time.sleep(0.2)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lock_path)
+
+
+@contextlib.contextmanager
+def _replacing(path):
+    # 같은 폴더의 고유 임시 파일에 쓰고 교체 (동시에 써도 서로의 임시 파일을 덮어쓰지 않음, 실패 시 임시 파일 삭제)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_meta(meta_path, meta):
+    with _replacing(meta_path) as tmp_path:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def is_fresh(source, snapshot_dir=None):
+    data_path, meta_path = _snapshot_paths(source, snapshot_dir)
+    meta = _read_meta(meta_path)
+    if meta is None or not os.path.exists(data_path):
+        return False
+    if meta.get('format') != SNAPSHOT_FORMAT:
+        return False
+
+    # mtime/크기가 같으면 해시 계산 없이 바로 사용
+    stat = _source_stat(source)
+    if meta.get('mtime_ns') == stat['mtime_ns'] and meta.get('size') == stat['size']:
+        return True
+
+    # mtime 만 바뀐 경우 (복사/체크아웃 등) 해시가 같으면 메타만 갱신
+    if meta.get('size') == stat['size'] and meta.get('sha256') == file_sha256(source):
+        meta.update(stat)
+        _write_meta(meta_path, meta)
+        return True
+    return False
+
+
+def read_source(source):
+    # xlsx 는 스트리밍 리더로 카테고리 컬럼을 바로 생성, 그 외 형식은 pandas 로 읽음
+    if source.lower().endswith('.xlsx'):
+        return read_xlsx(source)
+    return pd.read_excel(source)
+
+
+def _snapshot_lock(source, snapshot_dir=None):
+    data_path, _ = _snapshot_paths(source, snapshot_dir)
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+    return _file_lock(data_path[:-len('.feather')] + '.lock')
+
+
+def build_snapshot(source, snapshot_dir=None):
+    with _snapshot_lock(source, snapshot_dir):
+        return _build_snapshot(source, snapshot_dir)
+
+
+def refresh_snapshot(source, snapshot_dir=None):
+    # 오래된 경우에만 재생성 (잠금을 기다린 프로세스는 다시 확인해서 먼저 끝난 결과를 그대로 사용)
+    if is_fresh(source, snapshot_dir):
+        return False
+    with _snapshot_lock(source, snapshot_dir):
+        if not is_fresh(source, snapshot_dir):
+            _build_snapshot(source, snapshot_dir)
+    return True
+
+
+def _build_snapshot(source, snapshot_dir=None):
+    data_path, meta_path = _snapshot_paths(source, snapshot_dir)
+    stat = _source_stat(source)
+    digest = file_sha256(source)
+    # 원본이 바뀌어도 별칭 맵은 이어서 사용 → 처음 보는 표기만 판별
+    aliases = AliasMap.load(alias_path(source, snapshot_dir))
+    df = resolve_frame(read_source(source), aliases)
+    aliases.save(alias_path(source, snapshot_dir))
+
+    # 쓰는 도중 다른 프로세스가 읽지 않도록 임시 파일에 쓰고 교체
+    with _replacing(data_path) as tmp_path:
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+
+    _write_meta(meta_path, {
+        'format': SNAPSHOT_FORMAT,
+        'source': os.path.basename(source),
+        'sha256': digest,
+        'rows': len(df),
+        **stat,
+    })
+    return df
+
+
+def snapshot_meta(source, snapshot_dir=None):
+    _, meta_path = _snapshot_paths(source, snapshot_dir)
+    return _read_meta(meta_path)
+
+
+def snapshot_version(source, snapshot_dir=None):
+    # 원본 해시 + 스냅샷 형식 (형식이 바뀌면 공유 데이터셋/캐시도 새 버전으로)
+    meta = snapshot_meta(source, snapshot_dir)
+    return hashlib.sha256(f"{SNAPSHOT_FORMAT}:{meta['sha256']}".encode('utf-8')).hexdigest()[:16]
+
+
+def load_snapshot(source, snapshot_dir=None):
+    refresh_snapshot(source, snapshot_dir)
+    data_path, _ = _snapshot_paths(source, snapshot_dir)
+    table = feather.read_table(data_path, memory_map=True)
+    return table.to_pandas()
+
+
+# 배포 전 스냅샷 재생성: python snapshot.py [jakarta.xlsx] [--force]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="jakarta.xlsx 컬럼형 스냅샷 생성")
+    parser.add_argument('source', nargs='?', default='jakarta.xlsx')
+    parser.add_argument('--dir', default=None, help="스냅샷 저장 폴더 (기본: 원본 파일 옆 .cache)")
+    parser.add_argument('--force', action='store_true', help="최신 상태여도 다시 생성")
+    args = parser.parse_args(argv)
+
+    if not args.force and is_fresh(args.source, args.dir):
+        print(f"스냅샷 최신 상태: {args.source}")
+        return 0
+    df = build_snapshot(args.source, args.dir)
+    data_path, _ = _snapshot_paths(args.source, args.dir)
+    print(f"스냅샷 생성 완료: {data_path} ({len(df):,} rows)")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
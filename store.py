@@ -0,0 +1,312 @@
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+from pandas.api.types import union_categoricals
+
+from entity import AliasMap, resolve_frame
+from snapshot import _file_lock, _read_meta, _replacing, _write_meta, file_sha256, read_source
+
+
+# =======================================
+# 여러 추출 파일(월별/항로별) 데이터 폴더 → 파티션 컬럼형 저장소
+#  - 새로 들어온(또는 바뀐) 파일만 파싱해서 추가 (이미 처리한 파일은 stat/해시로 건너뜀)
+#  - 파일별로 추가한 행 키/파티션을 기록 → 내용이 바뀐 파일은 이전 내용이 추가한 행을 빼고 다시 적재
+#  - 행 키(주요 컬럼 해시)가 이미 저장소에 있으면 중복으로 보고 제외
+#    (같은 파일 안의 동일 행은 실제 선적 건일 수 있으므로 그대로 유지)
+#  - (도착지국가, 도착항, 월) 단위 Feather 파티션 → 추가 시 해당 파티션만 다시 씀
+#  - 항로를 고르면 그 항로 파티션만 읽음 (나머지 항로는 읽지도 않음)
+#  - 수출자/수입자 표기는 저장 전에 대표 이름으로 통일 (entity.py, 별칭 맵은 새 파일의 처음 보는 표기만 추가)
+#  예) python store.py ingest data/
+#      python store.py routes data/
+# =======================================
+STORE_DIR = os.path.join('.cache', 'store')
+STORE_FORMAT = 4
+SOURCE_EXTENSIONS = ('.xlsx', '.xls')
+ROUTE_COLUMNS = ['도착지국가', '도착항']
+# 사업내용/대분류 같은 회사 속성은 추출마다 보정될 수 있으므로 행 키에서 제외
+ROW_KEY_COLUMNS = [
+    '선적일', '선적항', '도착지국가', '도착항', '수출자', '수입자',
+    '컨테이너선사', '컨테이너수', '화물분류명', '화물품목한글명',
+]
+UNKNOWN = '미상'
+
+
+def _store_paths(data_dir, store_dir=None):
+    store_dir = store_dir or os.path.join(data_dir, STORE_DIR)
+    return store_dir, os.path.join(store_dir, 'manifest.json'), os.path.join(store_dir, 'row_keys.npy')
+
+
+def alias_path(data_dir, store_dir=None):
+    store_dir, _, _ = _store_paths(data_dir, store_dir)
+    return os.path.join(store_dir, 'aliases.json')
+
+
+def route_label(country, port):
+    return f"{port} ({country})"
+
+
+def list_sources(data_dir):
+    # 엑셀 임시 파일(~$...)과 숨김 파일은 제외
+    return sorted(
+        name for name in os.listdir(data_dir)
+        if name.lower().endswith(SOURCE_EXTENSIONS) and not name.startswith(('~$', '.'))
+    )
+
+
+def read_manifest(data_dir, store_dir=None):
+    _, manifest_path, _ = _store_paths(data_dir, store_dir)
+    manifest = _read_meta(manifest_path)
+    if not manifest or manifest.get('format') != STORE_FORMAT:
+        return {'format': STORE_FORMAT, 'files': {}, 'partitions': {}}
+    return manifest
+
+
+def _store_lock(store_dir):
+    # 여러 프로세스가 동시에 적재하지 않도록 잠금 파일 사용 (오래된 잠금은 무시)
+    return _file_lock(os.path.join(store_dir, 'ingest.lock'))
+
+
+def concat_frames(frames):
+    # 카테고리 컬럼은 union_categoricals 로 합쳐서 object 로 풀리지 않게 함
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    columns = list(frames[0].columns)
+    for frame in frames[1:]:
+        if list(frame.columns) != columns:
+            raise ValueError(f"컬럼 구성이 다른 파일이 있습니다: {list(frame.columns)}")
+
+    merged = {}
+    for col in columns:
+        series = [frame[col] for frame in frames]
+        if all(isinstance(s.dtype, pd.CategoricalDtype) for s in series):
+            merged[col] = union_categoricals(series, sort_categories=True, ignore_order=True)
+        else:
+            merged[col] = pd.concat(series, ignore_index=True)
+    return pd.DataFrame(merged)
+
+
+def row_keys(df):
+    # 카테고리 컬럼은 값 기준으로 해시되므로 파일마다 categories 가 달라도 같은 행은 같은 키
+    return pd.util.hash_pandas_object(df[ROW_KEY_COLUMNS], index=False).to_numpy()
+
+
+def _write_partition(path, df):
+    df = df.sort_values('선적일', kind='stable').reset_index(drop=True)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.remove_unused_categories()
+    with _replacing(path) as tmp_path:
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+
+
+def _read_partition(store_dir, entry):
+    return feather.read_table(os.path.join(store_dir, entry['path']), memory_map=True).to_pandas()
+
+
+def _partition_name(country, port, month):
+    digest = hashlib.sha1(f"{country}|{port}|{month}".encode('utf-8')).hexdigest()[:12]
+    return f"{month}-{digest}"
+
+
+def _new_sources(data_dir, manifest):
+    # stat 이 같으면 해시 계산 없이 건너뜀, stat 만 바뀌고 내용이 같으면 기록만 갱신
+    changed = []
+    for name in list_sources(data_dir):
+        path = os.path.join(data_dir, name)
+        stat = os.stat(path)
+        known = manifest['files'].get(name)
+        if known and known['mtime_ns'] == stat.st_mtime_ns and known['size'] == stat.st_size:
+            continue
+        digest = file_sha256(path)
+        if known and known['sha256'] == digest:
+            known.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            continue
+        changed.append((name, path, stat, digest))
+    return changed
+
+
+def _file_keys_path(store_dir, name):
+    digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(store_dir, 'files', f"{digest}.npz")
+
+
+def _load_file_keys(store_dir, name):
+    # (이 파일이 추가한 행 키, 이 파일의 모든 행 키)
+    with np.load(_file_keys_path(store_dir, name)) as keys:
+        return keys['added'], keys['all']
+
+
+def _save_file_keys(store_dir, name, added, all_keys):
+    path = _file_keys_path(store_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _replacing(path) as tmp_path:
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, added=added, all=all_keys)
+
+
+def _withdrawn_files(store_dir, manifest, changed_names):
+    # 내용이 바뀐 파일 + 그 파일이 추가했던 행 키를 가진 다른 파일 (중복 제외로 그 파일의 행은 저장되지 않았으므로 다시 적재)
+    withdrawn, removed = set(), np.empty(0, dtype=np.uint64)
+    queue = [name for name in changed_names if name in manifest['files']]
+    while queue:
+        name = queue.pop()
+        if name in withdrawn:
+            continue
+        withdrawn.add(name)
+        added, _ = _load_file_keys(store_dir, name)
+        removed = np.union1d(removed, added)
+        for other in manifest['files']:
+            if other not in withdrawn and np.isin(_load_file_keys(store_dir, other)[1], added).any():
+                queue.append(other)
+    return withdrawn, removed
+
+
+def ingest(data_dir, store_dir=None, progress=None):
+    """새 파일/바뀐 파일만 파싱해서 저장소에 반영. 변경이 있었으면 True."""
+    store_dir, manifest_path, keys_path = _store_paths(data_dir, store_dir)
+    os.makedirs(store_dir, exist_ok=True)
+
+    # 잠금 없이 먼저 확인 → 대부분의 호출(새 파일 없음)은 stat 만 하고 끝남
+    if not _new_sources(data_dir, read_manifest(data_dir, store_dir)):
+        return False
+
+    with _store_lock(store_dir):
+        manifest = read_manifest(data_dir, store_dir)
+        sources = _new_sources(data_dir, manifest)
+        # 형식이 바뀌어 매니페스트가 비었으면 이전 행 키도 버리고 처음부터 적재
+        if manifest['files'] and os.path.exists(keys_path):
+            existing = np.load(keys_path)
+        else:
+            existing = np.empty(0, dtype=np.uint64)
+        aliases = AliasMap.load(alias_path(data_dir, store_dir))
+
+        # 바뀐 파일은 이전 내용이 추가했던 행을 먼저 빼고 새 파일처럼 다시 적재 (정정된 추출의 잘못된 행이 남지 않도록)
+        withdrawn, removed = _withdrawn_files(store_dir, manifest, [name for name, _, _, _ in sources])
+        touched = set()
+        for name in withdrawn:
+            touched.update(manifest['files'].pop(name)['partitions'])
+        existing = np.setdiff1d(existing, removed, assume_unique=True)
+        changed = {name for name, _, _, _ in sources}
+        for name in sorted(withdrawn - changed):
+            path = os.path.join(data_dir, name)
+            if os.path.exists(path):
+                sources.append((name, path, os.stat(path), file_sha256(path)))
+        sources.sort()
+
+        pending = {}
+        for name, path, stat, digest in sources:
+            # 행 키도 대표 이름 기준 → 파일마다 표기가 달라도 같은 선적 건은 중복으로 걸러짐
+            df = resolve_frame(read_source(path), aliases)
+            keys = row_keys(df)
+            fresh = ~np.isin(keys, existing)
+            existing = np.union1d(existing, keys[fresh])
+            added = df[fresh]
+
+            # 선적일/항로가 비어 있는 행도 버리지 않고 '미상' 파티션에 보관
+            months = added['선적일'].dt.strftime('%Y-%m').fillna(UNKNOWN)
+            groups = added.groupby([*ROUTE_COLUMNS, months], observed=True, sort=False, dropna=False)
+            partitions = []
+            for (country, port, month), part in groups:
+                key = (UNKNOWN if pd.isna(country) else country, UNKNOWN if pd.isna(port) else port, month)
+                partitions.append(_partition_name(*key))
+                pending.setdefault(partitions[-1], (key, []))[1].append(part)
+
+            _save_file_keys(store_dir, name, np.unique(keys[fresh]), np.unique(keys))
+            manifest['files'][name] = {
+                'sha256': digest, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                'rows': len(df), 'added': int(fresh.sum()), 'partitions': sorted(set(partitions)),
+            }
+            if progress:
+                progress(name, len(df), int(fresh.sum()))
+
+        # 새 행이 들어가거나 행이 빠진 파티션만 다시 씀 (다 빠진 파티션은 목록에서 제외)
+        deleted = []
+        for name in sorted(touched | set(pending)):
+            entry = manifest['partitions'].get(name)
+            key, parts = pending.get(name, (None, []))
+            if entry:
+                old = _read_partition(store_dir, entry)
+                if name in touched:
+                    old = old[~np.isin(row_keys(old), removed)]
+                parts = [old] + parts
+            df = concat_frames(parts)
+            if not len(df):
+                manifest['partitions'].pop(name, None)
+                deleted.append(os.path.join(store_dir, f"{name}.feather"))
+                continue
+            _write_partition(os.path.join(store_dir, f"{name}.feather"), df)
+            manifest['partitions'][name] = {
+                'path': f"{name}.feather",
+                'route': route_label(key[0], key[1]) if key else entry['route'],
+                'month': key[2] if key else entry['month'],
+                'rows': len(df),
+                'generation': (entry or {}).get('generation', 0) + 1,
+            }
+
+        with _replacing(keys_path) as tmp_path:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, existing)
+        aliases.save(alias_path(data_dir, store_dir))
+        # 매니페스트는 마지막에 교체 → 중간에 실패해도 이전 상태로 읽힘
+        _write_meta(manifest_path, manifest)
+        # 비게 된 파티션 파일은 매니페스트에서 빠진 뒤에 삭제
+        for path in deleted:
+            if os.path.exists(path):
+                os.remove(path)
+    return True
+
+
+def list_routes(data_dir, store_dir=None):
+    # [(항로, 행 수), ...] 행 수 내림차순
+    totals = {}
+    for entry in read_manifest(data_dir, store_dir)['partitions'].values():
+        totals[entry['route']] = totals.get(entry['route'], 0) + entry['rows']
+    return sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _selected_partitions(manifest, routes=None):
+    return sorted(
+        (name, entry) for name, entry in manifest['partitions'].items()
+        if routes is None or entry['route'] in routes
+    )
+
+
+def store_version(data_dir, routes=None, store_dir=None):
+    # 선택한 파티션 목록과 각 파티션 세대로 버전 결정 → 다른 항로에 파일이 추가돼도 버전 유지
+    selected = _selected_partitions(read_manifest(data_dir, store_dir), routes)
+    payload = json.dumps([STORE_FORMAT, [(name, entry['generation'], entry['rows']) for name, entry in selected]])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def read_store(data_dir, routes=None, store_dir=None):
+    store_dir, _, _ = _store_paths(data_dir, store_dir)
+    manifest = read_manifest(data_dir, store_dir)
+    frames = [_read_partition(store_dir, entry) for _, entry in _selected_partitions(manifest, routes)]
+    return concat_frames(frames)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="추출 파일 폴더 → 파티션 저장소 적재")
+    parser.add_argument('command', choices=['ingest', 'routes'])
+    parser.add_argument('data_dir', nargs='?', default='data')
+    args = parser.parse_args(argv)
+
+    if args.command == 'ingest':
+        changed = ingest(args.data_dir, progress=lambda name, rows, added: print(f"{name}: {rows:,} rows, {added:,} added"))
+        if not changed:
+            print(f"새 파일 없음: {args.data_dir}")
+    for route, rows in list_routes(args.data_dir):
+        print(f"{route}: {rows:,} rows")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# =======================================
+# 합성 선적 데이터 생성 (벤치마크 / 부하 테스트용)
+#  - jakarta.xlsx 와 같은 14개 컬럼, 같은 순서
+#  - 회사 수는 행 수에 대해 준선형으로 증가 (원본 2만 행 ≈ 수출자 1,600 / 수입자 2,100)
+#  - 회사/선사/품목은 Zipf 분포로 뽑아서 상위 소수 회사에 물량이 몰리는 분포 재현
+#  - 회사별 대분류/사업내용, 품목별 화물분류명은 고정 (실제 데이터처럼 함수 관계 유지)
+#  - 기간도 행 수에 대해 증가 (2만 행 = 6개월, 20만 행 ≈ 19개월, 200만 행 = 5년)
+#    → 큰 크기에서 날짜 축 크기(롤업/월 경계)와 2주기 이상 필요한 계절 예측 경로까지 측정
+# =======================================
+COLUMNS = [
+    '선적일', '선적항', '도착지국가', '도착항',
+    '수출자', '수출자 사업내용', '수출자 대분류',
+    '수입자', '수입자 사업내용', '수입자 대분류',
+    '컨테이너선사', '컨테이너수', '화물분류명', '화물품목한글명',
+]
+BASE_ROWS = 20_000
+COMPANY_GROWTH = 0.7
+ZIPF_EXPONENT = 0.9
+BASE_MONTHS = 6
+HISTORY_GROWTH = 0.5
+
+LOADING_PORTS = ['부산', '광양', '인천', '평택']
+DESTINATION = ('Indonesia', 'Jakarta, java')
+EXPORTER_SECTORS = [
+    '무역/상사', '화학/소재', '철강/금속', '전자/전기', '자동차/부품', '기계/장비', '식품/농수산',
+    '섬유/의류', '제지/포장', '물류/운송', '건설/건자재', '생활용품', '의약/바이오', '에너지', '플라스틱/고무', '유통', '기타',
+]
+IMPORTER_SECTORS = [
+    '물류/유통/무역/상사', '제조(화학)', '제조(금속)', '제조(전자)', '제조(자동차)', '제조(기계)', '식품/음료',
+    '섬유/봉제', '제지/인쇄', '건설', '소비재', '제약/헬스케어', '에너지/자원', '농업', '서비스', '기타',
+]
+
+
+def _zipf_weights(n, exponent=ZIPF_EXPONENT):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _names(prefix, n):
+    return [f'{prefix} {i:06d}' for i in range(n)]
+
+
+def _categorical(codes, categories):
+    # 행 수만큼 문자열을 만들지 않도록 코드 + 카테고리로 바로 생성 (read_xlsx 결과와 같은 형태)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _scaled(base, n_rows, growth=COMPANY_GROWTH):
+    return max(1, int(base * (n_rows / BASE_ROWS) ** growth))
+
+
+def history_days(n_rows, start=datetime.date(2025, 1, 1)):
+    # 시작일부터 꽉 찬 달 수만큼의 일수 (마지막 달이 진행 중인 월로 잘리지 않도록)
+    months = max(1, round(BASE_MONTHS * (n_rows / BASE_ROWS) ** HISTORY_GROWTH))
+    first = np.datetime64(start, 'M')
+    return int(((first + months).astype('datetime64[D]') - np.datetime64(start, 'D')).astype(np.int64))
+
+
+def _party(rng, prefix, n_companies, sectors, n_businesses, n_rows):
+    # 회사 속성 표(대분류/사업내용)를 만든 뒤 행마다 회사만 뽑아서 속성은 인덱싱으로 채움
+    names = _names(prefix, n_companies)
+    sector = rng.integers(0, len(sectors), n_companies)
+    business_names = [f'{sectors[i % len(sectors)]} 사업 {i:04d}' for i in range(n_businesses)]
+    business = sector + len(sectors) * rng.integers(0, max(1, n_businesses // len(sectors)), n_companies)
+    business = np.minimum(business, n_businesses - 1)
+    picks = rng.choice(n_companies, size=n_rows, p=_zipf_weights(n_companies))
+    return (
+        _categorical(picks, names),
+        _categorical(business[picks], business_names),
+        _categorical(sector[picks], sectors),
+    )
+
+
+def generate_shipments(n_rows, seed=0, start=datetime.date(2025, 1, 1), days=None):
+    rng = np.random.default_rng(seed)
+    days = days or history_days(n_rows, start)
+    exporter, exporter_business, exporter_sector = _party(
+        rng, 'Exporter', _scaled(1_600, n_rows), EXPORTER_SECTORS, _scaled(213, n_rows, 0.3), n_rows)
+    importer, importer_business, importer_sector = _party(
+        rng, 'Importer', _scaled(2_100, n_rows), IMPORTER_SECTORS, _scaled(367, n_rows, 0.3), n_rows)
+
+    carriers = _names('Carrier', 18)
+    n_items = _scaled(955, n_rows, 0.3)
+    cargo_classes = _names('Cargo class', 26)
+    items = _names('Cargo item', n_items)
+    item_class = rng.integers(0, len(cargo_classes), n_items)
+    item = rng.choice(n_items, size=n_rows, p=_zipf_weights(n_items))
+
+    # 컨테이너수: 대부분 1~2, 드물게 수십 (원본 평균 ≈ 2, 최대 ≈ 90)
+    containers = np.minimum(rng.geometric(0.6, n_rows) + (rng.random(n_rows) < 0.01) * rng.integers(5, 80, n_rows), 99)
+
+    dates = np.datetime64(start, 'D') + rng.integers(0, days, n_rows)
+    df = pd.DataFrame({
+        '선적일': pd.to_datetime(dates),
+        '선적항': _categorical(rng.choice(len(LOADING_PORTS), n_rows, p=[0.6, 0.25, 0.1, 0.05]), LOADING_PORTS),
+        '도착지국가': _categorical(np.zeros(n_rows, dtype=np.int64), DESTINATION[:1]),
+        '도착항': _categorical(np.zeros(n_rows, dtype=np.int64), DESTINATION[1:]),
+        '수출자': exporter,
+        '수출자 사업내용': exporter_business,
+        '수출자 대분류': exporter_sector,
+        '수입자': importer,
+        '수입자 사업내용': importer_business,
+        '수입자 대분류': importer_sector,
+        '컨테이너선사': _categorical(rng.choice(len(carriers), n_rows, p=_zipf_weights(len(carriers), 0.8)), carriers),
+        '컨테이너수': containers.astype(np.int64),
+        '화물분류명': _categorical(item_class[item], cargo_classes),
+        '화물품목한글명': _categorical(item, items),
+    })
+    return df[COLUMNS].sort_values('선적일', kind='stable').reset_index(drop=True)
+
+
+def write_xlsx(df, path):
+    # openpyxl write-only 모드로 행 단위 기록 (대용량에서도 메모리 일정)
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    sheet.append(list(df.columns))
+    date_col = df.columns.get_loc('선적일')
+    for row in df.itertuples(index=False, name=None):
+        row = list(row)
+        row[date_col] = row[date_col].to_pydatetime()
+        sheet.append(row)
+    tmp_path = path + '.tmp'
+    workbook.save(tmp_path)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+
+# =======================================
+# 선적일 기준 누적합(prefix-sum) 롤업
+#  - 선적일을 고유 일자 인덱스로 바꾸고 값이 있는 (키, 일자) 셀만 정렬해서 셀 누적합을 한 번만 계산
+#  - 임의 기간 합계 = 누적합[끝 위치] - 누적합[시작 위치] (위치는 searchsorted) → 원본 행을 다시 스캔하지 않음
+#  - 메모리는 셀 수(≤ 행 수)에 비례, 키 × 전체 일수 행렬은 만들지 않음 (기간이 길어져도 그대로)
+#  - 월별 값은 월 경계 일자의 누적합 차이로 계산 (별도 월별 집계 불필요)
+# =======================================
+class Timeline:
+    def __init__(self, dates):
+        days = pd.DatetimeIndex(dates).to_numpy().astype('datetime64[D]')
+        valid = ~np.isnat(days)
+        self.days, inverse = np.unique(days[valid], return_inverse=True)
+        self.day_index = np.full(len(days), -1, dtype=np.int64)
+        self.day_index[valid] = inverse
+
+        # 월 경계: 각 월의 첫 일자 인덱스 (+ 마지막 경계 = 일자 수)
+        months = self.days.astype('datetime64[M]')
+        self.months, month_starts = np.unique(months, return_index=True)
+        self.month_bounds = np.append(month_starts, len(self.days))
+
+    @classmethod
+    def from_arrays(cls, days, day_index, months, month_bounds):
+        # 공유 메모리 배열에서 복원 (계산 없이 배열만 연결)
+        timeline = cls.__new__(cls)
+        timeline.days, timeline.day_index = days, day_index
+        timeline.months, timeline.month_bounds = months, month_bounds
+        return timeline
+
+    @property
+    def n_days(self):
+        return len(self.days)
+
+    @property
+    def first_date(self):
+        return pd.Timestamp(self.days[0]).date() if self.n_days else None
+
+    @property
+    def last_date(self):
+        return pd.Timestamp(self.days[-1]).date() if self.n_days else None
+
+    def bounds(self, start_date=None, end_date=None):
+        # [lo, hi) 일자 인덱스 구간 (끝 날짜 포함)
+        lo = 0 if start_date is None else int(np.searchsorted(self.days, np.datetime64(start_date, 'D'), side='left'))
+        hi = self.n_days if end_date is None else int(np.searchsorted(self.days, np.datetime64(end_date, 'D'), side='right'))
+        return lo, max(lo, hi)
+
+    def is_full_range(self, start_date=None, end_date=None):
+        return self.bounds(start_date, end_date) == (0, self.n_days)
+
+    def month_slice(self, lo, hi):
+        # 기간에 걸친 월 목록과 각 월의 [시작, 끝) 일자 경계 (기간 밖 일자는 잘라냄)
+        first = int(np.searchsorted(self.month_bounds, lo, side='right')) - 1
+        last = int(np.searchsorted(self.month_bounds, hi, side='left'))
+        bounds = np.clip(self.month_bounds[max(first, 0):last + 1], lo, hi)
+        return self.months[max(first, 0):last], bounds
+
+    def row_mask(self, positions, lo, hi):
+        day_index = self.day_index[positions]
+        return (day_index >= lo) & (day_index < hi)
+
+
+class PrefixRollup:
+    def __init__(self, day_index, n_days, keys, n_keys, weights=None):
+        # 셀 = 키 × 일수 + 일자 (오름차순 → 키별로 일자 순서대로 연속), 누적합[i] = 앞 i 개 셀의 합
+        valid = (day_index >= 0) & (keys >= 0)
+        flat = np.asarray(keys[valid], dtype=np.int64) * n_days + day_index[valid]
+        weights = None if weights is None else np.asarray(weights)[valid]
+        self.cells, inverse = np.unique(flat, return_inverse=True)
+        sums = np.bincount(inverse.reshape(-1), weights=weights, minlength=len(self.cells)).astype(np.int64)
+        self.cumulative = np.zeros(len(self.cells) + 1, dtype=np.int64)
+        np.cumsum(sums, out=self.cumulative[1:])
+        self.n_days, self.n_keys = n_days, n_keys
+
+    @classmethod
+    def from_arrays(cls, cells, cumulative, n_days, n_keys):
+        rollup = cls.__new__(cls)
+        rollup.cells, rollup.cumulative = cells, cumulative
+        rollup.n_days, rollup.n_keys = n_days, n_keys
+        return rollup
+
+    def _prefix(self, days):
+        # (키 × 일자 경계) → 키별로 경계 일자 이전까지의 누적합 (전체 셀 누적합 기준, 차이만 의미 있음)
+        starts = np.arange(self.n_keys, dtype=np.int64)[:, None] * self.n_days + np.asarray(days, dtype=np.int64)[None, :]
+        return self.cumulative[np.searchsorted(self.cells, starts)]
+
+    def total(self, lo, hi):
+        prefix = self._prefix([lo, hi])
+        return prefix[:, 1] - prefix[:, 0]
+
+    def by_period(self, bounds):
+        # bounds: 기간 경계 일자 인덱스 배열 → (키 × 기간) 합계
+        return np.diff(self._prefix(bounds), axis=1)
+
+
+class DimensionRollup:
+    def __init__(self, timeline, codes, containers):
+        # 여러 컬럼의 코드 조합을 하나의 키로 합쳐서 실제 등장한 조합만 보관
+        codes = [np.asarray(c, dtype=np.int64) for c in codes]
+        valid = np.logical_and.reduce([c >= 0 for c in codes])
+        dims = [int(c.max()) + 1 if len(c) else 1 for c in codes]
+        combined = np.full(len(codes[0]), -1, dtype=np.int64)
+        combined[valid] = np.ravel_multi_index([c[valid] for c in codes], dims)
+
+        used, inverse = np.unique(combined[valid], return_inverse=True)
+        keys = np.full(len(combined), -1, dtype=np.int64)
+        keys[valid] = inverse
+        self.key_codes = np.unravel_index(used, dims)
+        self.n_keys = len(used)
+        self.containers = PrefixRollup(timeline.day_index, timeline.n_days, keys, self.n_keys, containers)
+        self.records = PrefixRollup(timeline.day_index, timeline.n_days, keys, self.n_keys)
+
+    @classmethod
+    def from_arrays(cls, key_codes, containers, records, n_days):
+        # containers / records: (셀, 누적합) 배열 쌍
+        rollup = cls.__new__(cls)
+        rollup.key_codes = tuple(key_codes)
+        rollup.n_keys = len(key_codes[0]) if len(key_codes) else 0
+        rollup.containers = PrefixRollup.from_arrays(*containers, n_days, rollup.n_keys)
+        rollup.records = PrefixRollup.from_arrays(*records, n_days, rollup.n_keys)
+        return rollup
@@ -0,0 +1,83 @@
+import argparse
+import sys
+import threading
+import time
+
+from analytics import PARTY_TYPES, carrier_ranking, filter_data, lane_ranking, monthly_trend, overview
+from dataset import load_dataset
+from forecast import SERIES
+from perf import PERF
+from shared_dataset import load_shared_dataset
+
+
+# =======================================
+# 워커 시작 시 미리 데우기 (배포 직후 첫 사용자가 콜드 스타트를 겪지 않도록)
+#  - 데이터셋 로드(스냅샷 / 저장소 적재 / 공유 폴더 내보내기)
+#  - 롤업 / 회사 인덱스 / 차원 롤업 / 회사 검색 인덱스 / 선사 점유율 큐브 / 품목 검색 인덱스 / 물량 예측 사전 계산
+#  - 첫 화면 기본 조건(전체 항로, 전체 기간, 최소 0, 대분류 ALL) 조회를 쿼리 캐시에 채움
+#  - 유사 고객 인덱스(sklearn)는 무거우므로 with_similarity=True 일 때만
+#  예) python warmup.py jakarta.xlsx            (배포 단계에서 스냅샷/공유 데이터셋 미리 생성)
+#      python warmup.py data --shared-dir /srv/kumo/shared
+# =======================================
+WARMUP_MIN_CONTAINERS = [0]
+
+
+def warm_up(dataset, with_similarity=False):
+    with PERF.span('warmup'):
+        dataset.precompute()
+        overview(dataset)
+        carrier_ranking(dataset)
+        lane_ranking(dataset)
+        monthly_trend(dataset)
+        dataset.market_cube()
+        dataset.commodity_index()
+        for series in SERIES:
+            dataset.volume_forecast(series)
+        for analysis_type in PARTY_TYPES:
+            dataset.company_search(analysis_type)
+            dataset.category_options(analysis_type)
+            dataset.top_companies(analysis_type)
+            for min_containers in WARMUP_MIN_CONTAINERS:
+                filter_data(dataset, analysis_type, min_containers)
+            if with_similarity:
+                dataset.similarity_index(analysis_type)
+    return dataset
+
+
+def warm_up_source(source, routes=None, shared_dir=None, with_similarity=False):
+    # 앱과 같은 로더를 사용 → 프로세스 캐시(_LOADED / _ATTACHED)와 쿼리 캐시에 그대로 남음
+    if shared_dir:
+        dataset = load_shared_dataset(source, routes, shared_dir)
+    else:
+        dataset = load_dataset(source, routes)
+    return warm_up(dataset, with_similarity)
+
+
+def start_background_warmup(source, routes=None, shared_dir=None):
+    # 로그인 화면을 그리는 동안 백그라운드에서 준비 (실패해도 앱은 평소처럼 요청 시 로드)
+    def run():
+        try:
+            warm_up_source(source, routes, shared_dir)
+        except Exception as e:
+            print(f"워밍업 실패: {e}", file=sys.stderr)
+
+    thread = threading.Thread(target=run, name='kumo-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="데이터셋/인덱스/기본 조회 미리 준비")
+    parser.add_argument('source', nargs='?', default='jakarta.xlsx', help="엑셀 파일 또는 추출 파일 폴더")
+    parser.add_argument('--shared-dir', help="워커 공유 데이터셋 폴더 (KUMO_SHARED_DIR 과 동일하게)")
+    parser.add_argument('--similarity', action='store_true', help="유사 고객 인덱스까지 생성")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    dataset = warm_up_source(args.source, shared_dir=args.shared_dir, with_similarity=args.similarity)
+    print(f"{args.source}: {len(dataset.df):,} rows, version {dataset.version}, {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,179 @@
+import posixpath
+import zipfile
+from array import array
+from xml.etree.ElementTree import iterparse
+
+import numpy as np
+import pandas as pd
+
+
+# =======================================
+# xlsx 스트리밍 리더
+#  - openpyxl 셀 객체를 만들지 않고 시트 XML 을 iterparse
+#  - 공유 문자열(sharedStrings) 인덱스를 그대로 정수 코드로 모아서
+#    카테고리 컬럼으로 변환 (메모리/시간이 고유값 수에 비례)
+#  - 날짜 컬럼(기본: A열)의 엑셀 일련번호는 datetime64 로 변환
+# =======================================
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+EXCEL_EPOCH = '1899-12-30'
+DEFAULT_SHEET_PATH = 'xl/worksheets/sheet1.xml'
+
+
+def _column_index(ref, cache):
+    letters = ref.rstrip('0123456789')
+    idx = cache.get(letters)
+    if idx is None:
+        idx = 0
+        for ch in letters:
+            idx = idx * 26 + (ord(ch) - 64)
+        idx -= 1
+        cache[letters] = idx
+    return idx
+
+
+def _first_sheet_path(zf):
+    # workbook.xml 의 첫 번째 시트 → rels 로 실제 경로 확인 (없으면 sheet1.xml)
+    try:
+        with zf.open('xl/workbook.xml') as f:
+            sheet = next(el for _, el in iterparse(f) if el.tag == f'{NS_MAIN}sheet')
+        rel_id = sheet.get(f'{NS_REL}id')
+        with zf.open('xl/_rels/workbook.xml.rels') as f:
+            for _, el in iterparse(f):
+                if el.tag == f'{NS_PKG_REL}Relationship' and el.get('Id') == rel_id:
+                    target = el.get('Target')
+                    if target.startswith('/'):
+                        return target.lstrip('/')
+                    return posixpath.normpath(posixpath.join('xl', target))
+    except (KeyError, StopIteration):
+        pass
+    return DEFAULT_SHEET_PATH
+
+
+def _read_shared_strings(zf):
+    strings = []
+    try:
+        f = zf.open('xl/sharedStrings.xml')
+    except KeyError:
+        return strings
+
+    t_tag, r_tag, si_tag = f'{NS_MAIN}t', f'{NS_MAIN}r', f'{NS_MAIN}si'
+    with f:
+        for _, el in iterparse(f):
+            if el.tag != si_tag:
+                continue
+            # 서식 있는 문자열(<r>)은 조각을 이어 붙이고, 윗주(<rPh>)는 제외
+            parts = []
+            for child in el:
+                if child.tag == t_tag:
+                    parts.append(child.text or '')
+                elif child.tag == r_tag:
+                    t = child.find(t_tag)
+                    if t is not None:
+                        parts.append(t.text or '')
+            strings.append(''.join(parts))
+            el.clear()
+    return strings
+
+
+def _build_column(str_codes, numbers, strings, is_date):
+    str_codes = np.frombuffer(str_codes, dtype=np.int32)
+    numbers = np.frombuffer(numbers, dtype=np.float64)
+    has_str = str_codes >= 0
+    has_num = ~np.isnan(numbers)
+
+    if not has_str.any():
+        if is_date:
+            return pd.to_datetime(numbers, unit='D', origin=EXCEL_EPOCH)
+        if has_num.all() and np.array_equal(numbers, np.floor(numbers)):
+            return numbers.astype(np.int64)
+        return numbers.copy()
+
+    if not has_num.any():
+        # 이 컬럼에서 쓰인 공유 문자열만 모아 정렬된 카테고리로 변환
+        used = np.unique(str_codes[has_str])
+        values = np.array([strings[i] for i in used], dtype=object)
+        categories, inverse = np.unique(values, return_inverse=True)
+        lookup = np.full(len(strings), -1, dtype=np.int32)
+        lookup[used] = inverse
+        codes = np.where(has_str, lookup[np.maximum(str_codes, 0)], -1)
+
+        # 빈 문자열은 결측값으로 처리 (pd.read_excel 과 동일)
+        if len(categories) and categories[0] == '':
+            codes = np.where(codes == 0, -1, codes - 1)
+            categories = categories[1:]
+        return pd.Categorical.from_codes(codes, categories=pd.Index(categories, dtype=object))
+
+    # 문자/숫자 혼합 컬럼은 object 로 유지
+    values = numbers.astype(object)
+    values[~has_num] = np.nan
+    for i in np.flatnonzero(has_str):
+        values[i] = strings[str_codes[i]] or np.nan
+    return values
+
+
+def read_xlsx(path, date_columns=(0,), sheet_path=None):
+    with zipfile.ZipFile(path) as zf:
+        strings = _read_shared_strings(zf)
+        sheet_path = sheet_path or _first_sheet_path(zf)
+
+        c_tag, v_tag, row_tag = f'{NS_MAIN}c', f'{NS_MAIN}v', f'{NS_MAIN}row'
+        is_tag, t_tag = f'{NS_MAIN}is', f'{NS_MAIN}t'
+
+        header = None
+        str_cols, num_cols = [], []
+        col_cache = {}
+        row_str, row_num = {}, {}
+        n_rows = 0
+
+        with zf.open(sheet_path) as f:
+            for _, el in iterparse(f):
+                tag = el.tag
+                if tag == c_tag:
+                    col = _column_index(el.get('r'), col_cache)
+                    cell_type = el.get('t')
+                    if cell_type == 's':
+                        v = el.find(v_tag)
+                        if v is not None:
+                            row_str[col] = int(v.text)
+                    elif cell_type in ('inlineStr', 'str'):
+                        # 인라인 문자열은 공유 문자열 목록 뒤에 추가해서 같은 방식으로 처리
+                        node = el.find(is_tag) if cell_type == 'inlineStr' else el
+                        text = ''.join(node.itertext()) if node is not None else ''
+                        row_str[col] = len(strings)
+                        strings.append(text)
+                    elif cell_type != 'e':
+                        v = el.find(v_tag)
+                        if v is not None and v.text:
+                            row_num[col] = float(v.text)
+                    el.clear()
+                elif tag == row_tag:
+                    if header is None:
+                        width = max(list(row_str) + list(row_num)) + 1
+                        header = [None] * width
+                        for col, code in row_str.items():
+                            header[col] = strings[code]
+                        for col, num in row_num.items():
+                            header[col] = num
+                        str_cols = [array('i') for _ in range(width)]
+                        num_cols = [array('d') for _ in range(width)]
+                    elif row_str or row_num:
+                        for col in range(len(header)):
+                            str_cols[col].append(row_str.get(col, -1))
+                            num_cols[col].append(row_num.get(col, np.nan))
+                        n_rows += 1
+                    row_str.clear()
+                    row_num.clear()
+                    el.clear()
+
+    if header is None:
+        return pd.DataFrame()
+
+    data = {}
+    for col, name in enumerate(header):
+        if name is None:
+            name = f"Unnamed: {col}"
+        data[name] = _build_column(str_cols[col], num_cols[col], strings, col in date_columns)
+    return pd.DataFrame(data)